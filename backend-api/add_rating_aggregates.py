@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the rating aggregate columns to users
+
+create_all() only creates missing tables, so an existing talentlink.db needs
+the columns added by hand. They are then backfilled from the reviews table.
+"""
+from sqlalchemy import inspect, text
+from app import app
+from models import db, User
+
+COLUMNS = [
+    ('rating_sum', 'FLOAT NOT NULL DEFAULT 0'),
+    ('rating_count', 'INTEGER NOT NULL DEFAULT 0'),
+]
+
+def add_rating_aggregates():
+    """Add rating_sum/rating_count to users and fill them from existing reviews"""
+    with app.app_context():
+        print("Adding rating aggregate columns...")
+        existing = {column['name'] for column in inspect(db.engine).get_columns('users')}
+        with db.engine.begin() as connection:
+            for name, ddl in COLUMNS:
+                if name in existing:
+                    print(f"  - users.{name} already exists")
+                    continue
+                connection.execute(text(f'ALTER TABLE users ADD COLUMN {name} {ddl}'))
+                print(f"  - added users.{name}")
+
+        print("Backfilling from reviews...")
+        drift = User.reconcile_ratings(fix=True)
+        print(f"✓ Rating aggregates ready ({len(drift)} users updated)")
+
+if __name__ == '__main__':
+    add_rating_aggregates()
@@ -1,10 +1,11 @@
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request, session
 from flask_cors import CORS
-from flask_jwt_extended import JWTManager
+from flask_jwt_extended import JWTManager, decode_token
 from flask_socketio import SocketIO, emit, join_room
 from models import db, Message, User
 from config import Config
-from datetime import datetime
+from database import configure_engine
+from encoding import JSONProvider
 
 # Import your route blueprints
 from models import db
@@ -24,9 +25,11 @@ from routes.review_routes import review_bp
 
 def create_app():
     app = Flask(__name__)
+    app.json = JSONProvider(app)
     app.config.from_object(Config)
-    CORS(app)
+    CORS(app, expose_headers=['X-Next-Cursor'])
     db.init_app(app)
+    configure_engine(app, db)
     JWTManager(app)
 
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
@@ -47,28 +50,64 @@ def create_app():
 # MAIN SOCKET.IO LOGIC
 # ---------------------------------------------
 app = create_app()
-socketio = SocketIO(app, cors_allowed_origins="*")
+
+# With SOCKETIO_MESSAGE_QUEUE set (e.g. redis://localhost:6379/0) every worker
+# publishes emits through the queue, so a user connected to one worker still
+# receives messages sent from another.
+socketio = SocketIO(
+    app,
+    cors_allowed_origins="*",
+    message_queue=app.config['SOCKETIO_MESSAGE_QUEUE'],
+    channel=app.config['SOCKETIO_CHANNEL']
+)
+
+
+def user_room(user_id):
+    return f"user_{user_id}"
+
+
+def socket_user_id(auth):
+    """User id from the JWT in the connect auth payload (or ?token=), None if invalid"""
+    token = (auth or {}).get('token') or request.args.get('token')
+    if not token:
+        return None
+    try:
+        ident = decode_token(token)['sub']
+    except Exception:
+        return None
+
+    # ✅ Handle both string and dict identities
+    if isinstance(ident, dict):
+        ident = ident.get('id')
+    try:
+        return int(ident)
+    except (TypeError, ValueError):
+        return None
 
 
 @socketio.on('connect')
-def handle_connect():
-    print("✅ A user connected!")
+def handle_connect(auth=None):
+    user_id = socket_user_id(auth)
+    if user_id is None:
+        print("⛔ Rejected unauthenticated socket")
+        return False
+
+    # The socket's identity lives in its own session, never in event payloads
+    session['user_id'] = user_id
+    join_room(user_room(user_id))
+    print(f"✅ User {user_id} connected")
 
 
 @socketio.on('disconnect')
 def handle_disconnect():
-    print("❌ A user disconnected.")
+    print(f"❌ User {session.get('user_id')} disconnected.")
 
 @socketio.on('join')
-def handle_join(data):
-    if not data or 'room' not in data:
-        print("⚠️ join event missing 'room' data")
-        return
-
-    room = data['room']
+def handle_join(data=None):
+    # Rooms are derived from the authenticated user; a client-supplied 'room' is ignored
+    room = user_room(session['user_id'])
     join_room(room)
-    print(f"👤 Joined room: {room}")
-    emit('joined', {'room': room}, room=room)
+    emit('joined', {'room': room})
 
 
 # -------------------------------
@@ -76,36 +115,40 @@ def handle_join(data):
 # -------------------------------
 @socketio.on('send_message')
 def handle_send_message(data):
-    if not data:
-        return
-
-    sender_id = data.get('sender_id')
+    sender_id = session['user_id']
+    data = data or {}
     receiver_id = data.get('receiver_id')
     content = data.get('content')
-    room = f"user_{receiver_id}"  # ✅ always deliver to receiver room
 
-    if not sender_id or not receiver_id or not content:
-        print("⚠️ Missing message data")
-        return
+    if not receiver_id or not content:
+        return {'error': 'receiver_id and content are required'}
+
+    if not db.session.get(User, receiver_id):
+        return {'error': 'Receiver not found'}
 
     message = Message(
         sender_id=sender_id,
         receiver_id=receiver_id,
-        content=content,
-        timestamp=datetime.utcnow()
+        content=content
     )
     db.session.add(message)
     db.session.commit()
 
-    print(f"📨 Message from {sender_id} → {receiver_id}: {content}")
-
-    # Emit to receiver only
-    emit('receive_message', {
+    payload = {
+        'id': message.id,
         'sender_id': sender_id,
-        'receiver_id': receiver_id,
+        'receiver_id': message.receiver_id,
         'content': content,
         'timestamp': message.timestamp.isoformat()
-    }, room=room)
+    }
+
+    # Deliver to the receiver and to the sender's other tabs, on whichever worker they are
+    emit('receive_message', payload, to=user_room(message.receiver_id))
+    if message.receiver_id != sender_id:
+        emit('receive_message', payload, to=user_room(sender_id), skip_sid=request.sid)
+
+    # Returned as the Socket.IO acknowledgement
+    return payload
 
 if __name__ == '__main__':
     with app.app_context():
@@ -1,6 +1,46 @@
 import os
+
+def engine_options(config):
+    """SQLALCHEMY_ENGINE_OPTIONS for the database in config.SQLALCHEMY_DATABASE_URI"""
+    url = config.SQLALCHEMY_DATABASE_URI
+    if url.startswith("sqlite"):
+        # Pragmas are set per connection in database.py; the driver timeout matches busy_timeout
+        return {"connect_args": {"timeout": config.SQLITE_BUSY_TIMEOUT_MS / 1000}}
+
+    options = {
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+    if config.DB_STATEMENT_TIMEOUT_MS:
+        if url.startswith("postgres"):
+            options["connect_args"] = {"options": f"-c statement_timeout={config.DB_STATEMENT_TIMEOUT_MS}"}
+        elif url.startswith("mysql"):
+            options["connect_args"] = {"init_command": f"SET SESSION max_execution_time={config.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
 class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "change-me-in-prod")
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "change-me-in-prod")
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///talentlink.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Pool settings apply to server databases (Postgres, MySQL); SQLite uses the pragmas below
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # Seconds before a connection is replaced
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 15000))  # 0 disables
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+    PAGE_SIZE = int(os.getenv("PAGE_SIZE", 20))
+    MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", 100))
+    MESSAGE_WINDOW = int(os.getenv("MESSAGE_WINDOW", 50))  # Latest messages returned when a thread is opened
+    # Redis (or any Kombu) URL shared by all Socket.IO workers; unset for a single process
+    SOCKETIO_MESSAGE_QUEUE = os.getenv("SOCKETIO_MESSAGE_QUEUE") or None
+    SOCKETIO_CHANNEL = os.getenv("SOCKETIO_CHANNEL", "talentlink-socketio")
+
+Config.SQLALCHEMY_ENGINE_OPTIONS = engine_options(Config)
@@ -1,4 +1,5 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import func
 from datetime import datetime
 
 db = SQLAlchemy()
@@ -11,12 +12,57 @@ class User(db.Model):
     password = db.Column(db.String(200), nullable=False)
     role = db.Column(db.String(20), nullable=False)  # 'client' or 'freelancer'
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    rating_sum = db.Column(db.Float, default=0, nullable=False)  # sum of received review ratings
+    rating_count = db.Column(db.Integer, default=0, nullable=False)  # number of received reviews
 
     profile = db.relationship('Profile', backref='user', uselist=False)
     projects = db.relationship('Project', backref='client', lazy='dynamic')
     sent_messages = db.relationship('Message', foreign_keys='Message.sender_id', backref='sender', lazy='dynamic')
     received_messages = db.relationship('Message', foreign_keys='Message.receiver_id', backref='receiver', lazy='dynamic')
 
+    def adjust_rating(self, delta_sum, delta_count):
+        # SQL-side arithmetic so concurrent review writes don't lose updates
+        User.query.filter_by(id=self.id).update({
+            'rating_sum': User.rating_sum + delta_sum,
+            'rating_count': User.rating_count + delta_count
+        }, synchronize_session=False)
+
+    @property
+    def average_rating(self):
+        return round(self.rating_sum / self.rating_count, 1) if self.rating_count else 0
+
+    @classmethod
+    def reconcile_ratings(cls, fix=True):
+        """Recompute rating aggregates from the reviews table in bulk.
+
+        Returns a list of (user_id, stored, actual) tuples for every user whose
+        stored (rating_sum, rating_count) drifted, and corrects them when fix is set.
+        """
+        actual = db.session.query(
+            Review.reviewee_id.label('user_id'),
+            func.sum(Review.rating).label('rating_sum'),
+            func.count(Review.id).label('rating_count')
+        ).group_by(Review.reviewee_id).subquery()
+
+        rows = db.session.query(
+            cls.id, cls.rating_sum, cls.rating_count,
+            func.coalesce(actual.c.rating_sum, 0), func.coalesce(actual.c.rating_count, 0)
+        ).outerjoin(actual, actual.c.user_id == cls.id).filter(
+            (cls.rating_sum != func.coalesce(actual.c.rating_sum, 0)) |
+            (cls.rating_count != func.coalesce(actual.c.rating_count, 0))
+        ).all()
+
+        drift = [(user_id, (stored_sum, stored_count), (actual_sum, actual_count))
+                 for user_id, stored_sum, stored_count, actual_sum, actual_count in rows]
+
+        if fix and drift:
+            db.session.bulk_update_mappings(cls, [
+                {'id': user_id, 'rating_sum': actual_sum, 'rating_count': actual_count}
+                for user_id, _, (actual_sum, actual_count) in drift
+            ])
+            db.session.commit()
+        return drift
+
 class Profile(db.Model):
     __tablename__ = 'profiles'
     id = db.Column(db.Integer, primary_key=True)
@@ -103,6 +149,25 @@ class Message(db.Model):
     receiver_id = db.Column(db.Integer, db.ForeignKey('users.id'))
     content = db.Column(db.Text)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Thread and inbox windows are keyset scans on (timestamp, id)
+    __table_args__ = (
+        db.Index('ix_messages_sender_receiver_timestamp', 'sender_id', 'receiver_id', 'timestamp', 'id'),
+        db.Index('ix_messages_receiver_timestamp', 'receiver_id', 'timestamp', 'id'),
+    )
+
+    @classmethod
+    def before(cls, message_id):
+        """Filter for messages ordered before message_id by (timestamp, id)"""
+        timestamp = db.select(cls.timestamp).where(cls.id == message_id).scalar_subquery()
+        return db.tuple_(cls.timestamp, cls.id) < db.tuple_(timestamp, message_id)
+
+    @classmethod
+    def after(cls, message_id):
+        """Filter for messages ordered after message_id by (timestamp, id)"""
+        timestamp = db.select(cls.timestamp).where(cls.id == message_id).scalar_subquery()
+        return db.tuple_(cls.timestamp, cls.id) > db.tuple_(timestamp, message_id)
+
 class Notification(db.Model):
     __tablename__ = 'notifications'
     id = db.Column(db.Integer, primary_key=True)
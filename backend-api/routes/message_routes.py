@@ -1,5 +1,6 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.orm import joinedload
 from models import db, Message, User
 from datetime import datetime
 
@@ -68,9 +69,20 @@ def send_message():
     return jsonify({'message': 'sent', 'id': m.id}), 201
 
 
+def window_limit():
+    """Requested window size from ?limit=, defaulting to MESSAGE_WINDOW"""
+    limit = request.args.get('limit', current_app.config['MESSAGE_WINDOW'], type=int)
+    return min(max(limit, 1), current_app.config['MAX_PAGE_SIZE'])
+
+
 @message_bp.route('/thread/<int:user_id>', methods=['GET'])
 @jwt_required()
 def get_thread(user_id):
+    """
+    The latest messages with another user, oldest first. ?before_id= pages back
+    through older history, ?after_id= returns only messages after the client's
+    last-seen id. X-Next-Cursor is the id to pass back while more remain.
+    """
     ident = get_jwt_identity()
     # ✅ Handle both string and dict identities
     if isinstance(ident, dict):
@@ -78,14 +90,29 @@ def get_thread(user_id):
     else:
         current_user_id = ident
 
+    before_id = request.args.get('before_id', type=int)
+    after_id = request.args.get('after_id', type=int)
+    limit = window_limit()
+
     # Fetch messages between the current user and the specified user
-    msgs = Message.query.filter(
+    query = Message.query.filter(
         ((Message.sender_id == current_user_id) & (Message.receiver_id == user_id)) |
         ((Message.sender_id == user_id) & (Message.receiver_id == current_user_id))
-    ).order_by(Message.timestamp.asc()).all()
+    )
+    if before_id:
+        query = query.filter(Message.before(before_id))
+    if after_id:
+        query = query.filter(Message.after(after_id))
+        msgs = query.order_by(Message.timestamp.asc(), Message.id.asc()).limit(limit + 1).all()
+        has_more = len(msgs) > limit
+        msgs = msgs[:limit]
+    else:
+        msgs = query.order_by(Message.timestamp.desc(), Message.id.desc()).limit(limit + 1).all()
+        has_more = len(msgs) > limit
+        msgs = msgs[:limit][::-1]
 
     # Format response
-    return jsonify([
+    response = jsonify([
         {
             'id': msg.id,
             'sender_id': msg.sender_id,
@@ -93,11 +120,14 @@ def get_thread(user_id):
             'content': msg.content,
             'timestamp': msg.timestamp.isoformat()
         } for msg in msgs
-    ]), 200
+    ])
+    if has_more:
+        response.headers['X-Next-Cursor'] = str(msgs[-1].id if after_id else msgs[0].id)
+    return response, 200
 
 
 # --------------------------------------------
-# Get inbox (all recent messages for logged-in user)
+# Get inbox (recent messages for logged-in user, newest first)
 # --------------------------------------------
 @message_bp.route('/inbox', methods=['GET'])
 @jwt_required()
@@ -109,18 +139,26 @@ def get_inbox():
     else:
         current_user_id = ident
 
-    # Fetch all messages received by the current user
-    msgs = Message.query.filter_by(receiver_id=current_user_id).order_by(Message.timestamp.desc()).all()
+    # Fetch a window of messages received by the current user, ?before_id= for older ones
+    before_id = request.args.get('before_id', type=int)
+    limit = window_limit()
+    query = Message.query.filter_by(receiver_id=current_user_id).options(joinedload(Message.sender))
+    if before_id:
+        query = query.filter(Message.before(before_id))
+    msgs = query.order_by(Message.timestamp.desc(), Message.id.desc()).limit(limit + 1).all()
 
-    return jsonify([
+    response = jsonify([
         {
             'id': msg.id,
             'sender_id': msg.sender_id,
             'sender_name': msg.sender.username if msg.sender else None,
             'content': msg.content,
             'timestamp': msg.timestamp.isoformat()
-        } for msg in msgs
-    ]), 200
+        } for msg in msgs[:limit]
+    ])
+    if len(msgs) > limit:
+        response.headers['X-Next-Cursor'] = str(msgs[limit - 1].id)
+    return response, 200
 
     # fetch messages between current user and user_id
     msgs = Message.query.filter(
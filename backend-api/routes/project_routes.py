@@ -1,11 +1,26 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from sqlalchemy import or_
 from models import db, Project, User, Proposal, Contract
 from datetime import datetime
+import base64
+import json
 
 project_bp = Blueprint('project', __name__)
 
+def encode_cursor(created_at, project_id):
+    """Opaque cursor for the (created_at, id) of the last project on a page"""
+    raw = json.dumps([created_at.isoformat(), project_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Return (created_at, id) from a cursor, or None if it is malformed"""
+    try:
+        created_at, project_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return datetime.fromisoformat(created_at), int(project_id)
+    except (ValueError, TypeError):
+        return None
+
 def format_project(project, include_details=False):
     """Helper function to format project data"""
     result = {
@@ -60,9 +75,28 @@ def list_projects():
         elif ident['role'] == 'client':
             query = query.filter(Project.client_id == ident['id'])
         
+        # Keyset pagination on (created_at, id), newest first
+        cursor = request.args.get('cursor')
+        if cursor:
+            position = decode_cursor(cursor)
+            if position is None:
+                return jsonify({'error': 'invalid cursor'}), 400
+            created_at, last_id = position
+            query = query.filter(or_(
+                Project.created_at < created_at,
+                (Project.created_at == created_at) & (Project.id < last_id)
+            ))
+        
+        limit = request.args.get('limit', current_app.config['PAGE_SIZE'], type=int)
+        limit = min(max(limit, 1), current_app.config['MAX_PAGE_SIZE'])
+        
         # Execute query and format results
-        projects = query.order_by(Project.created_at.desc()).all()
-        return jsonify([format_project(p) for p in projects]), 200
+        projects = query.order_by(Project.created_at.desc(), Project.id.desc()).limit(limit + 1).all()
+        response = jsonify([format_project(p) for p in projects[:limit]])
+        if len(projects) > limit:
+            last = projects[limit - 1]
+            response.headers['X-Next-Cursor'] = encode_cursor(last.created_at, last.id)
+        return response, 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1,6 +1,6 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import db, Review
+from models import db, Review, User
 
 review_bp = Blueprint("review_bp", __name__)
 
@@ -30,6 +30,9 @@ def create_review():
     )
 
     db.session.add(new_review)
+    reviewee = User.query.get(data["reviewee_id"])
+    if reviewee:
+        reviewee.adjust_rating(rating_value, 1)
     db.session.commit()
 
     return jsonify({
@@ -46,6 +49,18 @@ def get_reviews_for_user(user_id):
     return jsonify([r.to_dict() for r in reviews]), 200
 
 
+# --- Get rating summary for a user (maintained on review writes) ---
+@review_bp.route("/user/<int:user_id>/summary", methods=["GET"])
+@jwt_required(optional=True)
+def get_rating_summary(user_id):
+    user = User.query.get_or_404(user_id)
+    return jsonify({
+        "user_id": user.id,
+        "average_rating": user.average_rating,
+        "total_reviews": user.rating_count
+    }), 200
+
+
 # --- Get all reviews for a project ---
 @review_bp.route("/project/<int:project_id>", methods=["GET"])
 @jwt_required(optional=True)
@@ -68,9 +83,13 @@ def update_review(review_id):
     data = request.get_json() or {}
     if "rating" in data:
         try:
-            review.rating = float(data["rating"])
+            new_rating = float(data["rating"])
         except ValueError:
             return jsonify({"error": "Invalid rating value"}), 400
+        reviewee = User.query.get(review.reviewee_id)
+        if reviewee:
+            reviewee.adjust_rating(new_rating - review.rating, 0)
+        review.rating = new_rating
     review.comment = data.get("comment", review.comment)
 
     db.session.commit()
@@ -92,6 +111,9 @@ def delete_review(review_id):
     if review.reviewer_id != user_id:
         return jsonify({"error": "Unauthorized"}), 403
 
+    reviewee = User.query.get(review.reviewee_id)
+    if reviewee:
+        reviewee.adjust_rating(-review.rating, -1)
     db.session.delete(review)
     db.session.commit()
 
@@ -0,0 +1,91 @@
+"""
+Socket.IO load script: measures delivered messages per second across workers.
+
+Start several workers that share a message queue, e.g. four on ports 5001-5004:
+
+    export SOCKETIO_MESSAGE_QUEUE=redis://localhost:6379/0
+    gunicorn -k eventlet -w 1 -b 127.0.0.1:5001 app:app   # repeat for 5002..5004
+
+then run:
+
+    python socket_load.py --workers http://127.0.0.1:5001,http://127.0.0.1:5002,http://127.0.0.1:5003,http://127.0.0.1:5004
+
+Client i connects to worker i % N and sends to client i + 1, which sits on a
+different worker, so every delivery has to cross the message queue.
+"""
+import argparse
+import threading
+import time
+
+import requests
+import socketio
+
+
+def login(base_url, index):
+    user = {
+        'username': f'load{index}',
+        'email': f'load{index}@test.com',
+        'password': 'loadpass123',
+        'role': 'client'
+    }
+    requests.post(f'{base_url}/api/auth/register', json=user)  # 400 if it already exists
+    response = requests.post(f'{base_url}/api/auth/login', json=user)
+    response.raise_for_status()
+    token = response.json()['access_token']
+    me = requests.get(f'{base_url}/api/auth/me', headers={'Authorization': f'Bearer {token}'})
+    me.raise_for_status()
+    return token, me.json()['id']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', default=','.join(f'http://127.0.0.1:{port}' for port in range(5001, 5005)))
+    parser.add_argument('--clients', type=int, default=40)
+    parser.add_argument('--messages', type=int, default=50, help='messages sent by each client')
+    parser.add_argument('--timeout', type=float, default=60)
+    args = parser.parse_args()
+
+    workers = args.workers.split(',')
+    users = [login(workers[0], i) for i in range(args.clients)]
+    expected = args.clients * args.messages
+
+    received = [0]
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def on_message(data):
+        with lock:
+            received[0] += 1
+            if received[0] >= expected:
+                done.set()
+
+    clients = []
+    for i, (token, _) in enumerate(users):
+        client = socketio.Client()
+        client.on('receive_message', on_message)
+        client.connect(workers[i % len(workers)], auth={'token': token}, wait_timeout=10)
+        clients.append(client)
+    print(f'Connected {len(clients)} clients to {len(workers)} workers')
+
+    def send(i):
+        receiver_id = users[(i + 1) % len(users)][1]
+        for n in range(args.messages):
+            clients[i].emit('send_message', {'receiver_id': receiver_id, 'content': f'load {i}/{n}'})
+
+    started = time.perf_counter()
+    senders = [threading.Thread(target=send, args=(i,)) for i in range(len(clients))]
+    for thread in senders:
+        thread.start()
+    for thread in senders:
+        thread.join()
+    done.wait(args.timeout)
+    elapsed = time.perf_counter() - started
+
+    print(f'Delivered {received[0]}/{expected} messages in {elapsed:.2f}s '
+          f'({received[0] / elapsed:.0f} msg/s)')
+    for client in clients:
+        client.disconnect()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Shared fixtures for the backend-api tests.
+
+    cd backend-api && python -m pytest tests
+
+(test_api.py next to app.py is a manual script against a running server and
+is not part of this suite.) Config is read when app.py is imported, so the
+database is pointed at a throwaway SQLite file first.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_DIR = tempfile.mkdtemp(prefix='talentlink-api-tests-')
+os.environ['DATABASE_URL'] = f'sqlite:///{DB_DIR}/test.db'
+os.environ.pop('SOCKETIO_MESSAGE_QUEUE', None)
+sys.path.insert(0, API_DIR)
+
+import app as app_module  # noqa: E402
+from flask_jwt_extended import create_access_token  # noqa: E402
+from models import db, User  # noqa: E402
+
+@pytest.fixture(scope='session')
+def app():
+    app = app_module.app
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+    return app
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture(autouse=True)
+def clean_tables(app):
+    yield
+    with app.app_context():
+        db.session.remove()
+        with db.engine.begin() as connection:
+            for table in reversed(db.metadata.sorted_tables):
+                connection.execute(table.delete())
+
+@pytest.fixture
+def add_user(app):
+    """add_user(username, role='freelancer') -> (token, user_id), without password hashing"""
+    def add_user(username, role='freelancer'):
+        with app.app_context():
+            user = User(username=username, email=f'{username}@example.com', password='-', role=role)
+            db.session.add(user)
+            db.session.commit()
+            return create_access_token(identity=str(user.id)), user.id
+    return add_user
+
+def auth(token):
+    return {'Authorization': f'Bearer {token}'}
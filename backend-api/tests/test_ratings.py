@@ -0,0 +1,48 @@
+"""
+The review handlers keep User.rating_sum and rating_count in step, and
+reconcile_ratings() finds and repairs any drift.
+"""
+import pytest
+from flask_jwt_extended import create_access_token
+
+from conftest import auth
+from models import db, Review, User
+
+@pytest.fixture
+def reviewer(app, add_user, monkeypatch):
+    """Token of a client whose identity is the {'id', 'role'} dict the review routes read"""
+    # Flask-JWT-Extended 4.4 (requirements.txt) accepts a dict subject, newer releases check it
+    monkeypatch.setitem(app.config, 'JWT_VERIFY_SUB', False)
+    _, client_id = add_user('client', role='client')
+    with app.app_context():
+        return create_access_token(identity={'id': client_id, 'role': 'client'})
+
+def summary(client, user_id):
+    body = client.get(f'/api/reviews/user/{user_id}/summary').get_json()
+    return body['average_rating'], body['total_reviews']
+
+def test_review_writes_update_the_summary(client, add_user, reviewer):
+    _, freelancer_id = add_user('freelancer')
+    ids = [client.post('/api/reviews/', json={'project_id': 1, 'reviewee_id': freelancer_id, 'rating': rating},
+                       headers=auth(reviewer)).get_json()['review']['id'] for rating in (5, 2)]
+    assert summary(client, freelancer_id) == (3.5, 2)
+
+    client.put(f'/api/reviews/{ids[0]}', json={'rating': 3}, headers=auth(reviewer))
+    assert summary(client, freelancer_id) == (2.5, 2)
+
+    client.delete(f'/api/reviews/{ids[1]}', headers=auth(reviewer))
+    assert summary(client, freelancer_id) == (3.0, 1)
+
+def test_reconcile_ratings_reports_and_fixes_drift(app, add_user):
+    _, freelancer_id = add_user('freelancer')
+    with app.app_context():
+        db.session.add_all([Review(project_id=1, reviewer_id=1, reviewee_id=freelancer_id, rating=rating)
+                            for rating in (4, 5)])
+        db.session.commit()
+
+        assert User.reconcile_ratings(fix=False) == [(freelancer_id, (0, 0), (9, 2))]
+        assert db.session.get(User, freelancer_id).rating_count == 0
+        assert User.reconcile_ratings() == [(freelancer_id, (0, 0), (9, 2))]
+        db.session.expire_all()
+        assert db.session.get(User, freelancer_id).average_rating == 4.5
+        assert User.reconcile_ratings() == []
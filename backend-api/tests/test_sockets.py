@@ -0,0 +1,86 @@
+"""
+Socket.IO connections are authenticated, confined to the user's own room and
+carry the sender's identity in the socket session, not in event payloads.
+"""
+import time
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+import socketio as python_socketio
+from flask_socketio import test_client
+from socketio import redis_manager
+
+from app import socketio, user_room
+from models import db, Message
+
+def received(client, event):
+    return [packet['args'][0] for packet in client.get_received() if packet['name'] == event]
+
+def test_connection_without_a_token_is_rejected(app):
+    assert not socketio.test_client(app).is_connected()
+    assert not socketio.test_client(app, auth={'token': 'not-a-jwt'}).is_connected()
+
+def test_client_joins_only_its_own_room(app, add_user):
+    alice_token, alice_id = add_user('alice')
+    bob_token, bob_id = add_user('bob')
+    alice = socketio.test_client(app, auth={'token': alice_token})
+    bob = socketio.test_client(app, auth={'token': bob_token})
+
+    # Asking for someone else's room still lands the client in its own
+    alice.emit('join', {'room': user_room(bob_id)})
+    assert received(alice, 'joined') == [{'room': user_room(alice_id)}]
+
+    socketio.emit('ping', {'for': bob_id}, to=user_room(bob_id))
+    assert received(bob, 'ping') == [{'for': bob_id}]
+    assert received(alice, 'ping') == []
+
+def test_send_message_takes_the_sender_from_the_session(app, add_user):
+    alice_token, alice_id = add_user('alice')
+    bob_token, bob_id = add_user('bob')
+    alice = socketio.test_client(app, auth={'token': alice_token})
+    bob = socketio.test_client(app, auth={'token': bob_token})
+
+    ack = alice.emit('send_message', {'sender_id': bob_id, 'receiver_id': bob_id, 'content': 'hi'}, callback=True)
+    assert ack['sender_id'] == alice_id
+    assert [m['sender_id'] for m in received(bob, 'receive_message')] == [alice_id]
+    with app.app_context():
+        assert [(m.sender_id, m.receiver_id) for m in Message.query.all()] == [(alice_id, bob_id)]
+
+@pytest.fixture
+def redis_queue(app, monkeypatch):
+    """Put the server on a fakeredis message queue, returns another worker's publisher"""
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(redis_manager, 'redis', SimpleNamespace(
+        Redis=SimpleNamespace(from_url=lambda url, **options: fakeredis.FakeRedis(server=server))
+    ))
+    # The test client refuses pub/sub managers because delivery through them is
+    # asynchronous (the test below polls for it instead), and it initializes the
+    # manager once per client, which would start one listener thread each
+    monkeypatch.setattr(test_client, 'PubSubManager', type('NoPubSubManager', (), {}))
+
+    channel = app.config['SOCKETIO_CHANNEL']
+    manager = python_socketio.RedisManager('redis://', channel=channel)
+    manager.set_server(socketio.server)
+    manager.initialize()
+    manager.initialize = lambda: None
+    # A publish before the listener subscribes would be lost
+    while not fakeredis.FakeRedis(server=server).pubsub_numsub(channel)[0][1]:
+        time.sleep(0.01)
+    monkeypatch.setattr(socketio.server, 'manager', manager)
+    return python_socketio.RedisManager('redis://', channel=channel, write_only=True)
+
+def test_room_emits_from_another_worker_arrive_through_the_queue(app, add_user, redis_queue):
+    alice_token, alice_id = add_user('alice')
+    bob_token, bob_id = add_user('bob')
+    alice = socketio.test_client(app, auth={'token': alice_token})
+    bob = socketio.test_client(app, auth={'token': bob_token})
+
+    redis_queue.emit('receive_message', {'content': 'from worker 2'}, room=user_room(bob_id))
+    deadline = time.monotonic() + 5
+    messages = []
+    while not messages and time.monotonic() < deadline:
+        time.sleep(0.05)
+        messages = received(bob, 'receive_message')
+    assert messages == [{'content': 'from worker 2'}]
+    assert received(alice, 'receive_message') == []
@@ -0,0 +1,133 @@
+"""
+ASGI entry point.
+
+    uvicorn asgi:application --host 0.0.0.0 --port 5000
+
+Socket.IO is served by a python-socketio AsyncServer, so an idle socket or a
+long-poll is a coroutine rather than a parked worker thread, and the reconnect
+catch-up query runs on an async SQLAlchemy engine (aiosqlite for SQLite,
+asyncpg for Postgres).
+
+The HTTP API is still the synchronous Flask app. Each request runs on its own
+thread, at most ASGI_HTTP_THREADS at once, and its database calls block that
+thread as they do under the threaded server. What the event loop saves is the
+thread per open socket, not the thread per in-flight request.
+
+Set SOCKETIO_MESSAGE_QUEUE to a Redis URL when running more than one worker so
+they share rooms. `python app.py` still runs the threaded server.
+"""
+import asyncio
+import threading
+import time
+from urllib.parse import parse_qs
+
+import socketio
+from asgiref.sync import ThreadSensitiveContext
+from asgiref.wsgi import WsgiToAsgi
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app import app
+from extensions import notification_dispatcher
+from sockets import token_user_id
+from models import db, Notification
+from notifications import serialize_notification, user_room
+
+ASYNC_DRIVERS = {'sqlite': 'sqlite+aiosqlite', 'postgresql': 'postgresql+asyncpg'}
+
+def async_database_url(url):
+    """Same database as url, through its asyncio driver"""
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+class ThreadedWsgiToAsgi(WsgiToAsgi):
+    """WsgiToAsgi that runs each request on its own thread, at most max_threads at once"""
+
+    def __init__(self, wsgi_application, max_threads):
+        super().__init__(wsgi_application)
+        self.slots = asyncio.Semaphore(max_threads)
+
+    async def __call__(self, scope, receive, send):
+        # Without a thread-sensitive context of its own, asgiref runs every WSGI request on one shared thread
+        async with self.slots, ThreadSensitiveContext():
+            await super().__call__(scope, receive, send)
+
+class LoopEmitter:
+    """Socket.IO facade for sync code (the notification dispatcher) running outside the event loop"""
+
+    def __init__(self, server):
+        self.server = server
+        self.loop = None  # Set by attach() when the ASGI server starts
+        self.pending = []  # Emits made before then, sent once the loop exists
+        self.lock = threading.Lock()
+
+    def attach(self, loop):
+        with self.lock:
+            self.loop = loop
+            pending, self.pending = self.pending, []
+        for event, data, to in pending:
+            self.emit(event, data, to=to)
+
+    def emit(self, event, data, to=None):
+        with self.lock:
+            if self.loop is None:
+                self.pending.append((event, data, to))
+                return
+        asyncio.run_coroutine_threadsafe(self.server.emit(event, data, to=to), self.loop)
+
+    def start_background_task(self, target, *args, **kwargs):
+        thread = threading.Thread(target=target, args=args, kwargs=kwargs, daemon=True)
+        thread.start()
+        return thread
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+client_manager = None
+if app.config['SOCKETIO_MESSAGE_QUEUE']:
+    client_manager = socketio.AsyncRedisManager(app.config['SOCKETIO_MESSAGE_QUEUE'])
+
+sio = socketio.AsyncServer(
+    async_mode='asgi',
+    cors_allowed_origins=["http://localhost:3000", "http://127.0.0.1:3000"],
+    client_manager=client_manager
+)
+# Flask-SQLAlchemy resolves relative SQLite paths into the instance folder, so use its URL
+with app.app_context():
+    async_engine = create_async_engine(async_database_url(db.engine.url))
+emitter = LoopEmitter(sio)
+notification_dispatcher.socketio = emitter
+
+async def catch_up(user_id, after_id):
+    """Notifications created since after_id, oldest first, read without blocking the loop"""
+    async with AsyncSession(async_engine) as session:
+        rows = await session.scalars(select(Notification).where(
+            Notification.user_id == user_id,
+            Notification.id > after_id
+        ).order_by(Notification.id.asc()).limit(notification_dispatcher.catch_up_limit))
+        return [serialize_notification(n) for n in rows]
+
+@sio.event
+async def connect(sid, environ, auth=None):
+    token = (auth or {}).get('token') or parse_qs(environ.get('QUERY_STRING', '')).get('token', [None])[0]
+    with app.app_context():
+        user_id = token_user_id(token)
+    if user_id is None:
+        return False
+    await sio.enter_room(sid, user_room(user_id))
+
+    # Replay anything created while the client was disconnected
+    last_id = (auth or {}).get('last_notification_id')
+    if last_id is not None:
+        missed = await catch_up(user_id, int(last_id))
+        if missed:
+            await sio.emit('notifications', missed, to=sid)
+
+async def startup():
+    # HTTP-only workers never see a connect, but still emit notifications through the queue
+    emitter.attach(asyncio.get_running_loop())
+
+application = socketio.ASGIApp(
+    sio, other_asgi_app=ThreadedWsgiToAsgi(app, app.config['ASGI_HTTP_THREADS']), on_startup=startup
+)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Concurrent Socket.IO connections: threaded server against the ASGI server.
+
+Starts each server in a subprocess on a throwaway SQLite database, opens
+--sockets authenticated Socket.IO websocket connections at once, then times
+HTTP requests while they are all held open. Reports how many connected, how
+long that took, and the server's thread count and RSS.
+
+    python bench/bench_asgi.py --sockets 500
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import websockets
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ORIGIN = 'http://localhost:3000'
+
+SERVERS = {
+    'threaded': [sys.executable, '-c', 'import sys; from app import app, socketio; '
+                 'socketio.run(app, port=int(sys.argv[1]), allow_unsafe_werkzeug=True, log_output=False)'],
+    'asgi': [sys.executable, '-m', 'uvicorn', 'asgi:application', '--log-level', 'warning', '--port'],
+}
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def request(url, data=None, token=None):
+    headers = {'Content-Type': 'application/json'}
+    if token:
+        headers['Authorization'] = f'Bearer {token}'
+    body = json.dumps(data).encode() if data is not None else None
+    with urllib.request.urlopen(urllib.request.Request(url, body, headers), timeout=60) as response:
+        return json.loads(response.read())
+
+def process_status(pid):
+    status = {}
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            status[key] = value.split()[0] if value.split() else ''
+    return int(status['Threads']), int(status['VmRSS']) // 1024
+
+async def open_socket(port, token):
+    ws = await websockets.connect(f'ws://127.0.0.1:{port}/socket.io/?EIO=4&transport=websocket',
+                                  origin=ORIGIN, open_timeout=60, max_size=None)
+    await ws.recv()  # engine.io open packet
+    await ws.send('40' + json.dumps({'token': token}))
+    reply = await ws.recv()
+    if not reply.startswith('40'):
+        raise ConnectionError(reply)
+    return ws
+
+async def measure(port, pid, token, sockets):
+    start = time.perf_counter()
+    results = await asyncio.gather(*[open_socket(port, token) for _ in range(sockets)], return_exceptions=True)
+    connected = [ws for ws in results if not isinstance(ws, Exception)]
+    connect_time = time.perf_counter() - start
+
+    loop = asyncio.get_running_loop()
+    latencies = []
+    for _ in range(30):
+        start = time.perf_counter()
+        await loop.run_in_executor(None, request, f'http://127.0.0.1:{port}/api/notifications', None, token)
+        latencies.append((time.perf_counter() - start) * 1000)
+    threads, rss = process_status(pid)
+    for ws in connected:
+        await ws.close()
+    return len(connected), connect_time, threads, rss, statistics.median(latencies)
+
+def run(name, sockets):
+    port = free_port()
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{tempfile.mkdtemp()}/bench.db')
+    subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'init-db'], cwd=BACKEND_DIR, env=env,
+                   check=True, capture_output=True)
+    server = subprocess.Popen(SERVERS[name] + [str(port)], cwd=BACKEND_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(100):
+            try:
+                token = request(f'http://127.0.0.1:{port}/api/auth/register', {
+                    'email': 'bench@example.com', 'password': 'password', 'role': 'client', 'name': 'Bench'
+                })['token']
+                break
+            except OSError:
+                time.sleep(0.2)
+        else:
+            raise RuntimeError(f'{name} server did not start')
+        connected, connect_time, threads, rss, http_p50 = asyncio.run(measure(port, server.pid, token, sockets))
+        print(f'  {name:9s} {connected:5d}/{sockets} sockets in {connect_time:5.1f} s  threads {threads:5d}  '
+              f'RSS {rss:4d} MB  HTTP p50 {http_p50:6.1f} ms')
+    finally:
+        server.terminate()
+        server.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sockets', type=int, default=300)
+    parser.add_argument('--server', choices=sorted(SERVERS), action='append')
+    args = parser.parse_args()
+    print(f'{args.sockets} concurrent Socket.IO connections')
+    for name in args.server or ['threaded', 'asgi']:
+        run(name, args.sockets)
+
+if __name__ == '__main__':
+    main()
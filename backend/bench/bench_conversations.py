@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+GET /api/conversations cost against message history and page size.
+
+One user has --conversations threads. The first table grows the number of
+messages per thread and keeps the page size fixed; the second grows the page
+size. The inbox is read from conversation summaries, so the first table
+should stay flat and only the second should grow.
+"""
+import argparse
+
+from harness import add_users, app, auth, best_of, client, db, token_for
+from models import ConversationSummary, Message
+
+def seed(me, counterparts, per_thread):
+    with app.app_context():
+        db.session.execute(db.delete(ConversationSummary))
+        db.session.execute(db.delete(Message))
+        rows = []
+        for other in counterparts:
+            low, high = min(me, other), max(me, other)
+            for i in range(per_thread):
+                sender, receiver = (other, me) if i % 2 else (me, other)
+                rows.append({'sender_id': sender, 'receiver_id': receiver, 'user_low_id': low, 'user_high_id': high,
+                             'content': f'message {i}', 'is_read': i < per_thread - 1})
+        db.session.bulk_insert_mappings(Message, rows)
+        db.session.commit()
+        ConversationSummary.rebuild()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--conversations', type=int, default=500)
+    args = parser.parse_args()
+
+    me, *counterparts = add_users(args.conversations + 1)
+    headers = auth(token_for(me))
+    inbox = lambda limit: client.get(f'/api/conversations?limit={limit}', headers=headers)
+
+    print(f'{args.conversations} conversations, page of 20')
+    for per_thread in (1, 10, 50):
+        seed(me, counterparts, per_thread)
+        print(f'  {per_thread * args.conversations:7d} messages  {best_of(lambda: inbox(20)):6.2f} ms')
+
+    print('page size, 10 messages per conversation')
+    seed(me, counterparts, 10)
+    for limit in (10, 50, 100):
+        assert len(inbox(limit).get_json()) == min(limit, args.conversations)
+        print(f'  limit {limit:4d}  {best_of(lambda: inbox(limit)):6.2f} ms')
+
+if __name__ == '__main__':
+    main()
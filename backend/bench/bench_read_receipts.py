@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Thread reads under a concurrent writer: do opening threads take write locks?
+
+--threads readers repeatedly open a thread they have fully read while one
+writer keeps sending messages to the same user from someone else. Every
+UPDATE/INSERT/DELETE issued from a reader thread is counted. Reading an
+already read thread only looks at the read watermark, so that count must be
+0; the benchmark exits non-zero otherwise.
+"""
+import argparse
+import threading
+import time
+
+from sqlalchemy import event
+
+from harness import app, auth, client, db, fail, median, percentile, quiet, register
+
+WRITES = ('UPDATE', 'INSERT', 'DELETE')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=150, help='per reader')
+    parser.add_argument('--history', type=int, default=200, help='messages already in the thread')
+    args = parser.parse_args()
+
+    reader_token, reader_id = register('reader@example.com', 'client')
+    sender_token, sender_id = register('sender@example.com')
+    writer_token, _ = register('writer@example.com')
+    with quiet():
+        for i in range(args.history):
+            client.post('/api/messages', json={'receiver_id': reader_id, 'content': f'message {i}'},
+                        headers=auth(sender_token))
+    # Open the thread once so everything in it is read
+    client.get(f'/api/messages?user_id={sender_id}', headers=auth(reader_token))
+
+    reader_writes = [0]
+    with app.app_context():
+        @event.listens_for(db.engine, 'before_cursor_execute')
+        def count_writes(conn, cursor, statement, *rest):
+            if statement.lstrip().split()[0] in WRITES and threading.current_thread().name.startswith('reader'):
+                reader_writes[0] += 1
+
+    latencies, errors, sent = [], [0], [0]
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def reader():
+        reader_client = app.test_client()
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            response = reader_client.get(f'/api/messages?user_id={sender_id}', headers=auth(reader_token))
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+                errors[0] += response.status_code != 200
+
+    def writer():
+        writer_client = app.test_client()
+        with quiet():
+            while not stop.is_set():
+                writer_client.post('/api/messages', json={'receiver_id': reader_id, 'content': 'new'},
+                                   headers=auth(writer_token))
+                sent[0] += 1
+
+    readers = [threading.Thread(target=reader, name=f'reader{i}') for i in range(args.threads)]
+    writer_thread = threading.Thread(target=writer, name='writer')
+    writer_thread.start()
+    start = time.perf_counter()
+    for thread in readers:
+        thread.start()
+    for thread in readers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    writer_thread.join()
+
+    print(f'{args.threads} readers x {args.requests} thread opens, one writer sending')
+    print(f'  {len(latencies)} reads in {elapsed:.2f} s  p50 {median(latencies):.1f} ms  '
+          f'p95 {percentile(latencies, 0.95):.1f} ms  errors {errors[0]}')
+    print(f'  writer sent {sent[0]} messages  statements written by readers {reader_writes[0]}')
+    if errors[0]:
+        fail(f'{errors[0]} reads failed')
+    if reader_writes[0]:
+        fail(f'opening a read thread issued {reader_writes[0]} write statements')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Recommendation scoring throughput: --freelancers x --projects within --budget seconds.
+
+Builds random skill bitsets (about 300 skill ids, a handful per row), rates,
+ratings and budgets, then scores every freelancer against every project with
+score_matrix and keeps each freelancer's top CACHE_SIZE matches, the same
+work RecommendationEngine.precompute does once the data is loaded.
+"""
+import argparse
+import time
+
+import numpy as np
+
+import harness  # noqa: F401  sets up the backend import path
+from recommendations import CACHE_SIZE, popcount, score_matrix, skill_bitsets
+
+def random_bitsets(rng, rows, skills, per_row, words):
+    counts = rng.integers(1, per_row + 1, size=rows)
+    row_ids = np.repeat(np.arange(rows), counts)
+    skill_ids = rng.integers(1, skills + 1, size=len(row_ids))
+    return skill_bitsets(row_ids, skill_ids, rows, words)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--freelancers', type=int, default=10000)
+    parser.add_argument('--projects', type=int, default=10000)
+    parser.add_argument('--skills', type=int, default=300)
+    parser.add_argument('--budget', type=float, default=10.0, help='seconds allowed for scoring and top-k')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    words = args.skills // 64 + 1
+    freelancer_bits = random_bitsets(rng, args.freelancers, args.skills, 8, words)
+    project_bits = random_bitsets(rng, args.projects, args.skills, 5, words)
+    rates = np.where(rng.random(args.freelancers) < 0.8, rng.uniform(10, 150, args.freelancers), np.nan)
+    ratings = np.where(rng.random(args.freelancers) < 0.6, rng.uniform(1, 5, args.freelancers), np.nan)
+    budgets = rng.uniform(100, 10000, args.projects)
+    required = popcount(project_bits)
+
+    start = time.perf_counter()
+    scores = score_matrix(freelancer_bits, rates, ratings, project_bits, budgets, required)
+    scored = time.perf_counter() - start
+    top = np.argpartition(-scores, CACHE_SIZE - 1, axis=1)[:, :CACHE_SIZE]
+    elapsed = time.perf_counter() - start
+
+    pairs = args.freelancers * args.projects
+    print(f'{args.freelancers} freelancers x {args.projects} projects, {args.skills} skills')
+    print(f'  score_matrix  {scored:6.2f} s  ({pairs / scored / 1e6:.0f}M pairs/s)')
+    print(f'  + top {CACHE_SIZE:<5d}  {elapsed:6.2f} s  (budget {args.budget:.1f} s)')
+    assert top.shape == (args.freelancers, CACHE_SIZE)
+    if elapsed > args.budget:
+        harness.fail(f'scoring took {elapsed:.2f} s, over the {args.budget:.1f} s budget')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Project search latency: full-text index against the old LIKE '%term%' path.
+
+Seeds --projects open projects with generated titles and descriptions, then
+times the first page (20 rows) of a search through the configured backend
+(FTS5 on SQLite) and through LikeSearchBackend for a common word, a prefix,
+a rare word and a word that matches nothing. LIKE stops early on common
+words, since the newest rows match, but reads every row for rare ones. The
+index's cost follows the number of matches, since each one is ranked with bm25.
+"""
+import argparse
+import random
+
+from harness import add_users, app, best_of, db
+from models import Project
+from search import LikeSearchBackend, search_projects
+
+WORDS = ('python flask react django postgres api backend frontend mobile design data pipeline '
+         'dashboard payments marketplace scraper automation testing devops cloud analytics '
+         'ecommerce chatbot migration integration security performance redesign landing').split()
+
+def seed(count, rng):
+    client_id, = add_users(1, role='client', prefix='client')
+    with app.app_context():
+        for start in range(0, count, 10000):
+            db.session.bulk_insert_mappings(Project, [{
+                'client_id': client_id,
+                'title': ' '.join(rng.choices(WORDS, k=4)).title(),
+                'description': ' '.join(rng.choices(WORDS, k=40)) + f' ref{i}',
+                'budget': 100 + i % 900,
+                'status': 'open'
+            } for i in range(start, min(start + 10000, count))])
+            db.session.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--projects', type=int, default=100000)
+    args = parser.parse_args()
+
+    seed(args.projects, random.Random(1))
+    like = LikeSearchBackend()
+    print(f'{args.projects} projects, first page of 20')
+    print(f'  {"term":24s} {"index":>9s} {"LIKE":>9s}')
+    with app.app_context():
+        feed = lambda: Project.query.filter_by(status='open')
+        for term in ('python', 'dash', 'ref4242', 'kubernetes'):
+            index_ms = best_of(lambda: search_projects(feed(), term).limit(20).all())
+            like_ms = best_of(lambda: like.apply(feed(), term).limit(20).all())
+            print(f'  {term:24s} {index_ms:7.2f}ms {like_ms:7.2f}ms')
+
+if __name__ == '__main__':
+    main()
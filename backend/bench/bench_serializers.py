@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Serializing --projects project summaries, hand-built dicts against the registry.
+
+Builds transient Project rows in memory (no database round trips), then
+times the dict step alone and the full response body: hand-built dicts
+through Flask's stock JSON provider, and serialize_project_summary through
+the app's JSONProvider. Exits non-zero unless both bodies decode to the same
+JSON.
+"""
+import argparse
+import json
+from datetime import datetime
+
+from harness import app, best_of, fail
+from flask.json.provider import DefaultJSONProvider
+from models import Project, User
+from serializers.encoding import orjson
+from serializers.projects import serialize_project_summary
+
+def hand_built(project, proposal_count):
+    """The per-route dict the registry replaced"""
+    return {
+        'id': project.id,
+        'title': project.title,
+        'description': project.description,
+        'budget': project.budget,
+        'duration': project.duration,
+        'skills_required': json.loads(project.skills_required) if project.skills_required else [],
+        'status': project.status,
+        'created_at': project.created_at.isoformat(),
+        'client': {'id': project.client.id, 'name': project.client.name},
+        'proposal_count': proposal_count
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--projects', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+
+    client = User(id=1, name='Client', email='client@example.com', role='client')
+    projects = [Project(
+        id=i, title=f'Project {i}', description='Build a thing ' * 10, budget=500.0, duration='2 weeks',
+        skills_required=json.dumps(['Python', 'React', 'SQL']), status='open',
+        created_at=datetime(2024, 1, 1, 12, 0, i % 60, 1234), client=client
+    ) for i in range(args.projects)]
+    counts = {project.id: 3 for project in projects}
+    stock = DefaultJSONProvider(app)
+
+    def old_dicts():
+        return [hand_built(p, counts.get(p.id, 0)) for p in projects]
+
+    def new_dicts():
+        return [serialize_project_summary(p, counts.get(p.id, 0)) for p in projects]
+
+    print(f'{args.projects} project summaries, JSON encoder: {"orjson" if orjson else "json"}')
+    with app.test_request_context():
+        for label, fn in [
+            ('hand-built dicts', old_dicts),
+            ('compiled extractor', new_dicts),
+            ('hand-built + stock jsonify', lambda: stock.response(old_dicts()).get_data()),
+            ('compiled + JSONProvider', lambda: app.json.response(new_dicts()).get_data()),
+        ]:
+            print(f'  {label:28s} {best_of(fn, args.repeat):7.1f} ms')
+        same = json.loads(stock.response(old_dicts()).get_data()) == json.loads(app.json.response(new_dicts()).get_data())
+        if not same:
+            fail('the registry output differs from the hand-built dicts')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Mixed read/write throughput on SQLite with and without the connection pragmas.
+
+--threads clients alternate between sending a message and reading their
+inbox. By default the configured pragmas are used (WAL, synchronous=NORMAL,
+busy_timeout, mmap). --untuned runs the same load with SQLite's defaults
+(rollback journal, synchronous=FULL, no mmap) and the driver's 5 s timeout.
+"""
+import os
+import sys
+import threading
+import time
+
+if '--untuned' in sys.argv:
+    os.environ.update(SQLITE_JOURNAL_MODE='DELETE', SQLITE_SYNCHRONOUS='FULL',
+                      SQLITE_BUSY_TIMEOUT_MS='5000', SQLITE_MMAP_SIZE='0')
+
+import argparse  # noqa: E402
+
+from sqlalchemy import text  # noqa: E402
+
+from harness import app, auth, db, median, percentile, quiet, register  # noqa: E402
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=100, help='per thread')
+    parser.add_argument('--untuned', action='store_true')
+    args = parser.parse_args()
+
+    with app.app_context():
+        pragmas = {name: db.session.execute(text(f'PRAGMA {name}')).scalar()
+                   for name in ('journal_mode', 'synchronous', 'busy_timeout', 'mmap_size')}
+    users = [register(f'user{i}@example.com') for i in range(args.threads + 1)]
+    _, inbox_owner = users[-1]
+
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def worker(n):
+        client = app.test_client()
+        headers = auth(users[n][0])
+        for i in range(args.requests):
+            start = time.perf_counter()
+            if i % 2:
+                response = client.get('/api/conversations', headers=headers)
+            else:
+                response = client.post('/api/messages', json={'receiver_id': inbox_owner, 'content': 'hi'}, headers=headers)
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+                if response.status_code >= 400:
+                    errors.append(response.status_code)
+
+    start = time.perf_counter()
+    with quiet():
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(args.threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    elapsed = time.perf_counter() - start
+
+    print('pragmas', ' '.join(f'{name}={value}' for name, value in pragmas.items()))
+    print(f'{args.threads} threads, {len(latencies) / elapsed:.0f} req/s  p50 {median(latencies):.1f} ms  '
+          f'p99 {percentile(latencies, 0.99):.1f} ms  errors {len(errors)}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Cold start and per-worker memory: importing app.py in a fresh interpreter,
+median of --runs.
+
+Each run imports the app in a new subprocess against a database path that
+does not exist yet. Importing must not touch the database, so the file must
+still be missing afterwards; schema creation and demo data belong to
+`flask init-db` and `flask seed`. Each worker pays the import's peak RSS, and
+the modules in DEFERRED must only load on the request that needs them.
+
+Exits non-zero when the median import exceeds --budget-ms, the median RSS
+exceeds --rss-budget-mb, the import did database work or loaded a deferred
+module.
+
+Set BENCH_BACKEND to another checkout's backend directory to compare.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.environ.get('BENCH_BACKEND') or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only needed by GET /api/projects/recommendations
+DEFERRED = ['numpy', 'recommendations']
+
+CHILD = '''
+import json, resource, sys, time
+start = time.perf_counter()
+import app
+print(json.dumps({
+    'import_ms': (time.perf_counter() - start) * 1000,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'modules': len(sys.modules),
+    'deferred': [name for name in %r if name in sys.modules],
+}))
+''' % DEFERRED
+
+def cold_start(database):
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{database}', NOTIFICATION_WORKERS='0')
+    result = subprocess.run([sys.executable, '-c', CHILD], cwd=BACKEND_DIR, env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def fail(message):
+    print(f'FAIL: {message}')
+    sys.exit(1)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=7)
+    parser.add_argument('--budget-ms', type=float, default=1000.0, help='allowed median import time')
+    parser.add_argument('--rss-budget-mb', type=float, default=100.0, help='allowed median RSS after import')
+    args = parser.parse_args()
+
+    runs = []
+    touched = 0
+    for _ in range(args.runs):
+        database = os.path.join(tempfile.mkdtemp(prefix='talentlink-bench-'), 'startup.db')
+        runs.append(cold_start(database))
+        touched += os.path.exists(database)
+
+    import_ms = statistics.median(run['import_ms'] for run in runs)
+    rss_mb = statistics.median(run['rss_mb'] for run in runs)
+    loaded = sorted({name for run in runs for name in run['deferred']})
+    print(f'import app  median {import_ms:7.1f} ms  (min {min(run["import_ms"] for run in runs):.1f}, '
+          f'{args.runs} runs)  database touched in {touched} runs')
+    print(f'worker RSS  median {rss_mb:7.1f} MB  {runs[0]["modules"]} modules  '
+          f'deferred modules loaded: {", ".join(loaded) or "none"}')
+    if touched:
+        fail('importing app.py created the database')
+    if loaded:
+        fail(f'importing app.py loaded {", ".join(loaded)}')
+    if import_ms > args.budget_ms:
+        fail(f'median import {import_ms:.1f} ms is over the {args.budget_ms:.0f} ms budget')
+    if rss_mb > args.rss_budget_mb:
+        fail(f'median RSS {rss_mb:.1f} MB is over the {args.rss_budget_mb:.0f} MB budget')
+
+if __name__ == '__main__':
+    main()
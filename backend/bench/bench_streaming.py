@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Peak memory of GET /api/messages as a JSON array and as an NDJSON stream.
+
+For each history size the whole thread is fetched twice under tracemalloc:
+as one array (?limit= covering everything, so the rows, dicts and body are
+all materialized) and with ?stream=1. The array's peak grows with the
+thread; the stream's should stay flat. Exits non-zero when the stream's peak
+on the largest thread is more than --flat-ratio times its peak on the
+smallest.
+"""
+import os
+
+# Let ?limit= cover the whole thread so the array response is the full history
+os.environ.setdefault('MAX_PAGE_SIZE', '1000000')
+
+import argparse  # noqa: E402
+import time  # noqa: E402
+import tracemalloc  # noqa: E402
+
+from harness import add_users, app, auth, client, db, fail, token_for  # noqa: E402
+from models import Message  # noqa: E402
+
+def seed(sender, receiver, count):
+    with app.app_context():
+        db.session.execute(db.delete(Message))
+        low, high = min(sender, receiver), max(sender, receiver)
+        db.session.bulk_insert_mappings(Message, [
+            {'sender_id': sender, 'receiver_id': receiver, 'user_low_id': low, 'user_high_id': high,
+             'content': 'hello there ' * 8, 'is_read': True}
+            for _ in range(count)
+        ])
+        db.session.commit()
+
+def measure(url, headers):
+    """(peak MiB, elapsed ms, body MiB) for reading the whole response"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = client.get(url, headers=headers, buffered=False)
+    size = sum(len(chunk) for chunk in response.response)
+    response.close()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20, elapsed * 1000, size / 2 ** 20
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--flat-ratio', type=float, default=1.5)
+    args = parser.parse_args()
+
+    reader, sender = add_users(2)
+    headers = auth(token_for(reader))
+    stream_peaks = []
+    print('whole thread as a JSON array and as an NDJSON stream')
+    for count in args.sizes:
+        seed(sender, reader, count)
+        for label, url in [
+            ('array', f'/api/messages?user_id={sender}&limit={count}'),
+            ('ndjson', f'/api/messages?user_id={sender}&stream=1'),
+        ]:
+            peak, elapsed, size = measure(url, headers)
+            if label == 'ndjson':
+                stream_peaks.append(peak)
+            print(f'  {label:6s} {count:7d} messages  peak {peak:7.1f} MiB  {elapsed:6.0f} ms  {size:5.1f} MiB body')
+
+    if stream_peaks[-1] > stream_peaks[0] * args.flat_ratio:
+        fail(f'stream peak grew from {stream_peaks[0]:.1f} to {stream_peaks[-1]:.1f} MiB')
+
+if __name__ == '__main__':
+    main()
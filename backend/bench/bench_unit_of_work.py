@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Commits per request and latency for write handlers under concurrent load.
+
+--threads clients each register a freelancer, submit a proposal and send a
+message, --rounds times. Every engine-level COMMIT in the request's thread is
+counted, so a handler that commits twice shows 2.00.
+"""
+import argparse
+import threading
+import time
+
+from sqlalchemy import event
+
+from harness import app, auth, db, median, percentile, quiet, register
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--rounds', type=int, default=25)
+    args = parser.parse_args()
+
+    commits = threading.local()
+    with app.app_context():
+        event.listen(db.engine, 'commit', lambda conn: setattr(commits, 'count', getattr(commits, 'count', 0) + 1))
+
+    client_token, client_id = register('client@example.com', role='client')
+    with quiet():
+        project_id = app.test_client().post('/api/projects', json={
+            'title': 'Benchmark project', 'description': 'd', 'budget': 100
+        }, headers=auth(client_token)).get_json()['id']
+
+    results = {}  # handler -> [(commits, seconds), ...]
+    lock = threading.Lock()
+
+    def timed(name, call):
+        commits.count = 0
+        start = time.perf_counter()
+        response = call()
+        elapsed = time.perf_counter() - start
+        with lock:
+            results.setdefault(name, []).append((commits.count, elapsed))
+        return response
+
+    def worker(n):
+        client = app.test_client()
+        for i in range(args.rounds):
+            token = timed('register', lambda: client.post('/api/auth/register', json={
+                'email': f'freelancer{n}_{i}@example.com', 'password': 'password', 'role': 'freelancer', 'name': 'F'
+            })).get_json()['token']
+            timed('create_proposal', lambda: client.post('/api/proposals', json={
+                'project_id': project_id, 'cover_letter': 'x', 'proposed_amount': 10
+            }, headers=auth(token)))
+            timed('send_message', lambda: client.post('/api/messages', json={
+                'receiver_id': client_id, 'content': 'hi'
+            }, headers=auth(token)))
+
+    with quiet():
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(args.threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    print(f'{args.threads} threads x {args.rounds} rounds')
+    for name, samples in results.items():
+        counts = [count for count, _ in samples]
+        latencies = [elapsed * 1000 for _, elapsed in samples]
+        print(f'  {name:16s} commits/request {sum(counts) / len(counts):.2f}  '
+              f'p50 {median(latencies):6.1f} ms  p99 {percentile(latencies, 0.99):6.1f} ms')
+
+if __name__ == '__main__':
+    main()
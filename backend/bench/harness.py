@@ -0,0 +1,93 @@
+"""
+Shared setup for the benchmarks in this directory.
+
+    cd backend && python bench/bench_conversations.py
+
+Each benchmark runs the app in process against a throwaway SQLite database
+and prints its numbers; the ones with a budget exit non-zero when it is
+missed. Config is read when app.py is imported, so import this module before
+anything from the backend.
+
+Set BENCH_BACKEND to another checkout's backend directory (for example a git
+worktree of an older commit) to take the same measurement there.
+"""
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+BACKEND_DIR = os.environ.get('BENCH_BACKEND') or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_DIR = tempfile.mkdtemp(prefix='talentlink-bench-')
+os.environ.setdefault('DATABASE_URL', f'sqlite:///{DB_DIR}/bench.db')
+os.environ.setdefault('NOTIFICATION_WORKERS', '0')
+sys.path.insert(0, BACKEND_DIR)
+# The development JWT secret is short, which PyJWT warns about on every token
+warnings.filterwarnings('ignore', message='The HMAC key')
+
+def quiet():
+    """Swallow the handlers' debug prints while a block runs"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+with quiet():
+    import app as app_module
+from flask_jwt_extended import create_access_token  # noqa: E402
+from models import db, User  # noqa: E402
+
+app = app_module.app
+try:
+    from cli import init_db
+except ImportError:
+    pass  # Older trees create the schema when app.py is imported
+else:
+    with app.app_context():
+        init_db()
+client = app.test_client()
+
+def register(email, role='freelancer', name=None):
+    """Register through the API, returns (token, user_id)"""
+    body = client.post('/api/auth/register', json={
+        'email': email, 'password': 'password', 'role': role, 'name': name or email
+    }).get_json()
+    return body['token'], body['user']['id']
+
+def add_users(count, role='freelancer', prefix='user'):
+    """Bulk insert users without password hashing, returns their ids"""
+    with app.app_context():
+        start = db.session.query(db.func.coalesce(db.func.max(User.id), 0)).scalar()
+        db.session.bulk_insert_mappings(User, [
+            {'email': f'{prefix}{start + i}@example.com', 'password_hash': '-', 'role': role, 'name': f'{prefix} {i}'}
+            for i in range(1, count + 1)
+        ])
+        db.session.commit()
+        return list(range(start + 1, start + count + 1))
+
+def token_for(user_id):
+    with app.app_context():
+        return create_access_token(identity=str(user_id))
+
+def auth(token):
+    return {'Authorization': f'Bearer {token}'}
+
+def best_of(fn, repeat=5):
+    """Fastest of repeat runs of fn(), in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+def median(samples):
+    return statistics.median(samples)
+
+def fail(message):
+    print(f'FAIL: {message}')
+    sys.exit(1)
@@ -0,0 +1,239 @@
+"""
+Response caching for public read endpoints.
+
+Cached entries are tagged with the entities they were built from (for example
+'projects' or 'project:12'). Writes to tracked models are collected per
+session and the matching tags are invalidated after the transaction commits,
+so a response is never cached again from data that was rolled back.
+
+Backends:
+  - MemoryCacheBackend: in-process LRU with per-entry TTL. Invalidation only
+    reaches the worker that committed the write; the others keep serving
+    their copy until its TTL (CACHE_DEFAULT_TTL) runs out. Default when no
+    Redis URL is configured.
+  - RedisCacheBackend: any Redis-compatible client, shared between workers.
+    Default when CACHE_REDIS_URL or REDIS_URL is set.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import g, request, make_response
+from sqlalchemy import event
+
+CACHED_HEADERS = ('Content-Type', 'X-Next-Cursor')
+
+class MemoryCacheBackend:
+    """Thread-safe LRU keyed by string, entries expire after their TTL"""
+    name = 'memory'
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value, tags)
+        self._tags = {}  # tag -> set of keys
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl, tags=()):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tuple(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tags):
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def size(self):
+        return len(self._entries)
+
+    def _remove(self, key):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+class RedisCacheBackend:
+    """Cache stored in Redis, each tag is a set of the keys built from it"""
+    name = 'redis'
+
+    def __init__(self, client, prefix='talentlink:cache:'):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl, tags=()):
+        pipe = self.client.pipeline()
+        pipe.set(self.prefix + key, json.dumps(value), ex=ttl)
+        for tag in tags:
+            tag_key = self.prefix + 'tag:' + tag
+            pipe.sadd(tag_key, key)
+            pipe.expire(tag_key, ttl)
+        pipe.execute()
+
+    def invalidate(self, tags):
+        for tag in tags:
+            tag_key = self.prefix + 'tag:' + tag
+            keys = self.client.smembers(tag_key)
+            pipe = self.client.pipeline()
+            for key in keys:
+                pipe.delete(self.prefix + (key.decode() if isinstance(key, bytes) else key))
+            pipe.delete(tag_key)
+            pipe.execute()
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+    def size(self):
+        return sum(1 for key in self.client.scan_iter(match=self.prefix + '*')
+                   if b':tag:' not in (key if isinstance(key, bytes) else key.encode()))
+
+class ResponseCache:
+    """Flask extension caching GET responses and invalidating them by entity tag"""
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.enabled = True
+        self.default_ttl = 60
+        self.replica_ttl = 5
+        self.hits = 0
+        self.misses = 0
+        self._trackers = {}  # model class -> function returning tags for an instance
+        self._stats_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app, backend=None):
+        self.default_ttl = app.config.get('CACHE_DEFAULT_TTL', 60)
+        self.replica_ttl = max(1, int(app.config.get('REPLICA_STICKY_SECONDS', 5)))
+        self.enabled = app.config.get('CACHE_ENABLED', True)
+        if backend is not None:
+            self.backend = backend
+        elif app.config.get('CACHE_BACKEND', 'memory') == 'redis':
+            import redis
+            url = app.config.get('CACHE_REDIS_URL') or 'redis://localhost:6379/0'
+            self.backend = RedisCacheBackend(redis.Redis.from_url(url))
+        else:
+            self.backend = MemoryCacheBackend(app.config.get('CACHE_MAX_ENTRIES', 1024))
+        app.extensions['response_cache'] = self
+
+    # Invalidation
+
+    def track(self, model, tags):
+        """Invalidate tags(instance) whenever an instance of model is written"""
+        self._trackers[model] = tags
+
+    def bind(self, session):
+        """Collect tracked writes on a session and invalidate them after commit"""
+        event.listen(session, 'after_flush', self._collect)
+        event.listen(session, 'after_commit', self._flush_pending)
+        event.listen(session, 'after_soft_rollback', self._discard_pending)
+
+    def _collect(self, session, flush_context):
+        pending = session.info.setdefault('cache_tags', set())
+        for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+            tags = self._trackers.get(type(instance))
+            if tags is not None:
+                pending.update(tags(instance))
+
+    def _flush_pending(self, session):
+        tags = session.info.pop('cache_tags', None)
+        if tags:
+            self.invalidate(*tags)
+
+    def _discard_pending(self, session, previous_transaction):
+        session.info.pop('cache_tags', None)
+
+    def invalidate(self, *tags):
+        if self.backend is not None and tags:
+            self.backend.invalidate(tags)
+
+    # Reads
+
+    def cached(self, tags, ttl=None):
+        """Cache a GET view's response body, status and paging headers.
+
+        tags is called with the view's keyword arguments and returns the entity
+        tags the response depends on.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not self.enabled or request.method != 'GET':
+                    return view(*args, **kwargs)
+
+                key = request.path + '?' + '&'.join(
+                    f'{name}={value}' for name, value in sorted(request.args.items(multi=True))
+                )
+                entry = self.backend.get(key)
+                if entry is not None:
+                    self._count(hit=True)
+                    response = make_response(entry['body'], entry['status'])
+                    response.headers.update(entry['headers'])
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+
+                self._count(hit=False)
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200:
+                    # A lagging replica can rebuild an entry that was just invalidated,
+                    # so keep those no longer than the replica stickiness window
+                    entry_ttl = ttl or self.default_ttl
+                    if g.get('replica'):
+                        entry_ttl = min(entry_ttl, self.replica_ttl)
+                    self.backend.set(key, {
+                        'body': response.get_data(as_text=True),
+                        'status': response.status_code,
+                        'headers': {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+                    }, entry_ttl, tags(**kwargs))
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return wrapper
+        return decorator
+
+    def _count(self, hit):
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'backend': self.backend.name if self.backend else None,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 3) if total else 0.0,
+            'entries': self.backend.size() if self.backend else 0
+        }
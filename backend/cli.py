@@ -0,0 +1,68 @@
+"""
+Flask CLI commands for setting up a database.
+
+    flask init-db   # create missing tables and the search index
+    flask seed      # add the demo client and freelancer accounts
+    flask db ...    # Flask-Migrate, e.g. `db upgrade`
+
+Nothing here runs on import, so workers, scripts and tests start without
+touching the database. The flask command loads manage.py (see .flaskenv),
+which is the only place Flask-Migrate is registered.
+"""
+import click
+from flask.cli import with_appcontext
+from models import db, User, Profile
+from search import install_search_index
+from transactions import unit_of_work
+
+DEMO_PASSWORD = 'password123'
+
+def init_db():
+    db.create_all()
+    install_search_index()
+
+def seed_demo_users():
+    """Create the demo accounts unless they already exist, returns True if anything was added"""
+    if User.query.filter_by(email='client@demo.com').first():
+        return False
+    with unit_of_work():
+        client = User(email='client@demo.com', role='client', name='Demo Client')
+        client.set_password(DEMO_PASSWORD)
+        db.session.add(client)
+        
+        freelancer = User(email='freelancer@demo.com', role='freelancer', name='Demo Freelancer')
+        freelancer.set_password(DEMO_PASSWORD)
+        db.session.add(freelancer)
+        db.session.flush()
+        
+        # Create profiles
+        client_profile = Profile(user_id=client.id, bio='Looking for talented freelancers')
+        freelancer_profile = Profile(
+            user_id=freelancer.id,
+            bio='Full-stack developer with 5 years experience',
+            hourly_rate=50.0
+        )
+        freelancer_profile.set_skills(['React', 'Python', 'Flask', 'Node.js'])
+        db.session.add(client_profile)
+        db.session.add(freelancer_profile)
+    return True
+
+@click.command('init-db')
+@with_appcontext
+def init_db_command():
+    """Create missing tables and the full-text search index."""
+    init_db()
+    click.echo('Database initialized.')
+
+@click.command('seed')
+@with_appcontext
+def seed_command():
+    """Add the demo client and freelancer accounts."""
+    if seed_demo_users():
+        click.echo('Demo users created.')
+    else:
+        click.echo('Demo users already exist.')
+
+def register_commands(app):
+    app.cli.add_command(init_db_command)
+    app.cli.add_command(seed_command)
@@ -1,9 +1,66 @@
 import os
 from datetime import timedelta
 
+def engine_options(config, url=None):
+    """Engine options for url, by default the primary config.SQLALCHEMY_DATABASE_URI"""
+    url = url or config.SQLALCHEMY_DATABASE_URI
+    if url.startswith('sqlite'):
+        # Pragmas are set per connection in database.py; the driver timeout matches busy_timeout
+        return {'connect_args': {'timeout': config.SQLITE_BUSY_TIMEOUT_MS / 1000}}
+    
+    options = {
+        'pool_size': config.DB_POOL_SIZE,
+        'max_overflow': config.DB_MAX_OVERFLOW,
+        'pool_timeout': config.DB_POOL_TIMEOUT,
+        'pool_recycle': config.DB_POOL_RECYCLE,
+        'pool_pre_ping': True
+    }
+    if config.DB_STATEMENT_TIMEOUT_MS:
+        if url.startswith('postgres'):
+            options['connect_args'] = {'options': f'-c statement_timeout={config.DB_STATEMENT_TIMEOUT_MS}'}
+        elif url.startswith('mysql'):
+            options['connect_args'] = {'init_command': f'SET SESSION max_execution_time={config.DB_STATEMENT_TIMEOUT_MS}'}
+    return options
+
 class Config:
     SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'dev-secret-key')
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///freelance.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Comma separated replica URLs; read-only requests are spread over them
+    DATABASE_REPLICA_URLS = [url for url in os.getenv('DATABASE_REPLICA_URLS', '').split(',') if url]
+    REPLICA_STICKY_SECONDS = float(os.getenv('REPLICA_STICKY_SECONDS', 5))  # Reads stay on the primary this long after a user's write
+    # Pool settings apply to server databases (Postgres, MySQL); SQLite uses the pragmas below
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 20))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))  # Seconds before a connection is replaced
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 15000))  # 0 disables
+    SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'dev-secret-key')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
+    PAGE_SIZE = int(os.getenv('PAGE_SIZE', 20))
+    MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', 100))
+    MESSAGE_WINDOW = int(os.getenv('MESSAGE_WINDOW', 50))  # Latest messages returned when a thread is opened
+    STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', 500))  # Rows fetched and written per chunk of an NDJSON stream
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL') or os.getenv('REDIS_URL')
+    # memory or redis; memory is per process, so other workers serve a stale entry until its TTL ends
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND') or ('redis' if CACHE_REDIS_URL else 'memory')
+    CACHE_DEFAULT_TTL = int(os.getenv('CACHE_DEFAULT_TTL', 60))
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 1024))
+    SOCKETIO_MESSAGE_QUEUE = os.getenv('SOCKETIO_MESSAGE_QUEUE') or None  # Redis URL shared by ASGI workers
+    ASGI_HTTP_THREADS = int(os.getenv('ASGI_HTTP_THREADS', 40))  # Flask requests run at once under asgi.py
+    NOTIFICATION_QUEUE_BACKEND = os.getenv('NOTIFICATION_QUEUE_BACKEND', 'database')  # database or memory
+    NOTIFICATION_WORKERS = int(os.getenv('NOTIFICATION_WORKERS', 2))  # 0 leaves delivery to drain()
+    NOTIFICATION_BATCH_SIZE = int(os.getenv('NOTIFICATION_BATCH_SIZE', 100))
+    NOTIFICATION_POLL_INTERVAL = float(os.getenv('NOTIFICATION_POLL_INTERVAL', 1.0))
+    NOTIFICATION_MAX_ATTEMPTS = int(os.getenv('NOTIFICATION_MAX_ATTEMPTS', 5))  # Then the job is marked failed
+
+Config.SQLALCHEMY_ENGINE_OPTIONS = engine_options(Config)
+# Binds don't inherit SQLALCHEMY_ENGINE_OPTIONS, so each replica gets its own
+Config.SQLALCHEMY_BINDS = {
+    f'replica_{i}': {'url': url, **engine_options(Config, url)}
+    for i, url in enumerate(Config.DATABASE_REPLICA_URLS)
+}
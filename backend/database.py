@@ -0,0 +1,35 @@
+"""
+Per-connection engine tuning.
+
+Pool size, pre-ping and statement timeouts for server databases come from
+SQLALCHEMY_ENGINE_OPTIONS (see config.engine_options). SQLite has no pool worth
+tuning, so each new connection gets pragmas instead: WAL journaling so readers
+don't block the writer, synchronous=NORMAL (safe under WAL, one fsync per
+checkpoint rather than per commit), a busy timeout instead of immediate
+"database is locked" errors, and memory-mapped reads.
+"""
+from sqlalchemy import event
+
+def sqlite_pragmas(config):
+    return [
+        ('journal_mode', config['SQLITE_JOURNAL_MODE']),
+        ('synchronous', config['SQLITE_SYNCHRONOUS']),
+        ('busy_timeout', config['SQLITE_BUSY_TIMEOUT_MS']),
+        ('mmap_size', config['SQLITE_MMAP_SIZE']),
+    ]
+
+def configure_engine(app, db):
+    """Install connect-time tuning on the app's engines; call right after db.init_app(app)"""
+    with app.app_context():
+        engines = list(db.engines.values())
+    pragmas = sqlite_pragmas(app.config)
+    for engine in engines:
+        if engine.dialect.name != 'sqlite':
+            continue
+        
+        @event.listens_for(engine, 'connect')
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas:
+                cursor.execute(f'PRAGMA {name}={value}')
+            cursor.close()
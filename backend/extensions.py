@@ -0,0 +1,71 @@
+"""
+Extension instances shared by the blueprints.
+
+Everything here is created unbound and attached to an app in create_app(), so
+a blueprint can import what it needs without importing app.py. The session
+hooks are registered once per process, on the scoped session itself.
+"""
+from flask_cors import CORS
+from flask_jwt_extended import JWTManager
+from flask_socketio import SocketIO
+from replicas import ReplicaRouter
+from cache import ResponseCache
+from etags import ResourceVersions
+from notifications import NotificationDispatcher
+from jobs import NotificationQueue
+from models import db, Profile, Project, Proposal, Contract, Review, Notification, ProjectMilestone, MilestoneUpdate, Payment
+
+cors = CORS()
+jwt = JWTManager()
+socketio = SocketIO(cors_allowed_origins=["http://localhost:3000", "http://127.0.0.1:3000"],
+                    cors_credentials=True)
+
+# Read-only requests are served from replicas unless the caller wrote recently
+replica_router = ReplicaRouter()
+replica_router.bind(db.session)
+
+# Public reads are cached and dropped by tag once a write to their entities commits
+response_cache = ResponseCache()
+response_cache.bind(db.session)
+response_cache.track(Project, lambda p: ['projects', f'project:{p.id}'])
+response_cache.track(Proposal, lambda p: ['projects', f'project:{p.project_id}'])
+response_cache.track(Review, lambda r: [f'reviews:{r.reviewee_id}'])
+
+# Polled per-user endpoints answer If-None-Match from version counters bumped on write
+def _contract_scopes(contract):
+    project = db.session.get(Project, contract.project_id) if contract else None
+    if not project:
+        return []
+    return [f'contracts:{contract.freelancer_id}', f'contracts:{project.client_id}', f'dashboard:{contract.freelancer_id}']
+
+def _proposal_scopes(proposal):
+    project = db.session.get(Project, proposal.project_id)
+    return [f'dashboard:{proposal.freelancer_id}'] + ([f'dashboard:{project.client_id}'] if project else [])
+
+def _milestone_update_scopes(update):
+    milestone = db.session.get(ProjectMilestone, update.milestone_id)
+    return [f'milestones:{milestone.project_id}'] if milestone else []
+
+resource_versions = ResourceVersions()
+resource_versions.bind(db.session)
+resource_versions.track(Notification, lambda n: [f'notifications:{n.user_id}'])
+resource_versions.track(Contract, _contract_scopes)
+resource_versions.track(Payment, lambda p: _contract_scopes(db.session.get(Contract, p.contract_id)))
+resource_versions.track(Proposal, _proposal_scopes)
+resource_versions.track(Project, lambda p: [f'dashboard:{p.client_id}', 'projects'])
+resource_versions.track(Profile, lambda p: [f'profile:{p.user_id}'])
+resource_versions.track(ProjectMilestone, lambda m: [f'milestones:{m.project_id}'])
+resource_versions.track(MilestoneUpdate, _milestone_update_scopes)
+
+# New notifications are pushed to the owner's socket room once their transaction commits
+notification_dispatcher = NotificationDispatcher(socketio)
+notification_dispatcher.bind(db.session)
+
+# Write handlers queue notification intents; workers insert and push them after the write commits
+notification_queue = NotificationQueue(dispatcher=notification_dispatcher)
+notification_queue.bind(db.session)
+
+@notification_queue.on_deliver
+def _bump_notification_versions(session, rows):
+    # bulk inserts skip the flush hooks that normally bump these
+    resource_versions.bump(session, {f'notifications:{row["user_id"]}' for row in rows})
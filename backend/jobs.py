@@ -0,0 +1,293 @@
+"""
+Background delivery of notifications.
+
+Write handlers call notify() with a notification intent (recipient, type and
+template parameters) and commit once. Intents only become visible to the
+workers after that commit. A small pool of worker threads takes them in
+batches, renders the text, inserts the rows with bulk_insert_mappings and
+hands them to the socket dispatcher. An intent that fails is released and
+retried, after max_attempts tries it is marked failed and left alone.
+
+Backends:
+  - DatabaseJobBackend: intents are notification_job rows written in the
+    caller's transaction, so a crash never loses one (default)
+  - MemoryJobBackend: in-process queue filled after commit, lost on exit
+"""
+import json
+import logging
+import queue
+import threading
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from models import db, Notification, NotificationJob
+from notifications import render_notification, serialize_notification
+
+logger = logging.getLogger(__name__)
+
+class MemoryJobBackend:
+    """Intents held in a process-local queue until a worker takes them"""
+    name = 'memory'
+
+    def __init__(self, max_attempts=5):
+        self.max_attempts = max_attempts
+        self.failed = []  # Intents that used up their attempts
+        self._queue = queue.Queue()
+
+    def stage(self, session, intent):
+        session.info.setdefault('notification_intents', []).append(intent)
+
+    def committed(self, session):
+        for intent in session.info.pop('notification_intents', ()):
+            self._queue.put(intent)
+
+    def discard(self, session):
+        session.info.pop('notification_intents', None)
+
+    def take(self, limit):
+        batch = []
+        while len(batch) < limit:
+            try:
+                intent = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            intent['attempts'] = intent.get('attempts', 0) + 1
+            batch.append(intent)
+        return batch
+
+    def complete(self, batch):
+        pass
+
+    def release(self, batch):
+        for intent in batch:
+            if intent['attempts'] >= self.max_attempts:
+                self.failed.append(intent)
+            else:
+                self._queue.put(intent)
+
+    def size(self):
+        return self._queue.qsize()
+
+class DatabaseJobBackend:
+    """Intents stored in notification_job, claimed by workers with a token"""
+    name = 'database'
+
+    def __init__(self, claim_timeout=300, max_attempts=5):
+        self.claim_timeout = claim_timeout  # Seconds before a crashed worker's claim is retried
+        self.max_attempts = max_attempts
+
+    def stage(self, session, intent):
+        session.add(NotificationJob(
+            user_id=intent['user_id'],
+            type=intent['type'],
+            template=intent['template'],
+            params=json.dumps(intent['params'])
+        ))
+
+    def committed(self, session):
+        pass
+
+    def discard(self, session):
+        pass
+
+    def take(self, limit):
+        now = datetime.utcnow()
+        claimable = NotificationJob.failed_at.is_(None) & (NotificationJob.attempts < self.max_attempts) & (
+            NotificationJob.claim_token.is_(None) | (
+                NotificationJob.claimed_at < now - timedelta(seconds=self.claim_timeout)
+            )
+        )
+        ids = [job_id for job_id, in db.session.query(NotificationJob.id).filter(
+            claimable
+        ).order_by(NotificationJob.id).limit(limit)]
+        if not ids:
+            return []
+
+        # The claimable condition is repeated so concurrent workers never share a job
+        token = uuid.uuid4().hex
+        NotificationJob.query.filter(NotificationJob.id.in_(ids), claimable).update(
+            {'claim_token': token, 'claimed_at': now, 'attempts': NotificationJob.attempts + 1},
+            synchronize_session=False
+        )
+        db.session.commit()
+        return [{
+            'id': job.id,
+            'user_id': job.user_id,
+            'type': job.type,
+            'template': job.template,
+            'params': json.loads(job.params),
+            'attempts': job.attempts
+        } for job in NotificationJob.query.filter_by(claim_token=token).order_by(NotificationJob.id)]
+
+    def complete(self, batch):
+        # Runs in the same transaction as the notification inserts
+        NotificationJob.query.filter(NotificationJob.id.in_([intent['id'] for intent in batch])).delete(
+            synchronize_session=False
+        )
+
+    def release(self, batch):
+        ids = [intent['id'] for intent in batch]
+        NotificationJob.query.filter(NotificationJob.id.in_(ids)).update(
+            {'claim_token': None, 'claimed_at': None}, synchronize_session=False
+        )
+        NotificationJob.query.filter(
+            NotificationJob.id.in_(ids), NotificationJob.attempts >= self.max_attempts
+        ).update({'failed_at': datetime.utcnow()}, synchronize_session=False)
+        db.session.commit()
+
+    def size(self):
+        return NotificationJob.query.filter(NotificationJob.failed_at.is_(None)).count()
+
+class NotificationQueue:
+    """Accepts notification intents from write handlers and delivers them off the request path"""
+
+    def __init__(self, app=None, dispatcher=None, backend=None):
+        self.app = None
+        self.dispatcher = dispatcher
+        self.backend = backend
+        self.workers = 2
+        self.batch_size = 100
+        self.poll_interval = 1.0
+        self._listeners = []  # Called with (session, rows) before each delivery commits
+        self._wake = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app, backend=None):
+        self.app = app
+        self.workers = app.config.get('NOTIFICATION_WORKERS', 2)
+        self.batch_size = app.config.get('NOTIFICATION_BATCH_SIZE', 100)
+        self.poll_interval = app.config.get('NOTIFICATION_POLL_INTERVAL', 1.0)
+        max_attempts = app.config.get('NOTIFICATION_MAX_ATTEMPTS', 5)
+        if backend is not None:
+            self.backend = backend
+        elif app.config.get('NOTIFICATION_QUEUE_BACKEND', 'database') == 'memory':
+            self.backend = MemoryJobBackend(max_attempts=max_attempts)
+        else:
+            self.backend = DatabaseJobBackend(max_attempts=max_attempts)
+        # Jobs left pending by a previous process are picked up once this one serves traffic
+        app.before_request(self._start_on_first_request)
+        app.extensions['notification_queue'] = self
+
+    def bind(self, session):
+        event.listen(session, 'after_commit', self._committed)
+        event.listen(session, 'after_soft_rollback', self._rolled_back)
+
+    def on_deliver(self, listener):
+        """Register listener(session, rows) to run inside each delivery transaction"""
+        self._listeners.append(listener)
+        return listener
+
+    # Producers
+
+    def notify(self, user_id, type, template=None, **params):
+        """Queue a notification for user_id, delivered after the current transaction commits"""
+        self.backend.stage(db.session, {
+            'user_id': user_id,
+            'type': type,
+            'template': template or type,
+            'params': params
+        })
+        db.session.info['notifications_staged'] = True
+
+    def _committed(self, session):
+        if session.info.pop('notifications_staged', False):
+            self.backend.committed(session)
+            if self.workers:
+                self.start()
+                self._wake.set()
+
+    def _rolled_back(self, session, previous_transaction):
+        session.info.pop('notifications_staged', None)
+        self.backend.discard(session)
+
+    # Workers
+
+    def _start_on_first_request(self):
+        if self.workers and not self._threads:
+            self.start()
+
+    def start(self):
+        """Start the worker threads once per process"""
+        if self._threads:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f'notification-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            if not self.process_batch():
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def process_batch(self):
+        """Deliver up to batch_size pending intents, returns how many were delivered"""
+        with self.app.app_context():
+            try:
+                batch = self.backend.take(self.batch_size)
+            except Exception:
+                db.session.rollback()
+                logger.exception('Failed to take notification jobs')
+                return 0
+            if not batch:
+                return 0
+
+            now = datetime.utcnow()
+            rows, delivered, broken = [], [], []
+            for intent in batch:
+                try:
+                    content = render_notification(intent['template'], intent['params'])
+                except Exception:
+                    logger.exception('Failed to render %s notification', intent['template'])
+                    broken.append(intent)
+                    continue
+                rows.append({
+                    'user_id': intent['user_id'],
+                    'type': intent['type'],
+                    'content': content,
+                    'read': False,
+                    'created_at': now
+                })
+                delivered.append(intent)
+
+            try:
+                if rows:
+                    db.session.bulk_insert_mappings(Notification, rows, return_defaults=True)
+                    self.backend.complete(delivered)
+                    for listener in self._listeners:
+                        listener(db.session, rows)
+                    db.session.commit()
+            except Exception:
+                db.session.rollback()
+                logger.exception('Failed to deliver %d notifications', len(rows))
+                broken.extend(delivered)
+                rows = []
+
+            if broken:
+                self.backend.release(broken)
+                for intent in broken:
+                    if intent['attempts'] >= self.backend.max_attempts:
+                        logger.error('Giving up on %s notification for user %s after %d attempts',
+                                     intent['template'], intent['user_id'], intent['attempts'])
+
+        if self.dispatcher is not None and rows:
+            self.dispatcher.publish([
+                (row['user_id'], serialize_notification(Notification(**row))) for row in rows
+            ])
+        return len(rows)
+
+    def drain(self):
+        """Deliver everything pending in the calling thread, e.g. from scripts"""
+        delivered = 0
+        while True:
+            count = self.process_batch()
+            if not count:
+                return delivered
+            delivered += count
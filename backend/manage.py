@@ -0,0 +1,16 @@
+"""
+The app as the flask command loads it, with Flask-Migrate registered.
+
+    flask --app manage db upgrade
+    flask --app manage init-db
+    flask --app manage seed
+
+.flaskenv makes this the default for a bare `flask ...` in this directory.
+Servers, scripts and tests import app.py instead, so they never load
+Flask-Migrate or alembic.
+"""
+from flask_migrate import Migrate
+from app import app
+from models import db
+
+migrate = Migrate(app, db)
@@ -0,0 +1,66 @@
+"""Add conversation_summary table
+
+Revision ID: 8599205d9419
+Revises: 56960ac31691
+Create Date: 2026-10-18 09:12:04.311920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8599205d9419'
+down_revision = '56960ac31691'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('conversation_summary',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_low_id', sa.Integer(), nullable=False),
+    sa.Column('user_high_id', sa.Integer(), nullable=False),
+    sa.Column('last_message_id', sa.Integer(), nullable=True),
+    sa.Column('last_sender_id', sa.Integer(), nullable=True),
+    sa.Column('last_message_preview', sa.String(length=255), nullable=True),
+    sa.Column('last_message_at', sa.DateTime(), nullable=True),
+    sa.Column('unread_low', sa.Integer(), nullable=False),
+    sa.Column('unread_high', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['last_message_id'], ['message.id'], ),
+    sa.ForeignKeyConstraint(['last_sender_id'], ['user.id'], ),
+    sa.ForeignKeyConstraint(['user_high_id'], ['user.id'], ),
+    sa.ForeignKeyConstraint(['user_low_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_low_id', 'user_high_id', name='uq_conversation_pair')
+    )
+    with op.batch_alter_table('conversation_summary', schema=None) as batch_op:
+        batch_op.create_index('ix_conversation_high_last', ['user_high_id', 'last_message_id'], unique=False)
+        batch_op.create_index('ix_conversation_low_last', ['user_low_id', 'last_message_id'], unique=False)
+
+    # Backfill from existing message history
+    op.execute("""
+        INSERT INTO conversation_summary (user_low_id, user_high_id, last_message_id, last_sender_id,
+                                          last_message_preview, last_message_at, unread_low, unread_high)
+        SELECT t.user_low_id, t.user_high_id, t.last_message_id, m.sender_id,
+               substr(m.content, 1, 255), m.created_at, t.unread_low, t.unread_high
+        FROM (
+            SELECT CASE WHEN sender_id < receiver_id THEN sender_id ELSE receiver_id END AS user_low_id,
+                   CASE WHEN sender_id < receiver_id THEN receiver_id ELSE sender_id END AS user_high_id,
+                   max(id) AS last_message_id,
+                   sum(CASE WHEN receiver_id < sender_id AND NOT coalesce(is_read, false) THEN 1 ELSE 0 END) AS unread_low,
+                   sum(CASE WHEN receiver_id > sender_id AND NOT coalesce(is_read, false) THEN 1 ELSE 0 END) AS unread_high
+            FROM message
+            WHERE sender_id != receiver_id
+            GROUP BY 1, 2
+        ) AS t
+        JOIN message AS m ON m.id = t.last_message_id
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('conversation_summary', schema=None) as batch_op:
+        batch_op.drop_index('ix_conversation_low_last')
+        batch_op.drop_index('ix_conversation_high_last')
+
+    op.drop_table('conversation_summary')
@@ -0,0 +1,28 @@
+"""Add notification job attempts
+
+Revision ID: a7d3e5f0c218
+Revises: f5c2a8e19b37
+Create Date: 2026-10-18 21:12:05.613094
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3e5f0c218'
+down_revision = 'f5c2a8e19b37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('notification_job', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('failed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('notification_job', schema=None) as batch_op:
+        batch_op.drop_column('failed_at')
+        batch_op.drop_column('attempts')
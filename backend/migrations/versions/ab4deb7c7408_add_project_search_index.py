@@ -0,0 +1,61 @@
+"""Add project full-text search index
+
+Revision ID: ab4deb7c7408
+Revises: ecc965d7afa5
+Create Date: 2026-10-18 11:26:53.470218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ab4deb7c7408'
+down_revision = 'ecc965d7afa5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 table and triggers on SQLite, GIN tsvector index on Postgres.
+    # The DDL is copied from search.py as of this revision, so later edits there don't change it.
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        op.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS project_fts USING fts5(
+                title, description, content='project', content_rowid='id', tokenize='unicode61'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS project_fts_ai AFTER INSERT ON project BEGIN
+                INSERT INTO project_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS project_fts_ad AFTER DELETE ON project BEGIN
+                INSERT INTO project_fts(project_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS project_fts_au AFTER UPDATE OF title, description ON project BEGIN
+                INSERT INTO project_fts(project_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+                INSERT INTO project_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+            END
+        """)
+        # Index the projects that already exist
+        op.execute("INSERT INTO project_fts(project_fts) VALUES ('rebuild')")
+    elif bind.dialect.name == 'postgresql':
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_project_search ON project USING GIN "
+            "(to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, '')))"
+        )
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        for trigger in ('project_fts_au', 'project_fts_ad', 'project_fts_ai'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS project_fts')
+    elif bind.dialect.name == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_project_search')
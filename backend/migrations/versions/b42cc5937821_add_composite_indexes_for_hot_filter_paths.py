@@ -0,0 +1,88 @@
+"""Add composite indexes for hot filter paths
+
+Revision ID: b42cc5937821
+Revises: 8599205d9419
+Create Date: 2026-10-18 10:03:47.562118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b42cc5937821'
+down_revision = '8599205d9419'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('profile', schema=None) as batch_op:
+        batch_op.create_index('ix_profile_user_id', ['user_id'], unique=False)
+
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.create_index('ix_project_status_created', ['status', 'created_at'], unique=False)
+        batch_op.create_index('ix_project_client_created', ['client_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('proposal', schema=None) as batch_op:
+        batch_op.create_index('ix_proposal_freelancer_id', ['freelancer_id'], unique=False)
+        batch_op.create_index('ix_proposal_project_id', ['project_id'], unique=False)
+
+    with op.batch_alter_table('contract', schema=None) as batch_op:
+        batch_op.create_index('ix_contract_freelancer_id', ['freelancer_id'], unique=False)
+        batch_op.create_index('ix_contract_project_id', ['project_id'], unique=False)
+
+    with op.batch_alter_table('message', schema=None) as batch_op:
+        batch_op.create_index('ix_message_sender_receiver_created', ['sender_id', 'receiver_id', 'created_at'], unique=False)
+        batch_op.create_index('ix_message_receiver_read', ['receiver_id', 'is_read'], unique=False)
+
+    with op.batch_alter_table('review', schema=None) as batch_op:
+        batch_op.create_index('ix_review_reviewee_id', ['reviewee_id'], unique=False)
+
+    with op.batch_alter_table('notification', schema=None) as batch_op:
+        batch_op.create_index('ix_notification_user_created', ['user_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('project_milestone', schema=None) as batch_op:
+        batch_op.create_index('ix_project_milestone_project_order', ['project_id', 'order'], unique=False)
+
+    with op.batch_alter_table('milestone_update', schema=None) as batch_op:
+        batch_op.create_index('ix_milestone_update_milestone_created', ['milestone_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('payment', schema=None) as batch_op:
+        batch_op.create_index('ix_payment_contract_created', ['contract_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('payment', schema=None) as batch_op:
+        batch_op.drop_index('ix_payment_contract_created')
+
+    with op.batch_alter_table('milestone_update', schema=None) as batch_op:
+        batch_op.drop_index('ix_milestone_update_milestone_created')
+
+    with op.batch_alter_table('project_milestone', schema=None) as batch_op:
+        batch_op.drop_index('ix_project_milestone_project_order')
+
+    with op.batch_alter_table('notification', schema=None) as batch_op:
+        batch_op.drop_index('ix_notification_user_created')
+
+    with op.batch_alter_table('review', schema=None) as batch_op:
+        batch_op.drop_index('ix_review_reviewee_id')
+
+    with op.batch_alter_table('message', schema=None) as batch_op:
+        batch_op.drop_index('ix_message_receiver_read')
+        batch_op.drop_index('ix_message_sender_receiver_created')
+
+    with op.batch_alter_table('contract', schema=None) as batch_op:
+        batch_op.drop_index('ix_contract_project_id')
+        batch_op.drop_index('ix_contract_freelancer_id')
+
+    with op.batch_alter_table('proposal', schema=None) as batch_op:
+        batch_op.drop_index('ix_proposal_project_id')
+        batch_op.drop_index('ix_proposal_freelancer_id')
+
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.drop_index('ix_project_client_created')
+        batch_op.drop_index('ix_project_status_created')
+
+    with op.batch_alter_table('profile', schema=None) as batch_op:
+        batch_op.drop_index('ix_profile_user_id')
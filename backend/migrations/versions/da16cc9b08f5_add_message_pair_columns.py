@@ -0,0 +1,41 @@
+"""Add message pair columns
+
+Revision ID: da16cc9b08f5
+Revises: c5e0a7d4f912
+Create Date: 2026-10-18 17:02:31.418206
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'da16cc9b08f5'
+down_revision = 'c5e0a7d4f912'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('message', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('user_low_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('user_high_id', sa.Integer(), nullable=True))
+
+    # Backfill the pair from sender and receiver
+    op.execute("""
+        UPDATE message SET
+            user_low_id = CASE WHEN sender_id < receiver_id THEN sender_id ELSE receiver_id END,
+            user_high_id = CASE WHEN sender_id < receiver_id THEN receiver_id ELSE sender_id END
+    """)
+
+    with op.batch_alter_table('message', schema=None) as batch_op:
+        batch_op.alter_column('user_low_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('user_high_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_index('ix_message_pair_created', ['user_low_id', 'user_high_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('message', schema=None) as batch_op:
+        batch_op.drop_index('ix_message_pair_created')
+        batch_op.drop_column('user_high_id')
+        batch_op.drop_column('user_low_id')
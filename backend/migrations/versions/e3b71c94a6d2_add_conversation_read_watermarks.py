@@ -0,0 +1,50 @@
+"""Add conversation read watermarks
+
+Revision ID: e3b71c94a6d2
+Revises: da16cc9b08f5
+Create Date: 2026-10-18 18:41:07.552913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3b71c94a6d2'
+down_revision = 'da16cc9b08f5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('conversation_summary', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('last_read_low_id', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('last_read_high_id', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill each watermark to just before the user's first unread message,
+    # or to the last message when everything addressed to them is read
+    for side in ('low', 'high'):
+        op.execute(f"""
+            UPDATE conversation_summary SET last_read_{side}_id = COALESCE(
+                (SELECT MAX(m.id) FROM message m
+                 WHERE m.user_low_id = conversation_summary.user_low_id
+                   AND m.user_high_id = conversation_summary.user_high_id
+                   AND m.id < (SELECT MIN(u.id) FROM message u
+                               WHERE u.user_low_id = conversation_summary.user_low_id
+                                 AND u.user_high_id = conversation_summary.user_high_id
+                                 AND u.receiver_id = conversation_summary.user_{side}_id
+                                 AND NOT coalesce(u.is_read, false))),
+                CASE WHEN EXISTS (SELECT 1 FROM message u
+                                  WHERE u.user_low_id = conversation_summary.user_low_id
+                                    AND u.user_high_id = conversation_summary.user_high_id
+                                    AND u.receiver_id = conversation_summary.user_{side}_id
+                                    AND NOT coalesce(u.is_read, false))
+                     THEN 0 ELSE last_message_id END
+            )
+        """)
+
+
+def downgrade():
+    with op.batch_alter_table('conversation_summary', schema=None) as batch_op:
+        batch_op.drop_column('last_read_high_id')
+        batch_op.drop_column('last_read_low_id')
@@ -0,0 +1,35 @@
+"""Add rating aggregates to user
+
+Revision ID: ecc965d7afa5
+Revises: b42cc5937821
+Create Date: 2026-10-18 10:41:12.908135
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ecc965d7afa5'
+down_revision = 'b42cc5937821'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rating_sum', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('rating_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from existing reviews
+    op.execute("""
+        UPDATE "user" SET
+            rating_sum = coalesce((SELECT sum(rating) FROM review WHERE review.reviewee_id = "user".id), 0),
+            rating_count = (SELECT count(*) FROM review WHERE review.reviewee_id = "user".id)
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('rating_count')
+        batch_op.drop_column('rating_sum')
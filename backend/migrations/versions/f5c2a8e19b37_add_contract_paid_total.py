@@ -0,0 +1,33 @@
+"""Add contract paid total
+
+Revision ID: f5c2a8e19b37
+Revises: e3b71c94a6d2
+Create Date: 2026-10-18 19:26:44.180372
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5c2a8e19b37'
+down_revision = 'e3b71c94a6d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('contract', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('paid_total', sa.Float(), nullable=False, server_default='0'))
+
+    # Backfill from completed payments
+    op.execute("""
+        UPDATE contract SET paid_total = coalesce(
+            (SELECT sum(amount) FROM payment WHERE payment.contract_id = contract.id AND payment.status = 'completed'), 0
+        )
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('contract', schema=None) as batch_op:
+        batch_op.drop_column('paid_total')
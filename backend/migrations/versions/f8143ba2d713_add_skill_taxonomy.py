@@ -0,0 +1,99 @@
+"""Add skill taxonomy and profile/project skill associations
+
+Revision ID: f8143ba2d713
+Revises: ab4deb7c7408
+Create Date: 2026-10-18 12:08:31.225907
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f8143ba2d713'
+down_revision = 'ab4deb7c7408'
+branch_labels = None
+depends_on = None
+
+
+def _parse_skills(raw):
+    try:
+        names = json.loads(raw) if raw else []
+    except (TypeError, ValueError):
+        # Tolerate legacy comma separated values
+        names = raw.split(',')
+    if not isinstance(names, list):
+        return []
+    return [' '.join(str(name).split()) for name in names if str(name).strip()]
+
+
+def upgrade():
+    skill = op.create_table('skill',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('slug', sa.String(length=100), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('slug')
+    )
+    profile_skill = op.create_table('profile_skill',
+    sa.Column('profile_id', sa.Integer(), nullable=False),
+    sa.Column('skill_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['profile_id'], ['profile.id'], ),
+    sa.ForeignKeyConstraint(['skill_id'], ['skill.id'], ),
+    sa.PrimaryKeyConstraint('profile_id', 'skill_id')
+    )
+    project_skill = op.create_table('project_skill',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('skill_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['project.id'], ),
+    sa.ForeignKeyConstraint(['skill_id'], ['skill.id'], ),
+    sa.PrimaryKeyConstraint('project_id', 'skill_id')
+    )
+    with op.batch_alter_table('profile_skill', schema=None) as batch_op:
+        batch_op.create_index('ix_profile_skill_skill', ['skill_id', 'profile_id'], unique=False)
+
+    with op.batch_alter_table('project_skill', schema=None) as batch_op:
+        batch_op.create_index('ix_project_skill_skill', ['skill_id', 'project_id'], unique=False)
+
+    # Backfill from the JSON skill columns
+    bind = op.get_bind()
+    profiles = [(row.id, _parse_skills(row.skills))
+                for row in bind.execute(sa.text('SELECT id, skills FROM profile WHERE skills IS NOT NULL'))]
+    projects = [(row.id, _parse_skills(row.skills_required))
+                for row in bind.execute(sa.text('SELECT id, skills_required FROM project WHERE skills_required IS NOT NULL'))]
+
+    names = {}
+    for _, skill_names in profiles + projects:
+        for name in skill_names:
+            names.setdefault(name.lower(), name)
+    if not names:
+        return
+
+    op.bulk_insert(skill, [{'id': i, 'name': name, 'slug': slug}
+                           for i, (slug, name) in enumerate(sorted(names.items()), start=1)])
+    skill_ids = {slug: i for i, slug in enumerate(sorted(names), start=1)}
+
+    op.bulk_insert(profile_skill, [
+        {'profile_id': profile_id, 'skill_id': skill_id}
+        for profile_id, skill_names in profiles
+        for skill_id in {skill_ids[name.lower()] for name in skill_names}
+    ])
+    op.bulk_insert(project_skill, [
+        {'project_id': project_id, 'skill_id': skill_id}
+        for project_id, skill_names in projects
+        for skill_id in {skill_ids[name.lower()] for name in skill_names}
+    ])
+
+
+def downgrade():
+    with op.batch_alter_table('project_skill', schema=None) as batch_op:
+        batch_op.drop_index('ix_project_skill_skill')
+
+    with op.batch_alter_table('profile_skill', schema=None) as batch_op:
+        batch_op.drop_index('ix_profile_skill_skill')
+
+    op.drop_table('project_skill')
+    op.drop_table('profile_skill')
+    op.drop_table('skill')
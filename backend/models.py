@@ -1,8 +1,81 @@
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import case, event, func, inspect
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
+import json
 
-db = SQLAlchemy()
+class RoutingSession(Session):
+    """Session that reads from a replica bind when the current request allows it.
+
+    session.info['replica'] holds the replica bind key chosen for a read-only
+    request (see replicas.py). Flushes and INSERT/UPDATE/DELETE statements go
+    to the primary, and so does every read after the first write.
+    """
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        replica = self.info.get('replica')
+        if replica and bind is None:
+            if self._flushing or getattr(clause, 'is_dml', False):
+                self.info['replica'] = None
+            else:
+                return self._db.engines[replica]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+# INSERT ... ON CONFLICT constructs for the dialects that have them
+UPSERT_DIALECTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+
+# Skill associations, the composite primary key covers lookups by owner and
+# the extra index covers "who has this skill" lookups
+profile_skill = db.Table('profile_skill',
+    db.Column('profile_id', db.Integer, db.ForeignKey('profile.id'), primary_key=True),
+    db.Column('skill_id', db.Integer, db.ForeignKey('skill.id'), primary_key=True),
+    db.Index('ix_profile_skill_skill', 'skill_id', 'profile_id')
+)
+
+project_skill = db.Table('project_skill',
+    db.Column('project_id', db.Integer, db.ForeignKey('project.id'), primary_key=True),
+    db.Column('skill_id', db.Integer, db.ForeignKey('skill.id'), primary_key=True),
+    db.Index('ix_project_skill_skill', 'skill_id', 'project_id')
+)
+
+class Skill(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)  # Display name as first entered
+    slug = db.Column(db.String(100), unique=True, nullable=False)  # Lowercased lookup key
+    
+    @staticmethod
+    def slugify(name):
+        return ' '.join(str(name).split()).lower()
+    
+    @classmethod
+    def get_or_create_many(cls, names):
+        """Resolve skill names to Skill rows, creating missing ones (not flushed)"""
+        by_slug = {}
+        for name in names or []:
+            slug = cls.slugify(name)
+            if slug and slug not in by_slug:
+                by_slug[slug] = ' '.join(str(name).split())
+        if not by_slug:
+            return []
+        
+        existing = {s.slug: s for s in cls.query.filter(cls.slug.in_(by_slug)).all()}
+        skills = []
+        for slug, name in by_slug.items():
+            skill = existing.get(slug)
+            if skill is None:
+                skill = cls(name=name, slug=slug)
+                db.session.add(skill)
+            skills.append(skill)
+        return skills
+    
+    @classmethod
+    def matching(cls, relationship, names):
+        """Filter criteria requiring every named skill on the given association"""
+        return [relationship.any(cls.slug == cls.slugify(name)) for name in names if cls.slugify(name)]
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -11,6 +84,8 @@ class User(db.Model):
     role = db.Column(db.String(20), nullable=False)  # 'client' or 'freelancer'
     name = db.Column(db.String(100), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    rating_sum = db.Column(db.Integer, default=0, nullable=False)  # Sum of received review ratings
+    rating_count = db.Column(db.Integer, default=0, nullable=False)  # Number of received reviews
     
     profile = db.relationship('Profile', backref='user', uselist=False, cascade='all, delete-orphan')
     projects = db.relationship('Project', backref='client', lazy=True, foreign_keys='Project.client_id')
@@ -23,6 +98,45 @@ class User(db.Model):
     
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
+    
+    @property
+    def average_rating(self):
+        """Average received rating, None when the user has no reviews"""
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+    
+    @classmethod
+    def reconcile_ratings(cls, fix=True):
+        """Recompute rating aggregates from the review table in bulk.
+        
+        Returns a list of (user_id, stored, actual) tuples for every user whose
+        stored (rating_sum, rating_count) drifted, and corrects them when fix is set.
+        """
+        actual = db.session.query(
+            Review.reviewee_id.label('user_id'),
+            func.sum(Review.rating).label('rating_sum'),
+            func.count(Review.id).label('rating_count')
+        ).group_by(Review.reviewee_id).subquery()
+        
+        rows = db.session.query(
+            cls.id, cls.rating_sum, cls.rating_count,
+            func.coalesce(actual.c.rating_sum, 0), func.coalesce(actual.c.rating_count, 0)
+        ).outerjoin(actual, actual.c.user_id == cls.id).filter(
+            (cls.rating_sum != func.coalesce(actual.c.rating_sum, 0)) |
+            (cls.rating_count != func.coalesce(actual.c.rating_count, 0))
+        ).all()
+        
+        drift = [(user_id, (stored_sum, stored_count), (actual_sum, actual_count))
+                 for user_id, stored_sum, stored_count, actual_sum, actual_count in rows]
+        
+        if fix and drift:
+            db.session.bulk_update_mappings(cls, [
+                {'id': user_id, 'rating_sum': actual_sum, 'rating_count': actual_count}
+                for user_id, _, (actual_sum, actual_count) in drift
+            ])
+            db.session.commit()
+        return drift
 
 class Profile(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -34,6 +148,18 @@ class Profile(db.Model):
     avatar_url = db.Column(db.String(255))
     location = db.Column(db.String(100))
     
+    skill_set = db.relationship('Skill', secondary=profile_skill, lazy=True)
+    
+    __table_args__ = (
+        db.Index('ix_profile_user_id', 'user_id'),
+    )
+    
+    def set_skills(self, names):
+        """Store skills both as the JSON list and as normalized Skill rows"""
+        names = names or []
+        self.skills = json.dumps(names)
+        self.skill_set = Skill.get_or_create_many(names)
+    
 class Project(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     client_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -47,6 +173,18 @@ class Project(db.Model):
     
     proposals = db.relationship('Proposal', backref='project', lazy=True, cascade='all, delete-orphan')
     contract = db.relationship('Contract', backref='project', uselist=False, cascade='all, delete-orphan')
+    skill_set = db.relationship('Skill', secondary=project_skill, lazy=True)
+    
+    __table_args__ = (
+        db.Index('ix_project_status_created', 'status', 'created_at'),
+        db.Index('ix_project_client_created', 'client_id', 'created_at'),
+    )
+    
+    def set_skills(self, names):
+        """Store required skills both as the JSON list and as normalized Skill rows"""
+        names = names or []
+        self.skills_required = json.dumps(names)
+        self.skill_set = Skill.get_or_create_many(names)
 
 class Proposal(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -57,6 +195,11 @@ class Proposal(db.Model):
     delivery_time = db.Column(db.String(50))
     status = db.Column(db.String(20), default='pending')  # pending, accepted, rejected
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_proposal_freelancer_id', 'freelancer_id'),
+        db.Index('ix_proposal_project_id', 'project_id'),
+    )
 
 class Contract(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -67,15 +210,21 @@ class Contract(db.Model):
     status = db.Column(db.String(20), default='active')  # active, completed, cancelled
     start_date = db.Column(db.DateTime, default=datetime.utcnow)
     end_date = db.Column(db.DateTime)
+    paid_total = db.Column(db.Float, default=0, nullable=False)  # Sum of completed payments, kept by record_payment
     
     proposal = db.relationship('Proposal', backref='contract')
     freelancer = db.relationship('User', backref='contracts')
     payments = db.relationship('Payment', backref='contract', lazy=True, cascade='all, delete-orphan')
     
+    __table_args__ = (
+        db.Index('ix_contract_freelancer_id', 'freelancer_id'),
+        db.Index('ix_contract_project_id', 'project_id'),
+    )
+    
     @property
     def total_paid(self):
-        """Calculate total amount paid"""
-        return sum(p.amount for p in self.payments if p.status == 'completed')
+        """Total amount paid"""
+        return self.paid_total
     
     @property
     def remaining_amount(self):
@@ -99,6 +248,49 @@ class Contract(db.Model):
         if self.amount == 0:
             return 0
         return round((self.total_paid / self.amount) * 100, 1)
+    
+    def record_payment(self, amount):
+        """Add amount to paid_total unless that would overpay the contract, returns False if it would.
+        
+        The check and the increment are one UPDATE, so concurrent payments can't
+        both pass the balance check.
+        """
+        result = db.session.execute(
+            db.update(Contract).where(
+                Contract.id == self.id,
+                Contract.paid_total + amount <= Contract.amount
+            ).values(paid_total=Contract.paid_total + amount)
+        )
+        return result.rowcount == 1
+    
+    @classmethod
+    def reconcile_payments(cls, fix=True):
+        """Recompute paid_total from the payment ledger in bulk.
+        
+        Returns a list of (contract_id, stored, actual) tuples for every contract
+        whose stored paid_total drifted, and corrects them when fix is set.
+        """
+        actual = db.session.query(
+            Payment.contract_id,
+            func.sum(Payment.amount).label('paid_total')
+        ).filter(Payment.status == 'completed').group_by(Payment.contract_id).subquery()
+        
+        # Float sums only count as drift past half a cent
+        actual_total = func.coalesce(actual.c.paid_total, 0)
+        drift = db.session.query(
+            cls.id, cls.paid_total, actual_total
+        ).outerjoin(actual, actual.c.contract_id == cls.id).filter(
+            func.abs(cls.paid_total - actual_total) >= 0.005
+        ).all()
+        drift = [tuple(row) for row in drift]
+        
+        if fix and drift:
+            db.session.bulk_update_mappings(cls, [
+                {'id': contract_id, 'paid_total': actual_paid}
+                for contract_id, _, actual_paid in drift
+            ])
+            db.session.commit()
+        return drift
 
 class Message(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -109,17 +301,57 @@ class Message(db.Model):
     is_read = db.Column(db.Boolean, default=False)
     read_at = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    user_low_id = db.Column(db.Integer, nullable=False)  # smaller user id of the pair, set on insert
+    user_high_id = db.Column(db.Integer, nullable=False)  # larger user id of the pair, set on insert
     
     # Relationships
     receiver = db.relationship('User', foreign_keys=[receiver_id], backref='received_messages')
     project = db.relationship('Project', backref='messages')
     
+    __table_args__ = (
+        db.Index('ix_message_sender_receiver_created', 'sender_id', 'receiver_id', 'created_at'),
+        db.Index('ix_message_receiver_read', 'receiver_id', 'is_read'),
+        db.Index('ix_message_pair_created', 'user_low_id', 'user_high_id', 'created_at', 'id'),
+    )
+    
+    @classmethod
+    def thread(cls, user_a, user_b):
+        """Messages between two users in either direction, one range of ix_message_pair_created"""
+        low, high = (user_a, user_b) if user_a < user_b else (user_b, user_a)
+        return cls.query.filter(cls.user_low_id == low, cls.user_high_id == high)
+    
+    @classmethod
+    def _position(cls, message_id):
+        created_at = db.select(cls.created_at).where(cls.id == message_id).scalar_subquery()
+        return db.tuple_(created_at, message_id)
+    
+    @classmethod
+    def before(cls, message_id):
+        """Filter for messages ordered before message_id by (created_at, id)"""
+        return db.tuple_(cls.created_at, cls.id) < cls._position(message_id)
+    
+    @classmethod
+    def through(cls, message_id):
+        """Filter for message_id and the messages ordered before it"""
+        return db.tuple_(cls.created_at, cls.id) <= cls._position(message_id)
+    
+    @classmethod
+    def after(cls, message_id):
+        """Filter for messages ordered after message_id by (created_at, id)"""
+        return db.tuple_(cls.created_at, cls.id) > cls._position(message_id)
+    
     def mark_as_read(self):
         if not self.is_read:
             self.is_read = True
             self.read_at = datetime.utcnow()
             db.session.commit()
 
+# Every message records its (low, high) user pair so a thread is one index range
+@event.listens_for(Message, 'before_insert')
+def _message_pair(mapper, connection, message):
+    low, high = sorted((message.sender_id, message.receiver_id))
+    message.user_low_id, message.user_high_id = low, high
+
 class Review(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
@@ -131,6 +363,39 @@ class Review(db.Model):
     
     project = db.relationship('Project', backref='reviews')
     reviewee = db.relationship('User', foreign_keys=[reviewee_id], backref='reviews_received')
+    
+    __table_args__ = (
+        db.Index('ix_review_reviewee_id', 'reviewee_id'),
+    )
+
+def _adjust_rating(connection, user_id, delta_sum, delta_count):
+    connection.execute(
+        db.update(User).where(User.id == user_id).values(
+            rating_sum=User.rating_sum + delta_sum,
+            rating_count=User.rating_count + delta_count
+        )
+    )
+
+# Keep User rating aggregates in step with every review write, inside the same flush
+@event.listens_for(Review, 'after_insert')
+def _review_inserted(mapper, connection, review):
+    _adjust_rating(connection, review.reviewee_id, review.rating, 1)
+
+@event.listens_for(Review, 'before_update')
+def _review_updating(mapper, connection, review):
+    state = inspect(review)
+    if not state.attrs.rating.history.has_changes() and not state.attrs.reviewee_id.history.has_changes():
+        return
+    # Read the stored row, attribute history has no old value for expired attributes
+    old_rating, old_reviewee_id = connection.execute(
+        db.select(Review.rating, Review.reviewee_id).where(Review.id == review.id)
+    ).one()
+    _adjust_rating(connection, old_reviewee_id, -old_rating, -1)
+    _adjust_rating(connection, review.reviewee_id, review.rating, 1)
+
+@event.listens_for(Review, 'after_delete')
+def _review_deleted(mapper, connection, review):
+    _adjust_rating(connection, review.reviewee_id, -review.rating, -1)
 
 class Notification(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -141,6 +406,27 @@ class Notification(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     user = db.relationship('User', backref='notifications')
+    
+    __table_args__ = (
+        db.Index('ix_notification_user_created', 'user_id', 'created_at'),
+    )
+
+class NotificationJob(db.Model):
+    """Notification intent waiting for the background worker, written with the triggering change"""
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    type = db.Column(db.String(50), nullable=False)
+    template = db.Column(db.String(50), nullable=False)
+    params = db.Column(db.Text, nullable=False, default='{}')  # JSON template parameters
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    claim_token = db.Column(db.String(32))  # Set by the worker that took the job
+    claimed_at = db.Column(db.DateTime)
+    attempts = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    failed_at = db.Column(db.DateTime)  # Set once attempts reaches NOTIFICATION_MAX_ATTEMPTS
+    
+    __table_args__ = (
+        db.Index('ix_notification_job_claim', 'claim_token', 'id'),
+    )
 
 class ProjectMilestone(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -157,6 +443,10 @@ class ProjectMilestone(db.Model):
     
     project = db.relationship('Project', backref='milestones')
     updates = db.relationship('MilestoneUpdate', backref='milestone', lazy=True, cascade='all, delete-orphan')
+    
+    __table_args__ = (
+        db.Index('ix_project_milestone_project_order', 'project_id', 'order'),
+    )
 
 class MilestoneUpdate(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -168,6 +458,10 @@ class MilestoneUpdate(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     user = db.relationship('User', backref='milestone_updates')
+    
+    __table_args__ = (
+        db.Index('ix_milestone_update_milestone_created', 'milestone_id', 'created_at'),
+    )
 
 class Payment(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -182,3 +476,182 @@ class Payment(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     payer = db.relationship('User', backref='payments_made')
+    
+    __table_args__ = (
+        db.Index('ix_payment_contract_created', 'contract_id', 'created_at'),
+    )
+
+# Payments are the ledger behind Contract.paid_total: a correction is a new row, never an edit
+@event.listens_for(Payment, 'before_update')
+def _payment_updating(mapper, connection, payment):
+    state = inspect(payment)
+    for key in ('contract_id', 'amount', 'status'):
+        if state.attrs[key].history.has_changes():
+            raise ValueError(f'Payment {key} cannot change once recorded')
+
+class ResourceVersion(db.Model):
+    """Write counter for a cacheable response scope, used to build ETags"""
+    key = db.Column(db.String(100), primary_key=True)  # e.g. 'notifications:7'
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+class ConversationSummary(db.Model):
+    """Denormalized inbox row for a pair of users, maintained on every message write"""
+    id = db.Column(db.Integer, primary_key=True)
+    user_low_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)  # smaller user id of the pair
+    user_high_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)  # larger user id of the pair
+    last_message_id = db.Column(db.Integer, db.ForeignKey('message.id'))
+    last_sender_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    last_message_preview = db.Column(db.String(255))
+    last_message_at = db.Column(db.DateTime)
+    unread_low = db.Column(db.Integer, default=0, nullable=False)  # messages to user_low after its watermark
+    unread_high = db.Column(db.Integer, default=0, nullable=False)  # messages to user_high after its watermark
+    last_read_low_id = db.Column(db.Integer, default=0, nullable=False)  # last message user_low has read, 0 for none
+    last_read_high_id = db.Column(db.Integer, default=0, nullable=False)  # last message user_high has read, 0 for none
+    
+    __table_args__ = (
+        db.UniqueConstraint('user_low_id', 'user_high_id', name='uq_conversation_pair'),
+        db.Index('ix_conversation_low_last', 'user_low_id', 'last_message_id'),
+        db.Index('ix_conversation_high_last', 'user_high_id', 'last_message_id'),
+    )
+    
+    PREVIEW_LENGTH = 255
+    
+    @staticmethod
+    def pair(user_a, user_b):
+        return (user_a, user_b) if user_a < user_b else (user_b, user_a)
+    
+    @classmethod
+    def for_users(cls, user_a, user_b, create=False):
+        """Get the summary for two users, optionally creating it in the current transaction"""
+        low, high = cls.pair(user_a, user_b)
+        summary = cls.query.filter_by(user_low_id=low, user_high_id=high).first()
+        if summary is None and create:
+            # The first two messages of a pair can both get here; the loser keeps the winner's row
+            values = dict(user_low_id=low, user_high_id=high, unread_low=0, unread_high=0,
+                          last_read_low_id=0, last_read_high_id=0)
+            upsert = UPSERT_DIALECTS.get(db.session.get_bind().dialect.name)
+            if upsert is not None:
+                db.session.execute(upsert(cls).values(**values).on_conflict_do_nothing(
+                    index_elements=['user_low_id', 'user_high_id']
+                ))
+            else:
+                try:
+                    with db.session.begin_nested():
+                        db.session.add(cls(**values))
+                except IntegrityError:
+                    pass
+            summary = cls.query.filter_by(user_low_id=low, user_high_id=high).one()
+        return summary
+    
+    def counterpart_id(self, user_id):
+        return self.user_high_id if user_id == self.user_low_id else self.user_low_id
+    
+    def unread_for(self, user_id):
+        return self.unread_low if user_id == self.user_low_id else self.unread_high
+    
+    def last_read_for(self, user_id):
+        return self.last_read_low_id if user_id == self.user_low_id else self.last_read_high_id
+    
+    def record_message(self, message):
+        """Point the summary at a newer message and bump the receiver's unread counter"""
+        # Decided in SQL against the stored row, so a message whose transaction commits
+        # after a later one's never moves the summary backwards
+        newer = func.coalesce(ConversationSummary.last_message_id, 0) < message.id
+        for column, value in [
+            ('last_message_id', message.id),
+            ('last_sender_id', message.sender_id),
+            ('last_message_preview', message.content[:self.PREVIEW_LENGTH]),
+            ('last_message_at', message.created_at),
+        ]:
+            setattr(self, column, case((newer, value), else_=getattr(ConversationSummary, column)))
+        self._add_unread(message.receiver_id, 1)
+    
+    def advance_read(self, user_id, message_id):
+        """
+        Move user_id's read watermark up to message_id, returns how many messages it marked read.
+        
+        Does nothing, and writes nothing, unless the watermark actually moves forward.
+        """
+        previous = self.last_read_for(user_id)
+        if message_id <= previous:
+            return 0
+        
+        incoming = Message.thread(self.user_low_id, self.user_high_id).filter(Message.receiver_id == user_id)
+        newly_read = incoming.filter(Message.through(message_id), func.coalesce(Message.is_read, False) == False)
+        if previous:
+            newly_read = newly_read.filter(Message.after(previous))
+        count = newly_read.update({'is_read': True, 'read_at': datetime.utcnow()}, synchronize_session=False)
+        
+        # Unread is whatever is left after the watermark, never moved backwards by a slower request
+        unread = incoming.filter(Message.after(message_id)).with_entities(func.count(Message.id)).scalar_subquery()
+        if user_id == self.user_low_id:
+            self.last_read_low_id = case((ConversationSummary.last_read_low_id < message_id, message_id),
+                                         else_=ConversationSummary.last_read_low_id)
+            self.unread_low = unread
+        else:
+            self.last_read_high_id = case((ConversationSummary.last_read_high_id < message_id, message_id),
+                                          else_=ConversationSummary.last_read_high_id)
+            self.unread_high = unread
+        return count
+    
+    def _add_unread(self, user_id, delta):
+        if self.id is None:
+            if user_id == self.user_low_id:
+                self.unread_low += delta
+            else:
+                self.unread_high += delta
+            return
+        
+        # SQL-side arithmetic so concurrent writers don't lose updates
+        if user_id == self.user_low_id:
+            self.unread_low = ConversationSummary.unread_low + delta
+        else:
+            self.unread_high = ConversationSummary.unread_high + delta
+    
+    @classmethod
+    def rebuild(cls):
+        """Recreate every summary from the message table in bulk, returns the row count"""
+        low = case((Message.sender_id < Message.receiver_id, Message.sender_id), else_=Message.receiver_id)
+        high = case((Message.sender_id < Message.receiver_id, Message.receiver_id), else_=Message.sender_id)
+        unread = func.coalesce(Message.is_read, False) == False  # NULL predates the column, as in the migrations
+        threads = db.session.query(
+            low.label('user_low_id'),
+            high.label('user_high_id'),
+            func.max(Message.id).label('last_message_id'),
+            func.sum(case(((Message.receiver_id == low) & unread, 1), else_=0)).label('unread_low'),
+            func.sum(case(((Message.receiver_id == high) & unread, 1), else_=0)).label('unread_high'),
+            func.min(case(((Message.receiver_id == low) & unread, Message.id))).label('first_unread_low'),
+            func.min(case(((Message.receiver_id == high) & unread, Message.id))).label('first_unread_high')
+        ).filter(Message.sender_id != Message.receiver_id).group_by(low, high).subquery()
+        
+        def last_read(first_unread):
+            # The watermark sits just before a user's first unread message, or at the end if none is unread
+            earlier = db.aliased(Message)
+            read_before = db.select(func.max(earlier.id)).where(
+                earlier.user_low_id == threads.c.user_low_id,
+                earlier.user_high_id == threads.c.user_high_id,
+                earlier.id < first_unread
+            ).scalar_subquery()
+            return case((first_unread.is_(None), threads.c.last_message_id), else_=func.coalesce(read_before, 0))
+        
+        rows = db.session.query(
+            threads.c.user_low_id,
+            threads.c.user_high_id,
+            threads.c.last_message_id,
+            Message.sender_id,
+            func.substr(Message.content, 1, cls.PREVIEW_LENGTH),
+            Message.created_at,
+            threads.c.unread_low,
+            threads.c.unread_high,
+            last_read(threads.c.first_unread_low),
+            last_read(threads.c.first_unread_high)
+        ).join(Message, Message.id == threads.c.last_message_id)
+        
+        db.session.execute(db.delete(cls))
+        result = db.session.execute(db.insert(cls).from_select([
+            'user_low_id', 'user_high_id', 'last_message_id', 'last_sender_id',
+            'last_message_preview', 'last_message_at', 'unread_low', 'unread_high',
+            'last_read_low_id', 'last_read_high_id'
+        ], rows))
+        db.session.commit()
+        return result.rowcount
@@ -0,0 +1,98 @@
+"""
+Real-time notification delivery.
+
+Notification text is rendered from TEMPLATES by the background queue in
+jobs.py. Rows it bulk-inserts are handed to the dispatcher directly; any row
+added through the session is picked up after flush. Either way the dispatcher
+only pushes once the transaction commits, to the owner's Socket.IO room.
+Rows for the same user that arrive within a short window are coalesced into
+one 'notifications' event, and a client that reconnects receives everything
+after the last id it saw.
+"""
+import threading
+from sqlalchemy import event
+from models import Notification
+
+# Notification text by template name, filled from the intent's parameters
+TEMPLATES = {
+    'new_proposal': 'New proposal received for {project_title}',
+    'payment_received': 'Payment of ${amount} received for project "{project_title}"',
+    'new_message': 'New message from {sender_name}',
+    'milestone_update': 'Milestone "{milestone_name}" updated to {progress}% in project "{project_title}"',
+    'milestone_comment': 'New update on "{milestone_name}" in project "{project_title}"',
+}
+
+def render_notification(template, params):
+    return TEMPLATES[template].format(**params)
+
+def user_room(user_id):
+    return f'user_{user_id}'
+
+def serialize_notification(n):
+    return {
+        'id': n.id,
+        'type': n.type,
+        'content': n.content,
+        'read': n.read,
+        'created_at': n.created_at.isoformat()
+    }
+
+class NotificationDispatcher:
+    """Pushes committed notifications to per-user rooms, batching bursts"""
+
+    def __init__(self, socketio=None, window=0.25, catch_up_limit=100):
+        self.socketio = socketio
+        self.window = window  # Seconds to wait for more notifications before emitting
+        self.catch_up_limit = catch_up_limit
+        self._buffers = {}  # user_id -> payloads waiting for the window to close
+        self._lock = threading.Lock()
+
+    def bind(self, session):
+        event.listen(session, 'after_flush', self._collect)
+        event.listen(session, 'after_commit', self._publish_pending)
+        event.listen(session, 'after_soft_rollback', self._discard_pending)
+
+    def _collect(self, session, flush_context):
+        # Ids and defaults are populated by now, serialize while the rows are loaded
+        pending = session.info.setdefault('notifications', [])
+        pending.extend(
+            (n.user_id, serialize_notification(n))
+            for n in session.new if isinstance(n, Notification)
+        )
+
+    def _publish_pending(self, session):
+        pending = session.info.pop('notifications', None)
+        if pending:
+            self.publish(pending)
+
+    def _discard_pending(self, session, previous_transaction):
+        session.info.pop('notifications', None)
+
+    def publish(self, items):
+        """Queue (user_id, payload) pairs, one delayed emit per user per window"""
+        if self.socketio is None:
+            return
+        start = []
+        with self._lock:
+            for user_id, payload in items:
+                buffer = self._buffers.setdefault(user_id, [])
+                if not buffer:
+                    start.append(user_id)
+                buffer.append(payload)
+        for user_id in start:
+            self.socketio.start_background_task(self._drain, user_id)
+
+    def _drain(self, user_id):
+        self.socketio.sleep(self.window)
+        with self._lock:
+            payloads = self._buffers.pop(user_id, [])
+        if payloads:
+            self.socketio.emit('notifications', payloads, to=user_room(user_id))
+
+    def catch_up(self, user_id, after_id):
+        """Notifications created since after_id, oldest first, for a reconnecting client"""
+        rows = Notification.query.filter(
+            Notification.user_id == user_id,
+            Notification.id > after_id
+        ).order_by(Notification.id.asc()).limit(self.catch_up_limit).all()
+        return [serialize_notification(n) for n in rows]
@@ -0,0 +1,26 @@
+"""
+Page size and cursor helpers for list endpoints.
+
+Lists return at most page_size() rows and an X-Next-Cursor header when there
+is more; the client passes that value back as ?cursor= for the next page.
+"""
+import base64
+import json
+from flask import current_app, request
+
+def page_size(default=None):
+    """Requested page size from ?limit=, bounded by the configured maximum"""
+    limit = request.args.get('limit', default or current_app.config['PAGE_SIZE'], type=int)
+    return min(max(limit, 1), current_app.config['MAX_PAGE_SIZE'])
+
+def encode_cursor(*values):
+    """Opaque pagination cursor built from the sort key of a page's last row"""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Sort key values from a cursor made by encode_cursor, None if it is malformed"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        return None
+    return values if isinstance(values, list) and values else None
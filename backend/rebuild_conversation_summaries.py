@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+Backfill the conversation_summary table from the existing message table
+"""
+from app import app, db
+from models import ConversationSummary
+
+def rebuild_conversation_summaries():
+    """Rebuild every conversation summary in one bulk INSERT ... SELECT"""
+    with app.app_context():
+        print("Rebuilding conversation summaries...")
+        count = ConversationSummary.rebuild()
+        print(f"✓ Rebuilt {count} conversation summaries")
+
+if __name__ == '__main__':
+    rebuild_conversation_summaries()
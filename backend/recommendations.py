@@ -0,0 +1,266 @@
+"""
+Freelancer to project recommendations.
+
+Open projects are held as a matrix of skill bitsets (one bit per Skill id) so a
+freelancer can be scored against every open project with a handful of
+vectorized NumPy operations. A score combines skill coverage, budget fit and
+the freelancer's rating. Each freelancer's best matches are cached.
+
+Project and profile writes bump the 'projects' and 'profile:<id>' version
+counters (see etags.py), which every worker checks on each request. Project
+writes committed by this process are also recorded by id. When the project
+version moved by exactly those writes, only their rows are reloaded and
+patched into the matrix; any other move means another worker wrote, and the
+matrix is rebuilt. A freelancer's cached matches are recomputed once their
+profile version or the matrix moves. Queries and scoring run outside the
+engine lock, which only guards swapping in the new matrix and the cache.
+"""
+import threading
+import numpy as np
+from sqlalchemy import event
+from extensions import resource_versions
+from models import db, Profile, Project, User, profile_skill, project_skill
+
+SKILL_WEIGHT = 0.6
+BUDGET_WEIGHT = 0.25
+RATING_WEIGHT = 0.15
+REFERENCE_HOURS = 40  # Hours of work a project budget is compared against
+CACHE_SIZE = 50  # Matches cached per freelancer
+BLOCK_BYTES = 64 * 1024 * 1024  # Upper bound for one freelancer x project block
+
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+def _bitcount(words):
+    # np.bitwise_count is NumPy 2.0+, fall back to a byte lookup table
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+    counts = _POPCOUNT[np.ascontiguousarray(words).view(np.uint8)]
+    return counts.reshape(words.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+def popcount(words):
+    """Count set bits along the last axis of a uint64 array"""
+    return _bitcount(words).sum(axis=-1, dtype=np.int32)
+
+def skill_bitsets(rows, skill_ids, n_rows, words):
+    """Pack (row, skill_id) pairs into an n_rows x words uint64 bitset matrix"""
+    bits = np.zeros((n_rows, words), dtype=np.uint64)
+    rows = np.asarray(rows, dtype=np.int64)
+    skill_ids = np.asarray(skill_ids, dtype=np.int64)
+    keep = skill_ids < words * 64
+    rows, skill_ids = rows[keep], skill_ids[keep]
+    if len(rows):
+        masks = np.left_shift(np.uint64(1), (skill_ids % 64).astype(np.uint64))
+        np.bitwise_or.at(bits, (rows, skill_ids // 64), masks)
+    return bits
+
+def score_matrix(freelancer_bits, rates, ratings, project_bits, budgets, required):
+    """Score every freelancer against every project, returns a float32 F x P matrix.
+
+    rates and ratings are per freelancer (NaN when unknown), budgets and required
+    (popcount of the project's skill bits) are per project.
+    """
+    n_freelancers, n_projects = len(freelancer_bits), len(project_bits)
+    scores = np.empty((n_freelancers, n_projects), dtype=np.float32)
+    if not n_freelancers or not n_projects:
+        return scores
+
+    # Per-project skill weight: share of the required skills each overlapping bit is worth
+    skill_unit = np.where(required > 0, SKILL_WEIGHT / np.maximum(required, 1), 0).astype(np.float32)
+    skill_floor = np.where(required > 0, 0, SKILL_WEIGHT * 0.5).astype(np.float32)
+    budgets = budgets.astype(np.float32)
+    known_rate = ~np.isnan(rates) & (rates > 0)
+    inverse_cost = np.where(known_rate, 1.0 / np.where(known_rate, rates, 1) / REFERENCE_HOURS, 0).astype(np.float32)
+    fixed = RATING_WEIGHT * np.where(np.isnan(ratings), 1.0, ratings / 5.0)
+    fixed = (fixed + np.where(known_rate, 0, BUDGET_WEIGHT)).astype(np.float32)
+
+    # Work in row blocks so the F x P temporaries stay bounded
+    block = max(1, BLOCK_BYTES // (n_projects * 4 * 3))
+    for start in range(0, n_freelancers, block):
+        stop = min(start + block, n_freelancers)
+        overlap = np.zeros((stop - start, n_projects), dtype=np.uint16)
+        for word in range(project_bits.shape[1]):
+            overlap += _bitcount(freelancer_bits[start:stop, word, None] & project_bits[None, :, word])
+
+        out = scores[start:stop]
+        np.multiply(overlap, skill_unit, out=out)
+        out += skill_floor
+
+        budget = np.multiply(inverse_cost[start:stop, None], budgets[None, :])
+        np.minimum(budget, 1.0, out=budget)
+        budget[~known_rate[start:stop]] = 0
+        budget *= BUDGET_WEIGHT
+        out += budget
+        out += fixed[start:stop, None]
+    return scores
+
+def _widen(bits, words):
+    if bits.shape[1] == words:
+        return bits
+    return np.pad(bits, ((0, 0), (0, words - bits.shape[1])))
+
+class ProjectMatrix:
+    """Open projects as rows of skill bitsets, budgets and required skill counts"""
+
+    def __init__(self, ids, budgets, bits, required=None):
+        self.ids = ids
+        self.budgets = budgets
+        self.bits = bits
+        self.words = bits.shape[1]
+        self.required = popcount(bits) if required is None else required
+
+    @classmethod
+    def load(cls, project_ids=None):
+        """Query the open projects, or only those among project_ids"""
+        projects = db.session.query(Project.id, Project.budget).filter(Project.status == 'open')
+        pairs = db.session.query(project_skill.c.project_id, project_skill.c.skill_id).join(
+            Project, Project.id == project_skill.c.project_id
+        ).filter(Project.status == 'open')
+        if project_ids is not None:
+            projects = projects.filter(Project.id.in_(project_ids))
+            pairs = pairs.filter(Project.id.in_(project_ids))
+        projects, pairs = projects.all(), pairs.all()
+
+        ids = np.array([p.id for p in projects], dtype=np.int64)
+        row = {project_id: i for i, project_id in enumerate(ids.tolist())}
+        max_skill = max((skill_id for _, skill_id in pairs), default=0)
+        bits = skill_bitsets(
+            [row[project_id] for project_id, _ in pairs],
+            [skill_id for _, skill_id in pairs],
+            len(projects), max_skill // 64 + 1
+        )
+        return cls(ids, np.array([p.budget or 0.0 for p in projects], dtype=np.float64), bits)
+
+    def patch(self, project_ids, fresh):
+        """New matrix with the rows of project_ids replaced by fresh, their current open rows"""
+        keep = ~np.isin(self.ids, np.fromiter(project_ids, dtype=np.int64, count=len(project_ids)))
+        words = max(self.words, fresh.words)
+        return ProjectMatrix(
+            np.concatenate([self.ids[keep], fresh.ids]),
+            np.concatenate([self.budgets[keep], fresh.budgets]),
+            np.concatenate([_widen(self.bits[keep], words), _widen(fresh.bits, words)]),
+            np.concatenate([self.required[keep], fresh.required])
+        )
+
+class RecommendationEngine:
+    """In-process matcher holding the open-project matrix and per-freelancer top matches"""
+
+    def __init__(self, cache_size=CACHE_SIZE):
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._matrix = None
+        self._version = None  # 'projects' version the matrix was built at, None before the first load
+        self._changed = set()  # Project ids committed by this process since then
+        self._bumps = 0  # 'projects' bumps made by those commits
+        self._cache = {}  # freelancer_id -> (matrix version, profile version, [(project_id, score), ...] best first)
+
+    # Local project writes
+
+    def bind(self, session):
+        resource_versions.on_bump(self._flushed)
+        event.listen(session, 'after_commit', self._committed)
+        event.listen(session, 'after_soft_rollback', self._rolled_back)
+
+    def _flushed(self, session, keys):
+        if 'projects' in keys:
+            ids = {instance.id for instance in list(session.new) + list(session.dirty) + list(session.deleted)
+                   if isinstance(instance, Project)}
+            session.info.setdefault('recommendation_flushes', []).append(ids)
+
+    def _committed(self, session):
+        flushes = session.info.pop('recommendation_flushes', None)
+        if flushes:
+            with self._lock:
+                self._bumps += len(flushes)
+                self._changed.update(*flushes)
+
+    def _rolled_back(self, session, previous_transaction):
+        # Dropping a flush that still commits only costs a full rebuild later
+        session.info.pop('recommendation_flushes', None)
+
+    # Project matrix
+
+    def _sync(self, freelancer_ids):
+        """Bring the matrix up to date, returns it with its version and the freelancers' profile versions"""
+        versions = resource_versions.versions(['projects'] + [f'profile:{f}' for f in freelancer_ids])
+        version = versions['projects']
+        with self._lock:
+            matrix, built_at, changed, bumps = self._matrix, self._version, set(self._changed), self._bumps
+
+        if matrix is None or version != built_at:
+            if matrix is not None and version - built_at == bumps:
+                matrix = matrix.patch(changed, ProjectMatrix.load(changed))
+            else:
+                matrix = ProjectMatrix.load()
+            with self._lock:
+                if self._version == built_at:
+                    self._matrix, self._version = matrix, version
+                    self._changed -= changed
+                    self._bumps -= bumps
+                    self._cache.clear()
+                # Otherwise another thread swapped in its own rebuild first, use that one
+                matrix, version = self._matrix, self._version
+        return matrix, version, [versions[f'profile:{f}'] for f in freelancer_ids]
+
+    # Freelancer features
+
+    def _freelancer_features(self, freelancer_ids, words):
+        rows = db.session.query(
+            User.id, User.rating_sum, User.rating_count, Profile.hourly_rate
+        ).outerjoin(Profile, Profile.user_id == User.id).filter(User.id.in_(freelancer_ids)).all()
+        pairs = db.session.query(Profile.user_id, profile_skill.c.skill_id).join(
+            profile_skill, profile_skill.c.profile_id == Profile.id
+        ).filter(Profile.user_id.in_(freelancer_ids)).all()
+
+        index = {freelancer_id: i for i, freelancer_id in enumerate(freelancer_ids)}
+        rates = np.full(len(freelancer_ids), np.nan)
+        ratings = np.full(len(freelancer_ids), np.nan)
+        for user_id, rating_sum, rating_count, hourly_rate in rows:
+            i = index[user_id]
+            if hourly_rate:
+                rates[i] = hourly_rate
+            if rating_count:
+                ratings[i] = rating_sum / rating_count
+        bits = skill_bitsets(
+            [index[user_id] for user_id, _ in pairs],
+            [skill_id for _, skill_id in pairs],
+            len(freelancer_ids), words
+        )
+        return bits, rates, ratings
+
+    def _score(self, matrix, freelancer_ids):
+        bits, rates, ratings = self._freelancer_features(freelancer_ids, matrix.words)
+        return score_matrix(bits, rates, ratings, matrix.bits, matrix.budgets, matrix.required)
+
+    def _top_matches(self, matrix, scores):
+        candidates = np.arange(len(matrix.ids))
+        if len(candidates) > self.cache_size:
+            candidates = np.argpartition(-scores, self.cache_size - 1)[:self.cache_size]
+        # Highest score first, newest project breaks ties
+        order = np.lexsort((-matrix.ids[candidates], -scores[candidates]))
+        return [(int(matrix.ids[i]), round(float(scores[i]), 4)) for i in candidates[order]]
+
+    # Public API
+
+    def recommend(self, freelancer_id, limit=20):
+        """Best matching open projects for a freelancer as (project_id, score) pairs"""
+        matrix, version, (profile_version,) = self._sync([freelancer_id])
+        with self._lock:
+            cached = self._cache.get(freelancer_id)
+        if cached is None or cached[:2] != (version, profile_version):
+            cached = (version, profile_version, self._top_matches(matrix, self._score(matrix, [freelancer_id])[0]))
+            with self._lock:
+                self._cache[freelancer_id] = cached
+        return cached[2][:limit]
+
+    def precompute(self, freelancer_ids):
+        """Fill the cache for many freelancers with one blocked matrix computation"""
+        freelancer_ids = list(freelancer_ids)
+        matrix, version, profile_versions = self._sync(freelancer_ids)
+        scores = self._score(matrix, freelancer_ids)
+        matches = [(version, profile_version, self._top_matches(matrix, row))
+                   for profile_version, row in zip(profile_versions, scores)]
+        with self._lock:
+            self._cache.update(zip(freelancer_ids, matches))
+
+recommender = RecommendationEngine()
+recommender.bind(db.session)
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Reconcile the denormalized Contract paid_total balances against the payment ledger
+"""
+import sys
+from app import app, db
+from models import Contract
+
+def reconcile_payments(fix=True):
+    """Recompute paid_total in bulk and report any drift"""
+    with app.app_context():
+        print("Reconciling contract payment balances...")
+        drift = Contract.reconcile_payments(fix=fix)
+        for contract_id, stored, actual in drift:
+            print(f"  - contract {contract_id}: stored {stored}, ledger {actual}")
+        if not drift:
+            print("✓ No drift found")
+        elif fix:
+            print(f"✓ Corrected {len(drift)} contracts")
+        else:
+            print(f"✗ {len(drift)} contracts drifted (run without --dry-run to fix)")
+        return drift
+
+if __name__ == '__main__':
+    reconcile_payments(fix='--dry-run' not in sys.argv)
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Reconcile the denormalized User rating aggregates against the review table
+"""
+import sys
+from app import app, db
+from models import User
+
+def reconcile_ratings(fix=True):
+    """Recompute rating_sum/rating_count in bulk and report any drift"""
+    with app.app_context():
+        print("Reconciling user rating aggregates...")
+        drift = User.reconcile_ratings(fix=fix)
+        for user_id, (stored_sum, stored_count), (actual_sum, actual_count) in drift:
+            print(f"  - user {user_id}: stored {stored_sum}/{stored_count}, actual {actual_sum}/{actual_count}")
+        if not drift:
+            print("✓ No drift found")
+        elif fix:
+            print(f"✓ Corrected {len(drift)} users")
+        else:
+            print(f"✗ {len(drift)} users drifted (run without --dry-run to fix)")
+        return drift
+
+if __name__ == '__main__':
+    reconcile_ratings(fix='--dry-run' not in sys.argv)
@@ -0,0 +1,100 @@
+"""
+Read-replica routing.
+
+Replicas are configured as SQLALCHEMY_BINDS named replica_<n>. GET and HEAD
+requests are pointed at one of them in turn, unless the caller wrote within
+the last REPLICA_STICKY_SECONDS, in which case they stay on the primary so
+users always see their own writes. Any write inside a request moves the rest
+of that request to the primary (see models.RoutingSession).
+
+Stickiness is tracked per process. Behind several workers, keep the window
+above the replicas' typical lag.
+"""
+import itertools
+import threading
+import time
+from flask import g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from sqlalchemy import event
+
+READ_METHODS = ('GET', 'HEAD')
+
+class ReplicaRouter:
+    """Sends read-only requests to replica binds with read-your-writes stickiness"""
+
+    def __init__(self, app=None, db=None):
+        self.db = db
+        self.replicas = []
+        self.sticky_seconds = 5
+        self._recent_writers = {}  # user_id -> monotonic time their stickiness ends
+        self._lock = threading.Lock()
+        self._turn = itertools.count()
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db):
+        self.db = db
+        self.replicas = sorted(key for key in app.config.get('SQLALCHEMY_BINDS', {}) if key.startswith('replica_'))
+        self.sticky_seconds = app.config.get('REPLICA_STICKY_SECONDS', 5)
+        app.before_request(self._route_request)
+        app.extensions['replica_router'] = self
+
+    def bind(self, session):
+        event.listen(session, 'after_flush', self._mark_write)
+        event.listen(session, 'do_orm_execute', self._mark_dml)
+        event.listen(session, 'after_commit', self._remember_writer)
+
+    # Routing
+
+    def _route_request(self):
+        if not self.replicas or request.method not in READ_METHODS:
+            return
+        user_id = self._current_user()
+        if user_id is not None and self.is_sticky(user_id):
+            return
+        g.replica = self.replicas[next(self._turn) % len(self.replicas)]
+        self.db.session.info['replica'] = g.replica
+
+    def _current_user(self):
+        # Handlers verify the token again; here a bad token just means "no user"
+        try:
+            verify_jwt_in_request(optional=True)
+            identity = get_jwt_identity()
+        except Exception:
+            return None
+        return int(identity) if identity is not None else None
+
+    # Stickiness
+
+    def _mark_write(self, session, flush_context):
+        session.info['wrote'] = True
+
+    def _mark_dml(self, orm_execute_state):
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            orm_execute_state.session.info['wrote'] = True
+
+    def _remember_writer(self, session):
+        if not session.info.pop('wrote', False) or not self.replicas or not has_request_context():
+            return
+        user_id = self._current_user()
+        if user_id is not None:
+            self.mark_writer(user_id)
+
+    def mark_writer(self, user_id):
+        """Keep user_id's reads on the primary for the stickiness window.
+
+        Commits are attributed to the request's JWT identity automatically;
+        call this for writes made before the user has a token, e.g. register.
+        """
+        if not self.replicas:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._recent_writers[user_id] = now + self.sticky_seconds
+            if len(self._recent_writers) > 10000:
+                self._recent_writers = {uid: until for uid, until in self._recent_writers.items() if until > now}
+
+    def is_sticky(self, user_id):
+        """True while user_id's reads must stay on the primary"""
+        until = self._recent_writers.get(user_id)
+        return until is not None and until > time.monotonic()
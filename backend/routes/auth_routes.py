@@ -0,0 +1,140 @@
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from extensions import replica_router, response_cache
+from pagination import page_size
+from serializers.users import serialize_freelancer, serialize_profile, serialize_review, serialize_user
+from transactions import unit_of_work
+from models import db, User, Profile, Review, Skill
+
+auth_bp = Blueprint('auth_bp', __name__)
+
+# Test endpoint
+@auth_bp.route('/test', methods=['GET'])
+@jwt_required()
+def test_auth():
+    current_user_id = int(get_jwt_identity())
+    user = User.query.get(current_user_id)
+    return jsonify({'message': 'Auth working!', 'user_id': current_user_id, 'user': user.name if user else None})
+
+# Auth Routes
+@auth_bp.route('/auth/register', methods=['POST'])
+def register():
+    data = request.json
+    if User.query.filter_by(email=data['email']).first():
+        return jsonify({'error': 'Email already exists'}), 400
+    
+    with unit_of_work():
+        user = User(email=data['email'], role=data['role'], name=data['name'])
+        user.set_password(data['password'])
+        db.session.add(user)
+        db.session.flush()
+        
+        profile = Profile(user_id=user.id)
+        db.session.add(profile)
+    # The request carried no token, so the commit couldn't be attributed to the new user
+    replica_router.mark_writer(user.id)
+    
+    token = create_access_token(identity=str(user.id))
+    return jsonify({'token': token, 'user': serialize_user(user)}), 201
+
+@auth_bp.route('/auth/login', methods=['POST'])
+def login():
+    data = request.json
+    user = User.query.filter_by(email=data['email']).first()
+    
+    if not user or not user.check_password(data['password']):
+        return jsonify({'error': 'Invalid credentials'}), 401
+    
+    token = create_access_token(identity=str(user.id))
+    return jsonify({'token': token, 'user': serialize_user(user)})
+
+# Profile Routes
+@auth_bp.route('/profile', methods=['GET'])
+@jwt_required()
+def get_profile():
+    current_user_id = int(get_jwt_identity())
+    user = User.query.get(current_user_id)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    profile = Profile.query.filter_by(user_id=user.id).first()
+    
+    return jsonify({
+        'user': serialize_user(user),
+        'profile': serialize_profile(profile)
+    })
+
+@auth_bp.route('/profile', methods=['PUT'])
+@jwt_required()
+def update_profile():
+    current_user_id = int(get_jwt_identity())
+    profile = Profile.query.filter_by(user_id=current_user_id).first()
+    data = request.json
+    
+    with unit_of_work():
+        profile.bio = data.get('bio', profile.bio)
+        if 'skills' in data:
+            profile.set_skills(data.get('skills', []))
+        profile.hourly_rate = data.get('hourly_rate', profile.hourly_rate)
+        profile.portfolio_url = data.get('portfolio_url', profile.portfolio_url)
+        profile.location = data.get('location', profile.location)
+    return jsonify({'message': 'Profile updated'})
+
+# User Routes
+@auth_bp.route('/users/<int:user_id>', methods=['GET'])
+@jwt_required()
+def get_user(user_id):
+    """Get user information by ID"""
+    user = User.query.get_or_404(user_id)
+    return jsonify(serialize_user(user))
+
+@auth_bp.route('/users/<int:user_id>/reviews', methods=['GET'])
+@response_cache.cached(lambda user_id: [f'reviews:{user_id}'])
+def get_user_reviews(user_id):
+    user = User.query.get(user_id)
+    reviews = Review.query.filter_by(reviewee_id=user_id).all()
+    
+    # Aggregates are maintained on the user row as reviews are written
+    avg_rating = user.average_rating if user and user.rating_count else 0
+    
+    return jsonify({
+        'average_rating': round(avg_rating, 1),
+        'total_reviews': user.rating_count if user else 0,
+        'reviews': [serialize_review(r) for r in reviews]
+    })
+
+@auth_bp.route('/freelancers', methods=['GET'])
+@jwt_required()
+def get_freelancers():
+    """Get freelancers with their profiles, filtered and paginated by user id"""
+    limit = page_size()
+    cursor = request.args.get('cursor', type=int)
+    skills = [name for value in request.args.getlist('skill') for name in value.split(',')]
+    min_rate = request.args.get('min_rate', type=float)
+    max_rate = request.args.get('max_rate', type=float)
+    location = request.args.get('location')
+    
+    query = db.session.query(User, Profile).outerjoin(
+        Profile, Profile.user_id == User.id
+    ).filter(User.role == 'freelancer')
+    
+    if skills:
+        query = query.filter(*Skill.matching(Profile.skill_set, skills))
+    if min_rate is not None:
+        query = query.filter(Profile.hourly_rate >= min_rate)
+    if max_rate is not None:
+        query = query.filter(Profile.hourly_rate <= max_rate)
+    if location:
+        query = query.filter(Profile.location.ilike(f'%{location}%'))
+    if cursor:
+        query = query.filter(User.id > cursor)
+    
+    rows = query.order_by(User.id.asc()).limit(limit + 1).all()
+    
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    response = jsonify([serialize_freelancer(freelancer, profile) for freelancer, profile in rows])
+    
+    if has_more:
+        response.headers['X-Next-Cursor'] = str(rows[-1][0].id)
+    return response
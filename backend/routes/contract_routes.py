@@ -0,0 +1,50 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from datetime import datetime
+from extensions import resource_versions
+from serializers.contracts import serialize_contract, serialize_contract_detail
+from transactions import unit_of_work
+from models import User, Project, Contract, Payment
+
+contract_bp = Blueprint('contract_bp', __name__)
+
+# Contract Routes
+@contract_bp.route('/contracts', methods=['GET'])
+@jwt_required()
+@resource_versions.conditional(lambda: [f'contracts:{get_jwt_identity()}'])
+def get_contracts():
+    current_user_id = int(get_jwt_identity())
+    user = User.query.get(current_user_id)
+    
+    if user.role == 'freelancer':
+        contracts = Contract.query.filter_by(freelancer_id=current_user_id).all()
+    else:
+        contracts = Contract.query.join(Project).filter(Project.client_id == current_user_id).all()
+    
+    return jsonify([serialize_contract(c) for c in contracts])
+
+@contract_bp.route('/contracts/<int:contract_id>', methods=['GET'])
+@jwt_required()
+def get_contract_detail(contract_id):
+    """Get detailed contract information including payments"""
+    current_user_id = int(get_jwt_identity())
+    contract = Contract.query.get_or_404(contract_id)
+    
+    # Check authorization
+    if contract.freelancer_id != current_user_id and contract.project.client_id != current_user_id:
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    payments = Payment.query.filter_by(contract_id=contract_id).order_by(Payment.created_at.desc()).all()
+    
+    return jsonify(serialize_contract_detail(contract, payments))
+
+@contract_bp.route('/contracts/<int:contract_id>/complete', methods=['POST'])
+@jwt_required()
+def complete_contract(contract_id):
+    contract = Contract.query.get_or_404(contract_id)
+    with unit_of_work():
+        contract.status = 'completed'
+        contract.project.status = 'completed'
+        contract.end_date = datetime.utcnow()
+    
+    return jsonify({'message': 'Contract completed'})
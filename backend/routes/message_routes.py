@@ -0,0 +1,185 @@
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import case, func
+from extensions import notification_queue
+from pagination import page_size
+from streaming import ndjson_response, wants_stream
+from serializers.messages import serialize_conversation, serialize_message, serialize_sent_message
+from transactions import unit_of_work
+from models import db, User, Message, ConversationSummary
+
+message_bp = Blueprint('message_bp', __name__)
+
+@message_bp.route('/conversations', methods=['GET'])
+@jwt_required()
+def get_conversations():
+    current_user_id = int(get_jwt_identity())
+    limit = page_size()
+    cursor = request.args.get('cursor', type=int)
+    
+    # Inbox rows are read straight from the maintained conversation summaries. The user is
+    # either side of a pair, so take the newest limit + 1 from each side's index and merge.
+    def newest(*side):
+        page = db.select(ConversationSummary.id).where(*side)
+        # Cursor is the last message id of the previous page's final conversation
+        if cursor:
+            page = page.where(ConversationSummary.last_message_id < cursor)
+        return page.order_by(ConversationSummary.last_message_id.desc()).limit(limit + 1).subquery().select()
+    
+    page_ids = db.union_all(
+        newest(ConversationSummary.user_low_id == current_user_id),
+        # A conversation with yourself is already on the low side
+        newest(ConversationSummary.user_high_id == current_user_id, ConversationSummary.user_low_id != current_user_id)
+    ).subquery()
+    counterpart_id = case(
+        (ConversationSummary.user_low_id == current_user_id, ConversationSummary.user_high_id),
+        else_=ConversationSummary.user_low_id
+    )
+    query = db.session.query(ConversationSummary, User).join(
+        page_ids, page_ids.c.id == ConversationSummary.id
+    ).join(User, User.id == counterpart_id)
+    
+    rows = query.order_by(ConversationSummary.last_message_id.desc()).limit(limit + 1).all()
+    
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    response = jsonify([serialize_conversation(summary, user, current_user_id) for summary, user in rows])
+    
+    if has_more:
+        response.headers['X-Next-Cursor'] = str(rows[-1][0].last_message_id)
+    return response
+
+@message_bp.route('/messages', methods=['POST'])
+@jwt_required()
+def send_message():
+    try:
+        current_user_id = int(get_jwt_identity())
+        data = request.get_json()
+        
+        receiver_id = data.get('receiver_id')
+        content = data.get('content')
+        
+        if not receiver_id or not content:
+            return jsonify({'error': 'Receiver ID and content are required'}), 400
+        
+        # Verify receiver exists
+        receiver = User.query.get(receiver_id)
+        if not receiver:
+            return jsonify({'error': 'Receiver not found'}), 404
+        
+        with unit_of_work():
+            # Create message
+            message = Message(
+                sender_id=current_user_id,
+                receiver_id=receiver_id,
+                content=content
+            )
+            db.session.add(message)
+            db.session.flush()
+            
+            # Keep the inbox summary in the same transaction as the message
+            if message.sender_id != message.receiver_id:
+                summary = ConversationSummary.for_users(current_user_id, receiver_id, create=True)
+                summary.record_message(message)
+            
+            # Notify the receiver
+            notification_queue.notify(
+                receiver_id, 'new_message', sender_name=db.session.get(User, current_user_id).name
+            )
+        
+        return jsonify(serialize_sent_message(message)), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error sending message: {str(e)}")
+        return jsonify({'error': 'Failed to send message'}), 500
+
+@message_bp.route('/messages', methods=['GET'])
+@jwt_required()
+def get_messages():
+    """
+    A window of the thread with another user, oldest first.
+    
+    By default the latest MESSAGE_WINDOW messages (or ?limit=). ?before_id= pages
+    back through older history and ?after_id= returns only what arrived after the
+    last message the client has. X-Next-Cursor holds the id to pass back in the
+    same parameter while more remain.
+    """
+    current_user_id = int(get_jwt_identity())
+    other_user_id = request.args.get('user_id', type=int)
+    before_id = request.args.get('before_id', type=int)
+    after_id = request.args.get('after_id', type=int)
+    
+    if not other_user_id:
+        return jsonify({'error': 'User ID is required'}), 400
+    
+    # Get messages between the two users, keyset on (created_at, id)
+    query = Message.thread(current_user_id, other_user_id)
+    if before_id:
+        query = query.filter(Message.before(before_id))
+    if after_id:
+        query = query.filter(Message.after(after_id))
+    
+    # Opening a thread only writes when it moves the read watermark
+    summary = ConversationSummary.for_users(current_user_id, other_user_id)
+    if summary and summary.unread_for(current_user_id):
+        with unit_of_work():
+            summary.advance_read(current_user_id, summary.last_message_id)
+    
+    # Read after the commit, which would otherwise expire every loaded message
+    if wants_stream():
+        # Streams carry the whole range rather than a window
+        return ndjson_response(query.order_by(Message.created_at.asc(), Message.id.asc()), serialize_message)
+    
+    limit = page_size(current_app.config['MESSAGE_WINDOW'])
+    if after_id:
+        messages = query.order_by(Message.created_at.asc(), Message.id.asc()).limit(limit + 1).all()
+        has_more = len(messages) > limit
+        messages = messages[:limit]
+    else:
+        messages = query.order_by(Message.created_at.desc(), Message.id.desc()).limit(limit + 1).all()
+        has_more = len(messages) > limit
+        messages = messages[:limit][::-1]
+    
+    response = jsonify([serialize_message(m) for m in messages])
+    
+    if has_more:
+        response.headers['X-Next-Cursor'] = str(messages[-1].id if after_id else messages[0].id)
+    return response
+
+@message_bp.route('/messages/mark-read', methods=['POST'])
+@jwt_required()
+def mark_messages_read():
+    try:
+        current_user_id = int(get_jwt_identity())
+        data = request.get_json()
+        message_ids = data.get('message_ids', [])
+        
+        if not message_ids:
+            return jsonify({'error': 'No message IDs provided'}), 400
+            
+        # Each listed message moves its conversation's watermark up to the newest one
+        newest_by_sender = db.session.query(
+            Message.sender_id, func.max(Message.id)
+        ).filter(
+            Message.id.in_(message_ids),
+            Message.receiver_id == current_user_id
+        ).group_by(Message.sender_id).all()
+        
+        updated_count = 0
+        with unit_of_work():
+            for sender_id, message_id in newest_by_sender:
+                summary = ConversationSummary.for_users(current_user_id, sender_id)
+                if summary:
+                    updated_count += summary.advance_read(current_user_id, message_id)
+        
+        return jsonify({
+            'success': True,
+            'updated_count': updated_count
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error marking messages as read: {str(e)}")
+        return jsonify({'error': 'Failed to mark messages as read'}), 500
@@ -0,0 +1,149 @@
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from datetime import datetime
+from extensions import notification_queue, resource_versions
+from serializers.milestones import serialize_created_milestone, serialize_milestone, serialize_milestone_update
+from transactions import unit_of_work
+from models import db, Project, Contract, ProjectMilestone, MilestoneUpdate
+
+milestone_bp = Blueprint('milestone_bp', __name__)
+
+# Project Milestone Routes
+@milestone_bp.route('/projects/<int:project_id>/milestones', methods=['GET'])
+@jwt_required()
+@resource_versions.conditional(lambda project_id: [f'milestones:{project_id}'])
+def get_project_milestones(project_id):
+    """Get all milestones for a project"""
+    project = Project.query.get_or_404(project_id)
+    milestones = ProjectMilestone.query.filter_by(project_id=project_id).order_by(ProjectMilestone.order).all()
+    
+    return jsonify([serialize_milestone(m) for m in milestones])
+
+@milestone_bp.route('/projects/<int:project_id>/milestones', methods=['POST'])
+@jwt_required()
+def create_project_milestones(project_id):
+    """Create default milestones for a project"""
+    current_user_id = int(get_jwt_identity())
+    project = Project.query.get_or_404(project_id)
+    
+    # Check if user is authorized (client or freelancer on contract)
+    contract = Contract.query.filter_by(project_id=project_id).first()
+    if project.client_id != current_user_id and (not contract or contract.freelancer_id != current_user_id):
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    # Check if milestones already exist
+    existing = ProjectMilestone.query.filter_by(project_id=project_id).first()
+    if existing:
+        return jsonify({'error': 'Milestones already exist for this project'}), 400
+    
+    # Create default milestones
+    default_milestones = [
+        {'name': 'Planning', 'description': 'Project planning and requirements gathering', 'order': 1},
+        {'name': 'Design', 'description': 'UI/UX design and architecture', 'order': 2},
+        {'name': 'Development', 'description': 'Core development and implementation', 'order': 3},
+        {'name': 'Testing', 'description': 'Testing and quality assurance', 'order': 4},
+        {'name': 'Deployment', 'description': 'Deployment and launch', 'order': 5}
+    ]
+    
+    with unit_of_work():
+        created_milestones = []
+        for milestone_data in default_milestones:
+            milestone = ProjectMilestone(
+                project_id=project_id,
+                **milestone_data
+            )
+            db.session.add(milestone)
+            created_milestones.append(milestone)
+    
+    return jsonify([serialize_created_milestone(m) for m in created_milestones]), 201
+
+@milestone_bp.route('/milestones/<int:milestone_id>', methods=['PUT'])
+@jwt_required()
+def update_milestone(milestone_id):
+    """Update milestone progress and status"""
+    current_user_id = int(get_jwt_identity())
+    milestone = ProjectMilestone.query.get_or_404(milestone_id)
+    
+    # Check if user is authorized (freelancer on contract)
+    contract = Contract.query.filter_by(project_id=milestone.project_id).first()
+    if not contract or contract.freelancer_id != current_user_id:
+        return jsonify({'error': 'Only the assigned freelancer can update milestones'}), 403
+    
+    data = request.get_json()
+    
+    with unit_of_work():
+        # Update milestone
+        if 'status' in data:
+            milestone.status = data['status']
+            if data['status'] == 'in_progress' and not milestone.started_at:
+                milestone.started_at = datetime.utcnow()
+            elif data['status'] == 'completed':
+                milestone.completed_at = datetime.utcnow()
+                milestone.progress = 100
+        
+        if 'progress' in data:
+            milestone.progress = min(100, max(0, data['progress']))
+        
+        if 'description' in data:
+            milestone.description = data['description']
+        
+        milestone.updated_at = datetime.utcnow()
+        
+        # Notify the client
+        notification_queue.notify(
+            milestone.project.client_id, 'milestone_update',
+            milestone_name=milestone.name, progress=milestone.progress, project_title=milestone.project.title
+        )
+    
+    return jsonify({
+        'id': milestone.id,
+        'name': milestone.name,
+        'status': milestone.status,
+        'progress': milestone.progress,
+        'updated_at': milestone.updated_at.isoformat()
+    })
+
+@milestone_bp.route('/milestones/<int:milestone_id>/updates', methods=['GET'])
+@jwt_required()
+def get_milestone_updates(milestone_id):
+    """Get all updates for a milestone"""
+    milestone = ProjectMilestone.query.get_or_404(milestone_id)
+    updates = MilestoneUpdate.query.filter_by(milestone_id=milestone_id).order_by(MilestoneUpdate.created_at.desc()).all()
+    
+    return jsonify([serialize_milestone_update(u) for u in updates])
+
+@milestone_bp.route('/milestones/<int:milestone_id>/updates', methods=['POST'])
+@jwt_required()
+def create_milestone_update(milestone_id):
+    """Add an update/comment to a milestone"""
+    current_user_id = int(get_jwt_identity())
+    milestone = ProjectMilestone.query.get_or_404(milestone_id)
+    data = request.get_json()
+    
+    # Check if user is authorized
+    contract = Contract.query.filter_by(project_id=milestone.project_id).first()
+    if not contract or contract.freelancer_id != current_user_id:
+        return jsonify({'error': 'Only the assigned freelancer can add updates'}), 403
+    
+    with unit_of_work():
+        update = MilestoneUpdate(
+            milestone_id=milestone_id,
+            user_id=current_user_id,
+            content=data.get('content', ''),
+            progress=data.get('progress'),
+            attachment_url=data.get('attachment_url')
+        )
+        db.session.add(update)
+        
+        # Notify the client
+        notification_queue.notify(
+            milestone.project.client_id, 'milestone_update', template='milestone_comment',
+            milestone_name=milestone.name, project_title=milestone.project.title
+        )
+    
+    return jsonify({
+        'id': update.id,
+        'content': update.content,
+        'progress': update.progress,
+        'created_at': update.created_at.isoformat()
+    }), 201
@@ -0,0 +1,39 @@
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from extensions import notification_dispatcher, resource_versions
+from notifications import serialize_notification
+from transactions import unit_of_work
+from models import Notification
+
+notification_bp = Blueprint('notification_bp', __name__)
+
+# Notifications
+@notification_bp.route('/notifications', methods=['GET'])
+@jwt_required()
+@resource_versions.conditional(lambda: [f'notifications:{get_jwt_identity()}'])
+def get_notifications():
+    try:
+        current_user_id = int(get_jwt_identity())
+        print(f"Fetching notifications for user ID: {current_user_id}")
+        
+        # Clients that missed pushes ask for everything after the last id they saw
+        after_id = request.args.get('after_id', type=int)
+        if after_id is not None:
+            return jsonify(notification_dispatcher.catch_up(current_user_id, after_id))
+        
+        notifications = Notification.query.filter_by(user_id=current_user_id).order_by(Notification.created_at.desc()).limit(20).all()
+        
+        print(f"Found {len(notifications)} notifications")
+        
+        return jsonify([serialize_notification(n) for n in notifications])
+    except Exception as e:
+        current_app.logger.exception(f"Error fetching notifications: {str(e)}")
+        return jsonify({'error': f'Internal server error: {str(e)}'}), 500
+
+@notification_bp.route('/notifications/<int:notif_id>/read', methods=['POST'])
+@jwt_required()
+def mark_notification_read(notif_id):
+    notification = Notification.query.get_or_404(notif_id)
+    with unit_of_work():
+        notification.read = True
+    return jsonify({'message': 'Marked as read'})
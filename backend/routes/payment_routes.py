@@ -0,0 +1,92 @@
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from datetime import datetime
+from extensions import notification_queue
+from streaming import ndjson_response, wants_stream
+from serializers.payments import serialize_payment
+from transactions import unit_of_work
+from models import db, Contract, Payment
+
+payment_bp = Blueprint('payment_bp', __name__)
+
+# Payment Routes
+@payment_bp.route('/contracts/<int:contract_id>/payments', methods=['POST'])
+@jwt_required()
+def create_payment(contract_id):
+    """Create a payment for a contract (simulated)"""
+    current_user_id = int(get_jwt_identity())
+    contract = Contract.query.get_or_404(contract_id)
+    
+    # Check if user is the client
+    if contract.project.client_id != current_user_id:
+        return jsonify({'error': 'Only the client can make payments'}), 403
+    
+    data = request.get_json()
+    amount = data.get('amount')
+    description = data.get('description', 'Payment')
+    payment_method = data.get('payment_method', 'credit_card')
+    
+    if not amount or amount <= 0:
+        return jsonify({'error': 'Invalid payment amount'}), 400
+    
+    if amount > contract.remaining_amount:
+        return jsonify({'error': f'Payment amount exceeds remaining balance of ${contract.remaining_amount}'}), 400
+    
+    # Simulate payment processing, only imported once a payment is actually made
+    import random
+    import string
+    transaction_id = ''.join(random.choices(string.ascii_uppercase + string.digits, k=12))
+    
+    with unit_of_work():
+        # Checks the balance again in the same UPDATE, in case another payment just landed
+        recorded = contract.record_payment(amount)
+        if recorded:
+            payment = Payment(
+                contract_id=contract_id,
+                amount=amount,
+                description=description,
+                status='completed',  # Simulated instant success
+                payment_method=payment_method,
+                transaction_id=transaction_id,
+                paid_by=current_user_id,
+                paid_at=datetime.utcnow()
+            )
+            
+            db.session.add(payment)
+            
+            # Notify the freelancer
+            notification_queue.notify(
+                contract.freelancer_id, 'payment_received',
+                amount=amount, project_title=contract.project.title
+            )
+    
+    # Answered once the unit of work has closed, the rejected UPDATE wrote nothing
+    if not recorded:
+        return jsonify({'error': f'Payment amount exceeds remaining balance of ${contract.remaining_amount}'}), 400
+    
+    return jsonify({
+        'id': payment.id,
+        'amount': payment.amount,
+        'transaction_id': payment.transaction_id,
+        'status': payment.status,
+        'remaining_amount': contract.remaining_amount,
+        'payment_status': contract.payment_status,
+        'message': 'Payment processed successfully'
+    }), 201
+
+@payment_bp.route('/contracts/<int:contract_id>/payments', methods=['GET'])
+@jwt_required()
+def get_contract_payments(contract_id):
+    """Get all payments for a contract"""
+    current_user_id = int(get_jwt_identity())
+    contract = Contract.query.get_or_404(contract_id)
+    
+    # Check authorization
+    if contract.freelancer_id != current_user_id and contract.project.client_id != current_user_id:
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    query = Payment.query.filter_by(contract_id=contract_id).order_by(Payment.created_at.desc())
+    if wants_stream():
+        return ndjson_response(query, serialize_payment)
+    
+    return jsonify([serialize_payment(p) for p in query])
@@ -0,0 +1,210 @@
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import func
+from datetime import datetime
+from extensions import resource_versions, response_cache
+from pagination import decode_cursor, encode_cursor, page_size
+from search import search_projects
+from serializers.projects import serialize_project, serialize_project_summary, serialize_recommendation
+from transactions import unit_of_work
+from models import db, User, Project, Proposal, Contract, Skill
+
+project_bp = Blueprint('project_bp', __name__)
+
+# Project Routes
+@project_bp.route('/projects', methods=['GET'])
+@response_cache.cached(lambda: ['projects'])
+def get_projects():
+    status = request.args.get('status')
+    search = request.args.get('search', '')
+    client_id = request.args.get('client_id', type=int)
+    limit = page_size()
+    cursor = request.args.get('cursor')
+    
+    # Start with base query, client loaded in the same statement
+    query = Project.query.options(db.joinedload(Project.client))
+    
+    # If client_id is provided, show ALL their projects (ignore status filter)
+    # Otherwise, default to 'open' status for freelancers browsing
+    if client_id:
+        query = query.filter_by(client_id=client_id)
+    else:
+        # For freelancers, only show open projects by default
+        status = status or 'open'
+        query = query.filter_by(status=status)
+    
+    # Every requested skill must be present, matched through the skill index
+    skills = [name for value in request.args.getlist('skill') for name in value.split(',')]
+    if skills:
+        query = query.filter(*Skill.matching(Project.skill_set, skills))
+    
+    # Search pages carry an offset, the feed carries the last row's (created_at, id)
+    position = decode_cursor(cursor) if cursor else None
+    try:
+        if search:
+            offset = int(position[0]) if position else 0
+        elif position:
+            created_at, last_id = datetime.fromisoformat(position[0]), int(position[1])
+    except (ValueError, TypeError, IndexError):
+        position = None
+    if cursor and position is None:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    
+    if search:
+        # Ranked full-text matches, paged by offset since rank order has no stable key
+        query = search_projects(query, search).offset(offset)
+    else:
+        # Keyset pagination on (created_at, id), newest first
+        if position:
+            query = query.filter(
+                (Project.created_at < created_at) |
+                ((Project.created_at == created_at) & (Project.id < last_id))
+            )
+        query = query.order_by(Project.created_at.desc(), Project.id.desc())
+    
+    projects = query.limit(limit + 1).all()
+    has_more = len(projects) > limit
+    projects = projects[:limit]
+    
+    # Proposal counts for the page only, in one grouped query
+    proposal_counts = dict(db.session.query(
+        Proposal.project_id, func.count(Proposal.id)
+    ).filter(
+        Proposal.project_id.in_([p.id for p in projects])
+    ).group_by(Proposal.project_id).all()) if projects else {}
+    
+    response = jsonify([serialize_project_summary(p, proposal_counts.get(p.id, 0)) for p in projects])
+    
+    if has_more:
+        if search:
+            response.headers['X-Next-Cursor'] = encode_cursor(offset + limit)
+        else:
+            last = projects[-1]
+            response.headers['X-Next-Cursor'] = encode_cursor(last.created_at.isoformat(), last.id)
+    return response
+
+@project_bp.route('/projects', methods=['POST'])
+@jwt_required()
+def create_project():
+    try:
+        current_user_id = int(get_jwt_identity())
+        print(f"Creating project for user ID: {current_user_id}")
+        
+        user = User.query.get(current_user_id)
+        if not user:
+            print(f"User not found: {current_user_id}")
+            return jsonify({'error': 'User not found'}), 404
+            
+        print(f"User found: {user.email}, role: {user.role}")
+        
+        if user.role != 'client':
+            return jsonify({'error': 'Only clients can post projects'}), 403
+        
+        data = request.json
+        print(f"Request data: {data}")
+        
+        # Validate required fields
+        required_fields = ['title', 'description', 'budget']
+        missing_fields = []
+        
+        for field in required_fields:
+            if field not in data:
+                missing_fields.append(field)
+            elif field == 'budget':
+                try:
+                    budget_value = float(data[field])
+                    if budget_value <= 0:
+                        missing_fields.append(f'{field} (must be greater than 0)')
+                except (ValueError, TypeError):
+                    missing_fields.append(f'{field} (must be a valid number)')
+            elif not data[field] or not str(data[field]).strip():
+                missing_fields.append(field)
+        
+        if missing_fields:
+            return jsonify({'error': f'Invalid or missing fields: {", ".join(missing_fields)}'}), 400
+        
+        with unit_of_work():
+            project = Project(
+                client_id=current_user_id,
+                title=data['title'],
+                description=data['description'],
+                budget=float(data['budget']),
+                duration=data.get('duration')
+            )
+            project.set_skills(data.get('skills_required', []))
+            db.session.add(project)
+        
+        print(f"Project created successfully with ID: {project.id}")
+        
+        return jsonify({'id': project.id, 'message': 'Project created'}), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.exception(f"Error creating project: {str(e)}")
+        return jsonify({'error': f'Internal server error: {str(e)}'}), 500
+
+@project_bp.route('/recommendations', methods=['GET'])
+@jwt_required()
+def get_recommendations():
+    """Get the open projects that best match the current freelancer"""
+    current_user_id = int(get_jwt_identity())
+    user = User.query.get(current_user_id)
+    if not user or user.role != 'freelancer':
+        return jsonify({'error': 'Only freelancers get project recommendations'}), 403
+    
+    # numpy is only loaded by the first worker request that needs recommendations
+    from recommendations import recommender
+    
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 50)
+    matches = recommender.recommend(current_user_id, limit)
+    projects = {p.id: p for p in Project.query.filter(
+        Project.id.in_([pid for pid, _ in matches]),
+        Project.status == 'open'
+    ).all()}
+    
+    return jsonify([
+        serialize_recommendation(p, score)
+        for p, score in ((projects.get(pid), score) for pid, score in matches) if p
+    ])
+
+@project_bp.route('/projects/<int:project_id>', methods=['GET'])
+@response_cache.cached(lambda project_id: [f'project:{project_id}'])
+def get_project(project_id):
+    project = Project.query.get_or_404(project_id)
+    return jsonify(serialize_project(project))
+
+@project_bp.route('/cache/stats', methods=['GET'])
+@jwt_required()
+def get_cache_stats():
+    """Hit/miss counters for the response cache in this worker"""
+    return jsonify(response_cache.stats())
+
+# Dashboard & Analytics
+@project_bp.route('/dashboard', methods=['GET'])
+@jwt_required()
+@resource_versions.conditional(lambda: [f'dashboard:{get_jwt_identity()}'])
+def get_dashboard():
+    current_user_id = int(get_jwt_identity())
+    user = User.query.get(current_user_id)
+    
+    if user.role == 'client':
+        projects = Project.query.filter_by(client_id=current_user_id).all()
+        total_proposals = sum(len(p.proposals) for p in projects)
+        
+        return jsonify({
+            'total_projects': len(projects),
+            'active_projects': len([p for p in projects if p.status == 'in_progress']),
+            'completed_projects': len([p for p in projects if p.status == 'completed']),
+            'total_proposals': total_proposals
+        })
+    else:
+        proposals = Proposal.query.filter_by(freelancer_id=current_user_id).all()
+        contracts = Contract.query.filter_by(freelancer_id=current_user_id).all()
+        
+        return jsonify({
+            'total_proposals': len(proposals),
+            'accepted_proposals': len([p for p in proposals if p.status == 'accepted']),
+            'active_contracts': len([c for c in contracts if c.status == 'active']),
+            'completed_contracts': len([c for c in contracts if c.status == 'completed']),
+            'total_earnings': sum(c.amount for c in contracts if c.status == 'completed')
+        })
@@ -0,0 +1,93 @@
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from extensions import notification_queue
+from streaming import ndjson_response, wants_stream
+from serializers.proposals import serialize_freelancer_proposal, serialize_proposal
+from transactions import unit_of_work
+from models import db, User, Project, Proposal, Contract
+
+proposal_bp = Blueprint('proposal_bp', __name__)
+
+@proposal_bp.route('/projects/<int:project_id>/my-proposal', methods=['GET'])
+@jwt_required()
+def get_my_proposal_for_project(project_id):
+    """Get the current user's proposal for a specific project"""
+    current_user_id = int(get_jwt_identity())
+    
+    proposal = Proposal.query.filter_by(
+        project_id=project_id,
+        freelancer_id=current_user_id
+    ).first()
+    
+    if not proposal:
+        return jsonify({'error': 'No proposal found'}), 404
+    
+    return jsonify(serialize_proposal(proposal))
+
+# Proposal Routes
+@proposal_bp.route('/proposals', methods=['POST'])
+@jwt_required()
+def create_proposal():
+    current_user_id = int(get_jwt_identity())
+    user = User.query.get(current_user_id)
+    if user.role != 'freelancer':
+        return jsonify({'error': 'Only freelancers can submit proposals'}), 403
+    
+    data = request.json
+    with unit_of_work():
+        proposal = Proposal(
+            project_id=data['project_id'],
+            freelancer_id=current_user_id,
+            cover_letter=data['cover_letter'],
+            proposed_amount=data['proposed_amount'],
+            delivery_time=data.get('delivery_time')
+        )
+        db.session.add(proposal)
+        
+        # Notify the client
+        project = Project.query.get(data['project_id'])
+        notification_queue.notify(project.client_id, 'new_proposal', project_title=project.title)
+    
+    return jsonify({'id': proposal.id, 'message': 'Proposal submitted'}), 201
+
+@proposal_bp.route('/proposals/<int:proposal_id>/accept', methods=['POST'])
+@jwt_required()
+def accept_proposal(proposal_id):
+    current_user_id = int(get_jwt_identity())
+    proposal = Proposal.query.get_or_404(proposal_id)
+    project = Project.query.get(proposal.project_id)
+    
+    if project.client_id != current_user_id:
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    with unit_of_work():
+        proposal.status = 'accepted'
+        project.status = 'in_progress'
+        
+        contract = Contract(
+            project_id=project.id,
+            proposal_id=proposal.id,
+            freelancer_id=proposal.freelancer_id,
+            amount=proposal.proposed_amount
+        )
+        db.session.add(contract)
+        
+        # Reject other proposals
+        for p in project.proposals:
+            if p.id != proposal_id:
+                p.status = 'rejected'
+    
+    return jsonify({'message': 'Proposal accepted', 'contract_id': contract.id})
+
+@proposal_bp.route('/my-proposals', methods=['GET'])
+@jwt_required()
+def get_my_proposals():
+    current_user_id = int(get_jwt_identity())
+    # Project titles come from the same statement, one row per proposal
+    query = Proposal.query.filter_by(freelancer_id=current_user_id).options(
+        db.joinedload(Proposal.project)
+    ).order_by(Proposal.id)
+    if wants_stream():
+        return ndjson_response(query, serialize_freelancer_proposal)
+    
+    return jsonify([serialize_freelancer_proposal(p) for p in query])
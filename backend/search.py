@@ -0,0 +1,139 @@
+"""
+Full-text search over projects.
+
+Each backend knows how to install its index for one database dialect and how
+to narrow and rank a Project query by a search term:
+
+  - SqliteFtsBackend: an external-content FTS5 table kept in sync by triggers
+  - PostgresSearchBackend: a GIN index over a tsvector expression
+  - LikeSearchBackend: the old substring match, used for any other dialect
+"""
+import re
+from sqlalchemy import func, literal_column, text
+from models import db, Project
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+def _tokens(term):
+    return TOKEN_RE.findall(term or '')
+
+class LikeSearchBackend:
+    """Fallback that matches with LIKE '%term%' and orders by recency"""
+    dialect = None
+
+    def install(self, connection):
+        pass
+
+    def rebuild(self, connection):
+        pass
+
+    def apply(self, query, term):
+        return query.filter(
+            Project.title.contains(term) | Project.description.contains(term)
+        ).order_by(Project.created_at.desc(), Project.id.desc())
+
+class SqliteFtsBackend:
+    """SQLite FTS5 index ranked with bm25, every token matched as a prefix"""
+    dialect = 'sqlite'
+
+    SCHEMA = [
+        """CREATE VIRTUAL TABLE IF NOT EXISTS project_fts USING fts5(
+            title, description, content='project', content_rowid='id', tokenize='unicode61'
+        )""",
+        """CREATE TRIGGER IF NOT EXISTS project_fts_ai AFTER INSERT ON project BEGIN
+            INSERT INTO project_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS project_fts_ad AFTER DELETE ON project BEGIN
+            INSERT INTO project_fts(project_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS project_fts_au AFTER UPDATE OF title, description ON project BEGIN
+            INSERT INTO project_fts(project_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO project_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+        END""",
+    ]
+
+    def install(self, connection):
+        exists = connection.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'project_fts'"
+        )).first()
+        for statement in self.SCHEMA:
+            connection.execute(text(statement))
+        if not exists:
+            self.rebuild(connection)
+
+    def rebuild(self, connection):
+        connection.execute(text("INSERT INTO project_fts(project_fts) VALUES ('rebuild')"))
+
+    @staticmethod
+    def match_expression(term):
+        # Quote every token so user input can't inject FTS5 syntax
+        return ' '.join(f'"{token}"*' for token in _tokens(term))
+
+    def apply(self, query, term):
+        expression = self.match_expression(term)
+        if not expression:
+            return query.filter(db.false())
+        matches = text(
+            "SELECT rowid AS project_id, bm25(project_fts) AS rank "
+            "FROM project_fts WHERE project_fts MATCH :match"
+        ).bindparams(match=expression).columns(
+            literal_column('project_id'), literal_column('rank')
+        ).subquery('project_matches')
+        # bm25 is lower for better matches
+        return query.join(matches, Project.id == matches.c.project_id).order_by(
+            matches.c.rank.asc(), Project.id.desc()
+        )
+
+class PostgresSearchBackend:
+    """Postgres tsvector search backed by a GIN expression index, ranked with ts_rank"""
+    dialect = 'postgresql'
+    CONFIG = 'english'
+
+    def _document(self):
+        return func.to_tsvector(
+            self.CONFIG,
+            func.coalesce(Project.title, '') + ' ' + func.coalesce(Project.description, '')
+        )
+
+    def install(self, connection):
+        # Must stay identical to _document() for the planner to use the index
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_project_search ON project USING GIN "
+            f"(to_tsvector('{self.CONFIG}', coalesce(title, '') || ' ' || coalesce(description, '')))"
+        ))
+
+    def rebuild(self, connection):
+        connection.execute(text('REINDEX INDEX ix_project_search'))
+
+    def apply(self, query, term):
+        tokens = _tokens(term)
+        if not tokens:
+            return query.filter(db.false())
+        tsquery = func.to_tsquery(self.CONFIG, ' & '.join(f'{token}:*' for token in tokens))
+        document = self._document()
+        return query.filter(document.op('@@')(tsquery)).order_by(
+            func.ts_rank(document, tsquery).desc(), Project.id.desc()
+        )
+
+BACKENDS = {backend.dialect: backend for backend in (SqliteFtsBackend, PostgresSearchBackend)}
+
+def get_backend(engine=None):
+    """Pick the search backend for the engine's dialect"""
+    engine = engine or db.engine
+    return BACKENDS.get(engine.dialect.name, LikeSearchBackend)()
+
+def install_search_index(engine=None):
+    """Create the search index structures if they don't exist yet"""
+    engine = engine or db.engine
+    with engine.begin() as connection:
+        get_backend(engine).install(connection)
+
+def rebuild_search_index(engine=None):
+    """Repopulate the search index from the project table"""
+    engine = engine or db.engine
+    with engine.begin() as connection:
+        get_backend(engine).rebuild(connection)
+
+def search_projects(query, term):
+    """Narrow a Project query to matches for term, ordered by relevance"""
+    return get_backend().apply(query, term)
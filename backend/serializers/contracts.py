@@ -0,0 +1,25 @@
+"""JSON shapes for contracts"""
+from serializers.registry import attr, field, nested, register
+from serializers.payments import serialize_payment
+from serializers.users import serialize_user_ref
+
+CONTRACT_TERMS = [
+    'amount', 'total_paid', 'remaining_amount', 'payment_status', 'payment_percentage',
+    'status', 'start_date', 'end_date'
+]
+
+serialize_contract = register('contract', [
+    'id',
+    nested('project', ['id', 'title', 'client_id', attr('client_name', 'client.name')]),
+    nested('freelancer', serialize_user_ref),
+    *CONTRACT_TERMS
+])
+
+# A contract with the project description and its payments
+serialize_contract_detail = register('contract_detail', [
+    'id',
+    nested('project', ['id', 'title', 'description', 'client_id', attr('client_name', 'client.name')]),
+    nested('freelancer', serialize_user_ref),
+    *CONTRACT_TERMS,
+    field('payments', lambda obj, payments: [serialize_payment(p) for p in payments])
+], args=['payments'])
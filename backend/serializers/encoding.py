@@ -0,0 +1,51 @@
+"""
+JSON encoding for API responses.
+
+Uses orjson when it is installed and the standard library otherwise; both
+write datetimes as ISO 8601. JSONProvider plugs the encoder into Flask, so
+jsonify() builds the response body as bytes in one pass.
+"""
+import datetime
+import decimal
+import json
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _default(value):
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(value):
+        """Encode value as UTF-8 JSON bytes"""
+        return orjson.dumps(value, default=_default, option=ORJSON_OPTIONS)
+
+    loads = orjson.loads
+else:
+    def dumps(value):
+        """Encode value as UTF-8 JSON bytes"""
+        return json.dumps(value, default=_default, separators=(',', ':'), ensure_ascii=False).encode()
+
+    loads = json.loads
+
+class JSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by dumps() above"""
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
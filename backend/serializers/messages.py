@@ -0,0 +1,25 @@
+"""JSON shapes for messages and inbox conversations"""
+from serializers.registry import arg, attr, field, register
+
+serialize_message = register('message', [
+    'id', 'content', 'sender_id', 'receiver_id', attr('timestamp', 'created_at'), 'is_read', 'read_at'
+])
+
+serialize_sent_message = register('sent_message', [
+    'id', 'content', 'sender_id', 'receiver_id', 'created_at', 'is_read'
+])
+
+# An inbox row: the other participant and the conversation summary as current_user_id sees it
+serialize_conversation = register('conversation', [
+    arg('id', 'user.id'),
+    arg('user_id', 'user.id'),
+    arg('name', 'user.name'),
+    arg('role', 'user.role'),
+    field('last_message', lambda obj, user, current_user_id: {
+        'content': obj.last_message_preview,
+        'timestamp': obj.last_message_at,
+        'is_sender': obj.last_sender_id == current_user_id
+    }),
+    field('unread_count', lambda obj, user, current_user_id: obj.unread_for(current_user_id)),
+    field('is_online', lambda obj, user, current_user_id: False)
+], args=['user', 'current_user_id'])
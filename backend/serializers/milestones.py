@@ -0,0 +1,18 @@
+"""JSON shapes for project milestones and their updates"""
+from serializers.registry import field, nested, register
+from serializers.users import serialize_user_ref
+
+serialize_milestone = register('milestone', [
+    'id', 'name', 'description', 'status', 'progress', 'order',
+    'started_at', 'completed_at', 'created_at', 'updated_at',
+    field('updates_count', lambda obj: len(obj.updates))
+])
+
+serialize_created_milestone = register('created_milestone', [
+    'id', 'name', 'description', 'status', 'progress', 'order'
+])
+
+serialize_milestone_update = register('milestone_update', [
+    'id', 'content', 'progress', 'attachment_url', 'created_at',
+    nested('user', serialize_user_ref)
+])
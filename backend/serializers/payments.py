@@ -0,0 +1,6 @@
+"""JSON shapes for payments"""
+from serializers.registry import register
+
+serialize_payment = register('payment', [
+    'id', 'amount', 'description', 'status', 'payment_method', 'transaction_id', 'paid_at', 'created_at'
+])
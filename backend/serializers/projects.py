@@ -0,0 +1,26 @@
+"""JSON shapes for projects"""
+from serializers.registry import arg, json_list, nested, register
+from serializers.users import serialize_user_ref
+
+serialize_project_summary = register('project_summary', [
+    'id', 'title', 'description', 'budget', 'duration',
+    json_list('skills_required'), 'status', 'created_at',
+    nested('client', serialize_user_ref),
+    arg('proposal_count')
+], args=['proposal_count'])
+
+serialize_recommendation = register('recommendation', [
+    'id', 'title', 'budget', 'duration',
+    json_list('skills_required'), 'created_at',
+    nested('client', serialize_user_ref),
+    arg('match_score', 'score')
+], args=['score'])
+
+serialize_project = register('project', [
+    'id', 'title', 'description', 'budget', 'duration',
+    json_list('skills_required'), 'status', 'created_at',
+    nested('client', serialize_user_ref),
+    nested('proposals', [
+        'id', nested('freelancer', serialize_user_ref), 'proposed_amount', 'delivery_time', 'status'
+    ], many=True)
+])
@@ -0,0 +1,10 @@
+"""JSON shapes for proposals"""
+from serializers.registry import nested, register
+
+serialize_proposal = register('proposal', [
+    'id', 'project_id', 'cover_letter', 'proposed_amount', 'delivery_time', 'status', 'created_at'
+])
+
+serialize_freelancer_proposal = register('freelancer_proposal', [
+    'id', nested('project', ['id', 'title']), 'proposed_amount', 'delivery_time', 'status', 'created_at'
+])
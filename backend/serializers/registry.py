@@ -0,0 +1,112 @@
+"""
+Field specs compiled into extractor functions.
+
+    serialize_project = register('project', [
+        'id', 'title', 'created_at',
+        json_list('skills_required'),
+        nested('client', serialize_user_ref),
+        arg('proposal_count'),
+        field('is_large', lambda obj, proposal_count: obj.budget > 10000),
+    ], args=['proposal_count'])
+
+    serialize_project(project, proposal_count=3)
+
+A spec is compiled once, at import, into a plain function that builds the
+dict in a single expression, so serializing a row is one call with no per-field
+dispatch. A field is an attribute name (dotted paths follow relationships), or
+one of the helpers below for anything else. `args` become extra parameters of
+the extractor, readable with arg() and passed to every field() function.
+
+Only attribute paths are written into the generated source, and each segment
+must be an identifier; everything else is a function referenced by name.
+
+Datetimes are left as datetime objects; the JSON encoder in encoding.py writes
+them as ISO 8601, so only pass extractor output to jsonify() or dumps().
+"""
+import keyword
+from serializers.encoding import loads
+
+SERIALIZERS = {}  # name -> compiled extractor
+
+class Field:
+    """A response key and where its value comes from.
+
+    path is a dotted attribute path starting at `obj` or one of the args.
+    function alone is called as function(obj, *args); together with a path it
+    is applied to the value found there, or to each item of it when many is set.
+    """
+
+    def __init__(self, key, path=None, function=None, many=False):
+        self.key = key
+        self.path = path
+        self.function = function
+        self.many = many
+
+def field(key, function):
+    """A value computed by function(obj, *args)"""
+    if not callable(function):
+        raise TypeError(f'field({key!r}) takes a function, use attr() or arg() for attribute paths')
+    return Field(key, function=function)
+
+def attr(key, path=None):
+    return Field(key, f'obj.{path or key}')
+
+def arg(key, path=None):
+    """One of the extractor's args, or a dotted path from it"""
+    return Field(key, path or key)
+
+def json_list(key, path=None):
+    """A JSON-encoded list column, [] when empty"""
+    return Field(key, f'obj.{path or key}', _json_list)
+
+def nested(key, serializer, path=None, many=False):
+    """A related object through another extractor, or an inline list of fields"""
+    if not callable(serializer):
+        serializer = compile_fields(f'{key}_fields', serializer)
+    return Field(key, f'obj.{path or key}', serializer, many)
+
+def _json_list(value):
+    return loads(value) if value else []
+
+def _check_path(name, key, path, roots):
+    segments = path.split('.')
+    if segments[0] not in roots or not all(
+        segment.isidentifier() and not keyword.iskeyword(segment) for segment in segments
+    ):
+        raise ValueError(f'{name}: field {key!r} has an invalid path {path!r}')
+
+def compile_fields(name, fields, args=()):
+    """Build `name(obj, *args)` returning a dict with one entry per field"""
+    fields = [attr(f) if isinstance(f, str) else f for f in fields]
+    for identifier in (name, *args):
+        if not identifier.isidentifier() or keyword.iskeyword(identifier):
+            raise ValueError(f'{identifier!r} is not a valid serializer or argument name')
+    params = ''.join(f', {a}' for a in args)
+    namespace, items = {}, []
+    for i, f in enumerate(fields):
+        if f.path is not None:
+            _check_path(name, f.key, f.path, {'obj', *args})
+        if f.function is None:
+            value = f.path
+        else:
+            namespace[f'_f{i}'] = f.function
+            if f.path is None:
+                value = f'_f{i}(obj{params})'
+            elif f.many:
+                value = f'[_f{i}(item) for item in {f.path}]'
+            else:
+                value = f'_f{i}({f.path})'
+        items.append(f'{f.key!r}: {value}')
+    source = f'def {name}(obj{params}):\n    return {{{", ".join(items)}}}\n'
+    exec(compile(source, f'<serializer {name}>', 'exec'), namespace)
+    return namespace[name]
+
+def register(name, fields, args=()):
+    """Compile a spec and make it available as get_serializer(name)"""
+    if name in SERIALIZERS:
+        raise ValueError(f'Serializer {name!r} is already registered')
+    SERIALIZERS[name] = compile_fields(f'serialize_{name}', fields, args)
+    return SERIALIZERS[name]
+
+def get_serializer(name):
+    return SERIALIZERS[name]
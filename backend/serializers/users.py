@@ -0,0 +1,28 @@
+"""JSON shapes for users, profiles, freelancer listings and reviews"""
+from serializers.registry import attr, field, json_list, nested, register
+
+serialize_user = register('user', ['id', 'email', 'role', 'name'])
+
+serialize_user_ref = register('user_ref', ['id', 'name'])
+
+serialize_profile = register('profile', [
+    'bio', json_list('skills'), 'hourly_rate', 'portfolio_url', 'location'
+])
+
+_serialize_freelancer_user = register('freelancer_user', [
+    'id', 'name', 'email',
+    field('rating', lambda obj: round(obj.average_rating, 1) if obj.rating_count else 5.0),
+    attr('reviews_count', 'rating_count')
+])
+
+EMPTY_PROFILE = {'bio': None, 'skills': [], 'hourly_rate': None, 'portfolio_url': None, 'location': None}
+
+def serialize_freelancer(freelancer, profile):
+    """A freelancer row of the directory, profile may be None"""
+    data = _serialize_freelancer_user(freelancer)
+    data.update(serialize_profile(profile) if profile else EMPTY_PROFILE)
+    return data
+
+serialize_review = register('review', [
+    'id', nested('reviewer', ['name']), 'rating', 'comment', 'created_at'
+])
@@ -0,0 +1,39 @@
+"""
+Socket.IO handlers for the threaded server.
+
+A client connects with its JWT in the auth payload (or ?token=) and joins its
+own room, where committed notifications are pushed. Passing
+last_notification_id replays anything created while it was disconnected.
+"""
+from flask import request
+from flask_jwt_extended import decode_token
+from flask_socketio import emit, join_room
+from extensions import notification_dispatcher, socketio
+from notifications import user_room
+
+def token_user_id(token):
+    """User id from a JWT, None if missing or invalid (needs an app context)"""
+    if not token:
+        return None
+    try:
+        return int(decode_token(token)['sub'])
+    except Exception:
+        return None
+
+def socket_user_id(auth):
+    """User id from the JWT sent in the Socket.IO auth payload or ?token=, None if invalid"""
+    return token_user_id((auth or {}).get('token') or request.args.get('token'))
+
+@socketio.on('connect')
+def handle_connect(auth=None):
+    user_id = socket_user_id(auth)
+    if user_id is None:
+        return False
+    join_room(user_room(user_id))
+    
+    # Replay anything created while the client was disconnected
+    last_id = (auth or {}).get('last_notification_id')
+    if last_id is not None:
+        missed = notification_dispatcher.catch_up(user_id, int(last_id))
+        if missed:
+            emit('notifications', missed)
@@ -0,0 +1,34 @@
+"""
+Opt-in NDJSON streaming for large list endpoints.
+
+A client that sends `Accept: application/x-ndjson` or `?stream=1` gets one
+JSON object per line instead of a JSON array. Rows are fetched with
+yield_per and written out in chunks as they are serialized, so memory stays
+flat however long the list is.
+"""
+from flask import current_app, request, stream_with_context
+from serializers.encoding import dumps
+
+NDJSON = 'application/x-ndjson'
+
+def wants_stream():
+    """True if the request asked for an NDJSON stream rather than a JSON array"""
+    if request.args.get('stream') in ('1', 'true'):
+        return True
+    return request.accept_mimetypes.best == NDJSON
+
+def ndjson_response(query, serializer, *args):
+    """Stream query's rows as NDJSON, one serializer(row, *args) per line"""
+    batch_size = current_app.config['STREAM_BATCH_SIZE']
+
+    def generate():
+        lines = []
+        for row in query.yield_per(batch_size):
+            lines.append(dumps(serializer(row, *args)))
+            if len(lines) == batch_size:
+                yield b'\n'.join(lines) + b'\n'
+                lines = []
+        if lines:
+            yield b'\n'.join(lines) + b'\n'
+
+    return current_app.response_class(stream_with_context(generate()), mimetype=NDJSON)
@@ -0,0 +1,79 @@
+"""
+Shared fixtures for the backend tests.
+
+    cd backend && python -m pytest tests
+
+Config is read when app.py is imported, so the environment is set up here
+first: a throwaway SQLite file and no background notification workers.
+"""
+import glob
+import importlib.util
+import os
+import sys
+import tempfile
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MIGRATIONS_DIR = os.path.join(BACKEND_DIR, 'migrations', 'versions')
+DB_DIR = tempfile.mkdtemp(prefix='talentlink-tests-')
+os.environ['DATABASE_URL'] = f'sqlite:///{DB_DIR}/test.db'
+os.environ['NOTIFICATION_WORKERS'] = '0'
+sys.path.insert(0, BACKEND_DIR)
+
+import app as app_module  # noqa: E402
+from cli import init_db  # noqa: E402
+from models import db  # noqa: E402
+
+@pytest.fixture(scope='session')
+def app():
+    app = app_module.app
+    app.config['TESTING'] = True
+    with app.app_context():
+        init_db()
+    return app
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def app_context(app):
+    with app.app_context():
+        yield
+
+@pytest.fixture(autouse=True)
+def clean_tables(app):
+    yield
+    # Empty every table between tests, the schema and search index stay
+    with app.app_context():
+        db.session.remove()
+        with db.engine.begin() as connection:
+            for table in reversed(db.metadata.sorted_tables):
+                connection.execute(table.delete())
+
+@pytest.fixture
+def register(client):
+    """register(email, role='freelancer') -> (token, user_id)"""
+    def register(email, role='freelancer', name=None):
+        response = client.post('/api/auth/register', json={
+            'email': email, 'password': 'password', 'role': role, 'name': name or email
+        })
+        assert response.status_code == 201, response.get_json()
+        body = response.get_json()
+        return body['token'], body['user']['id']
+    return register
+
+def auth(token):
+    return {'Authorization': f'Bearer {token}'}
+
+def run_migration(connection, revision):
+    """Run one migration's upgrade() on connection, e.g. over a hand-built older schema"""
+    path, = glob.glob(os.path.join(MIGRATIONS_DIR, f'{revision}_*.py'))
+    spec = importlib.util.spec_from_file_location(f'migration_{revision}', path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    with Operations.context(MigrationContext.configure(connection)):
+        migration.upgrade()
@@ -0,0 +1,84 @@
+"""
+Public reads are cached until a write to one of their entities commits, with
+either backend: the in-process LRU and Redis (here fakeredis).
+"""
+import fakeredis
+import pytest
+
+from cache import MemoryCacheBackend, RedisCacheBackend
+from extensions import response_cache
+from models import db, Project, Proposal, Review
+
+@pytest.fixture(autouse=True, params=['memory', 'redis'])
+def backend(request, monkeypatch):
+    if request.param == 'redis':
+        backend = RedisCacheBackend(fakeredis.FakeRedis())
+    else:
+        backend = MemoryCacheBackend()
+    monkeypatch.setattr(response_cache, 'backend', backend)
+    return backend
+
+@pytest.fixture
+def project(app, register):
+    _, client_id = register('client@example.com', role='client')
+    _, freelancer_id = register('freelancer@example.com')
+    with app.app_context():
+        project = Project(client_id=client_id, title='Site', description='Build it', budget=500)
+        db.session.add(project)
+        db.session.commit()
+        return project.id, client_id, freelancer_id
+
+def cache_status(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.headers['X-Cache']
+
+def test_second_read_is_a_hit(client, project):
+    project_id, _, _ = project
+    for url in ('/api/projects', f'/api/projects/{project_id}'):
+        assert cache_status(client, url) == 'MISS'
+        assert cache_status(client, url) == 'HIT'
+
+def test_query_string_is_part_of_the_key(client, project):
+    assert cache_status(client, '/api/projects') == 'MISS'
+    assert cache_status(client, '/api/projects?status=completed') == 'MISS'
+    assert cache_status(client, '/api/projects') == 'HIT'
+
+@pytest.mark.parametrize('write', ['project', 'proposal'])
+def test_committed_write_invalidates(app, client, project, write):
+    project_id, _, freelancer_id = project
+    urls = ['/api/projects', f'/api/projects/{project_id}']
+    for url in urls:
+        cache_status(client, url)
+
+    with app.app_context():
+        if write == 'project':
+            db.session.get(Project, project_id).title = 'Renamed'
+        else:
+            db.session.add(Proposal(project_id=project_id, freelancer_id=freelancer_id,
+                                    cover_letter='Hi', proposed_amount=400))
+        db.session.commit()
+
+    assert [cache_status(client, url) for url in urls] == ['MISS', 'MISS']
+
+def test_committed_review_invalidates_the_reviewee(app, client, project):
+    project_id, client_id, freelancer_id = project
+    url = f'/api/users/{freelancer_id}/reviews'
+    cache_status(client, url)
+    with app.app_context():
+        db.session.add(Review(project_id=project_id, reviewer_id=client_id, reviewee_id=freelancer_id, rating=5))
+        db.session.commit()
+
+    response = client.get(url)
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.get_json()['total_reviews'] == 1
+
+def test_rolled_back_write_keeps_the_entry(app, client, project):
+    project_id, _, _ = project
+    cache_status(client, f'/api/projects/{project_id}')
+    with app.app_context():
+        db.session.get(Project, project_id).title = 'Never saved'
+        db.session.flush()
+        db.session.rollback()
+
+    assert cache_status(client, f'/api/projects/{project_id}') == 'HIT'
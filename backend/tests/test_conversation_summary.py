@@ -0,0 +1,140 @@
+"""
+The inbox summary row follows the newest message of each pair, and the
+migration that introduced it backfills the same numbers from history.
+"""
+from sqlalchemy import create_engine, event, insert, text
+
+from conftest import auth, run_migration
+from models import db, ConversationSummary, Message
+
+def test_messages_and_reads_update_the_summary(app, client, register):
+    client_token, client_id = register('client@example.com', role='client')
+    freelancer_token, freelancer_id = register('freelancer@example.com')
+    for content in ('one', 'two'):
+        client.post('/api/messages', json={'receiver_id': freelancer_id, 'content': content}, headers=auth(client_token))
+    client.post('/api/messages', json={'receiver_id': client_id, 'content': 'three'}, headers=auth(freelancer_token))
+
+    with app.app_context():
+        summary = ConversationSummary.for_users(client_id, freelancer_id)
+        assert (summary.last_message_preview, summary.last_sender_id) == ('three', freelancer_id)
+        assert summary.unread_for(freelancer_id) == 2
+        assert summary.unread_for(client_id) == 1
+
+    client.get(f'/api/messages?user_id={client_id}', headers=auth(freelancer_token))
+    with app.app_context():
+        summary = ConversationSummary.for_users(client_id, freelancer_id)
+        assert summary.unread_for(freelancer_id) == 0
+        assert summary.unread_for(client_id) == 1
+
+def test_older_message_does_not_move_the_summary_back(app, register):
+    _, client_id = register('client@example.com', role='client')
+    _, freelancer_id = register('freelancer@example.com')
+    with app.app_context():
+        older = Message(sender_id=client_id, receiver_id=freelancer_id, content='older')
+        newer = Message(sender_id=freelancer_id, receiver_id=client_id, content='newer')
+        db.session.add_all([older, newer])
+        db.session.flush()
+
+        # The older message's transaction reaches the summary last
+        summary = ConversationSummary.for_users(client_id, freelancer_id, create=True)
+        summary.record_message(newer)
+        db.session.flush()
+        summary.record_message(older)
+        db.session.commit()
+
+        assert (summary.last_message_id, summary.last_message_preview) == (newer.id, 'newer')
+        assert summary.unread_for(client_id) == 1
+        assert summary.unread_for(freelancer_id) == 1
+
+def test_losing_the_create_race_reuses_the_other_row(app, register):
+    _, client_id = register('client@example.com', role='client')
+    _, freelancer_id = register('freelancer@example.com')
+    low, high = ConversationSummary.pair(client_id, freelancer_id)
+    raced = []
+
+    def create_first(conn, cursor, statement, *args):
+        # Another request commits the pair's row between our lookup and our insert
+        if statement.startswith('INSERT INTO conversation_summary') and not raced:
+            raced.append(True)
+            with db.engine.begin() as other:
+                other.execute(insert(ConversationSummary.__table__).values(
+                    user_low_id=low, user_high_id=high, unread_low=0, unread_high=0,
+                    last_read_low_id=0, last_read_high_id=0
+                ))
+
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', create_first)
+        try:
+            summary = ConversationSummary.for_users(client_id, freelancer_id, create=True)
+            db.session.commit()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', create_first)
+        assert raced
+        assert ConversationSummary.query.count() == 1
+        assert summary.id == ConversationSummary.query.one().id
+
+def test_migration_backfills_from_message_history(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path}/before.db')
+    with engine.begin() as connection:
+        # message as it was at revision 56960ac31691
+        connection.execute(text(
+            'CREATE TABLE message (id INTEGER PRIMARY KEY, sender_id INTEGER NOT NULL, receiver_id INTEGER NOT NULL, '
+            'project_id INTEGER, content TEXT NOT NULL, is_read BOOLEAN, read_at DATETIME, created_at DATETIME)'
+        ))
+        connection.execute(text('INSERT INTO message (sender_id, receiver_id, content, is_read) VALUES '
+                                "(1, 2, 'hello', 1), (2, 1, 'unread reply', 0), (2, 1, 'older row', NULL), "
+                                "(1, 2, 'latest', 0), (3, 1, 'other pair', 0), (1, 1, 'note to self', 0)"))
+        run_migration(connection, '8599205d9419')
+        rows = connection.execute(text(
+            'SELECT user_low_id, user_high_id, last_message_id, last_sender_id, last_message_preview, '
+            'unread_low, unread_high FROM conversation_summary ORDER BY user_low_id, user_high_id'
+        )).all()
+    # NULL is_read predates the column and counts as unread; self-messages have no summary
+    assert [tuple(row) for row in rows] == [
+        (1, 2, 4, 1, 'latest', 2, 1),
+        (1, 3, 5, 3, 'other pair', 1, 0),
+    ]
+
+def test_watermark_migration_treats_null_is_read_as_unread(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path}/before.db')
+    with engine.begin() as connection:
+        connection.execute(text(
+            'CREATE TABLE message (id INTEGER PRIMARY KEY, sender_id INTEGER NOT NULL, receiver_id INTEGER NOT NULL, '
+            'project_id INTEGER, content TEXT NOT NULL, is_read BOOLEAN, read_at DATETIME, created_at DATETIME)'
+        ))
+        connection.execute(text('INSERT INTO message (sender_id, receiver_id, content, is_read) VALUES '
+                                "(1, 2, 'read', 1), (2, 1, 'null', NULL), (2, 1, 'unread', 0), (3, 1, 'only null', NULL)"))
+        for revision in ('8599205d9419', 'da16cc9b08f5', 'e3b71c94a6d2'):
+            run_migration(connection, revision)
+        rows = connection.execute(text(
+            'SELECT user_low_id, user_high_id, last_read_low_id, last_read_high_id '
+            'FROM conversation_summary ORDER BY user_low_id, user_high_id'
+        )).all()
+    # User 1's first unread message is the NULL one in both pairs, user 2 and 3 have read everything
+    assert [tuple(row) for row in rows] == [(1, 2, 1, 3), (1, 3, 0, 4)]
+
+def test_rebuild_and_reads_treat_null_is_read_as_unread(app, register):
+    _, client_id = register('client@example.com', role='client')
+    _, freelancer_id = register('freelancer@example.com')
+    with app.app_context():
+        low, high = ConversationSummary.pair(client_id, freelancer_id)
+        # A Core insert, the ORM would fill in the column default instead of NULL
+        db.session.execute(insert(Message).values(
+            sender_id=client_id, receiver_id=freelancer_id, user_low_id=low, user_high_id=high,
+            content='read', is_read=True
+        ))
+        db.session.execute(insert(Message).values(
+            sender_id=freelancer_id, receiver_id=client_id, user_low_id=low, user_high_id=high,
+            content='null', is_read=None
+        ))
+        db.session.commit()
+        ConversationSummary.rebuild()
+        db.session.commit()
+        summary = ConversationSummary.for_users(client_id, freelancer_id)
+        assert summary.unread_for(client_id) == 1
+        assert summary.unread_for(freelancer_id) == 0
+
+        # Reading up to it marks the NULL row read too
+        assert summary.advance_read(client_id, summary.last_message_id) == 1
+        db.session.commit()
+        assert Message.query.filter(Message.is_read.is_(None)).count() == 0
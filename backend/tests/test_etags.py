@@ -0,0 +1,42 @@
+"""
+Conditional GETs answer 304 only for the exact request the tag came from.
+"""
+from conftest import auth
+from models import db, Notification
+
+def add_notifications(app, user_id, count):
+    with app.app_context():
+        notifications = [Notification(user_id=user_id, type='new_message', content=f'n{i}') for i in range(count)]
+        db.session.add_all(notifications)
+        db.session.commit()
+        return [n.id for n in notifications]
+
+def test_unchanged_notifications_answer_304(app, client, register):
+    token, user_id = register('client@example.com', role='client')
+    add_notifications(app, user_id, 2)
+
+    first = client.get('/api/notifications', headers=auth(token))
+    assert first.status_code == 200 and first.headers['ETag']
+    again = client.get('/api/notifications', headers={**auth(token), 'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+
+    add_notifications(app, user_id, 1)
+    changed = client.get('/api/notifications', headers={**auth(token), 'If-None-Match': first.headers['ETag']})
+    assert changed.status_code == 200
+    assert len(changed.get_json()) == 3
+
+def test_tag_is_not_reused_across_after_id(app, client, register):
+    token, user_id = register('client@example.com', role='client')
+    ids = add_notifications(app, user_id, 3)
+
+    full = client.get('/api/notifications', headers=auth(token))
+    delta = client.get(f'/api/notifications?after_id={ids[0]}', headers={**auth(token), 'If-None-Match': full.headers['ETag']})
+    assert delta.status_code == 200
+    assert [n['id'] for n in delta.get_json()] == ids[1:]
+
+    later = client.get(f'/api/notifications?after_id={ids[1]}', headers={**auth(token), 'If-None-Match': delta.headers['ETag']})
+    assert later.status_code == 200
+    assert [n['id'] for n in later.get_json()] == ids[2:]
+
+    same = client.get(f'/api/notifications?after_id={ids[1]}', headers={**auth(token), 'If-None-Match': later.headers['ETag']})
+    assert same.status_code == 304
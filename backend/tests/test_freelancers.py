@@ -0,0 +1,56 @@
+"""
+/api/freelancers is one joined, paginated query however many freelancers,
+skills and reviews there are.
+"""
+import pytest
+from sqlalchemy import event
+
+from conftest import auth
+from models import db
+
+@pytest.fixture
+def statements(app):
+    """SQL statements run while the fixture is active"""
+    seen = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    yield seen
+    event.remove(engine, 'before_cursor_execute', record)
+
+def add_freelancers(client, register, count, start=0):
+    """Register freelancers with profiles, returns the last one's token"""
+    for i in range(start, start + count):
+        token, _ = register(f'freelancer{i}@example.com')
+        response = client.put('/api/profile', json={
+            'skills': ['Python', f'Skill{i}'], 'hourly_rate': 20 + i, 'location': 'Berlin'
+        }, headers=auth(token))
+        assert response.status_code == 200
+    return token
+
+def count_statements(client, statements, token, query=''):
+    statements.clear()
+    response = client.get(f'/api/freelancers{query}', headers=auth(token))
+    assert response.status_code == 200
+    return len(statements), response.get_json()
+
+def test_query_count_does_not_grow_with_freelancers(client, register, statements):
+    token = add_freelancers(client, register, 3)
+    few, body = count_statements(client, statements, token)
+    assert len(body) == 3
+
+    add_freelancers(client, register, 12, start=3)
+    many, body = count_statements(client, statements, token)
+    assert len(body) == 15
+    assert body[0]['skills'] == ['Python', 'Skill0']
+
+    assert many == few, (few, many)
+    assert many <= 3
+
+def test_filtered_page_query_count(client, register, statements):
+    token = add_freelancers(client, register, 8)
+    count, body = count_statements(client, statements, token, '?skill=Python&min_rate=22&location=berlin&limit=3')
+    assert [f['hourly_rate'] for f in body] == [22, 23, 24]
+    assert count <= 3
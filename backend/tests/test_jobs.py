@@ -0,0 +1,104 @@
+"""
+Notification jobs: staged with the caller's commit, claimed by a worker,
+acknowledged with the delivery and released on failure until they run out of
+attempts.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from extensions import notification_queue
+from jobs import DatabaseJobBackend, MemoryJobBackend
+from models import db, Notification, NotificationJob
+
+def notify(user_id, template='new_message', **params):
+    notification_queue.notify(user_id, 'message', template, **params)
+
+@pytest.fixture
+def memory_backend(monkeypatch):
+    backend = MemoryJobBackend(max_attempts=3)
+    monkeypatch.setattr(notification_queue, 'backend', backend)
+    return backend
+
+@pytest.fixture
+def database_backend(monkeypatch):
+    backend = DatabaseJobBackend(max_attempts=3)
+    monkeypatch.setattr(notification_queue, 'backend', backend)
+    return backend
+
+def test_only_committed_intents_are_queued(register, app_context, memory_backend):
+    _, user_id = register('freelancer@example.com')
+    notify(user_id, sender_name='Ann')
+    db.session.rollback()
+    assert memory_backend.size() == 0
+
+    notify(user_id, sender_name='Ann')
+    assert memory_backend.size() == 0  # Not before the commit
+    db.session.commit()
+    assert memory_backend.size() == 1
+
+def test_claimed_intents_are_acknowledged_with_the_delivery(register, app_context, memory_backend):
+    _, user_id = register('freelancer@example.com')
+    notify(user_id, sender_name='Ann')
+    notify(user_id, sender_name='Bob')
+    db.session.commit()
+
+    assert notification_queue.drain() == 2
+    assert memory_backend.size() == 0
+    assert sorted(n.content for n in Notification.query) == ['New message from Ann', 'New message from Bob']
+
+def test_failed_intent_is_released_until_it_runs_out_of_attempts(register, app_context, memory_backend):
+    _, user_id = register('freelancer@example.com')
+    notify(user_id, sender_name='Ann')
+    notify(user_id)  # No sender_name, the template raises KeyError
+    db.session.commit()
+
+    # The good intent in the same batch still goes out
+    assert notification_queue.process_batch() == 1
+    assert memory_backend.size() == 1
+    assert memory_backend.failed == []
+
+    assert notification_queue.process_batch() == 0
+    assert notification_queue.process_batch() == 0
+    assert memory_backend.size() == 0
+    failed, = memory_backend.failed
+    assert failed['attempts'] == 3
+    assert Notification.query.count() == 1
+
+def test_database_jobs_are_claimed_once(register, app_context, database_backend):
+    _, user_id = register('freelancer@example.com')
+    notify(user_id, sender_name='Ann')
+    db.session.commit()
+
+    batch = database_backend.take(10)
+    assert len(batch) == 1
+    assert database_backend.take(10) == []
+
+    # A worker that crashed holding the claim loses it after claim_timeout
+    NotificationJob.query.update({'claimed_at': datetime.utcnow() - timedelta(seconds=301)})
+    db.session.commit()
+    assert [intent['id'] for intent in database_backend.take(10)] == [batch[0]['id']]
+
+def test_database_job_is_marked_failed_after_max_attempts(register, app_context, database_backend):
+    _, user_id = register('freelancer@example.com')
+    notify(user_id, sender_name='Ann')
+    notify(user_id)
+    db.session.commit()
+
+    assert notification_queue.process_batch() == 1
+    for _ in range(2):
+        assert notification_queue.process_batch() == 0
+
+    job, = NotificationJob.query.all()
+    assert job.attempts == 3
+    assert job.failed_at is not None
+    assert job.claim_token is None
+    assert database_backend.size() == 0
+    assert database_backend.take(10) == []
+
+def test_first_request_starts_the_workers(client, monkeypatch):
+    started = []
+    monkeypatch.setattr(notification_queue, 'workers', 2)
+    monkeypatch.setattr(notification_queue, 'start', lambda: started.append(True))
+    client.get('/api/projects')
+    assert started == [True]
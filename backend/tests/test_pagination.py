@@ -0,0 +1,72 @@
+"""
+Opaque cursors round-trip the sort key of a page's last row, following
+X-Next-Cursor visits every project once, and a tampered cursor is a 400.
+"""
+from datetime import datetime
+
+import pytest
+
+from conftest import auth
+from models import db, Project
+from pagination import decode_cursor, encode_cursor
+
+def test_cursor_round_trip():
+    cursor = encode_cursor('2026-10-18T12:00:00.123456', 42)
+    assert '=' not in cursor
+    assert decode_cursor(cursor) == ['2026-10-18T12:00:00.123456', 42]
+    assert decode_cursor(encode_cursor(20)) == [20]
+
+@pytest.mark.parametrize('cursor', ['', '!!!', 'bm90IGpzb24', encode_cursor()[:-1] + 'x', 'eyJhIjogMX0'])
+def test_malformed_cursor_decodes_to_none(cursor):
+    # 'bm90IGpzb24' is "not json", 'eyJhIjogMX0' a JSON object instead of a list
+    assert decode_cursor(cursor) is None
+
+@pytest.fixture
+def projects(app, register):
+    """Five open projects sharing one created_at, so the id breaks every tie"""
+    token, _ = register('client@example.com', role='client')
+    ids = []
+    for i in range(5):
+        ids.append(app.test_client().post('/api/projects', json={
+            'title': f'Python project {i}', 'description': 'Build an API', 'budget': 100
+        }, headers=auth(token)).get_json()['id'])
+    with app.app_context():
+        db.session.execute(db.update(Project).values(created_at=datetime(2026, 10, 18, 12)))
+        db.session.commit()
+    return ids
+
+def walk(client, query):
+    """Follow X-Next-Cursor from the first page, returns the ids of each page"""
+    pages, cursor = [], None
+    while True:
+        response = client.get(f'/api/projects?{query}' + (f'&cursor={cursor}' if cursor else ''))
+        assert response.status_code == 200
+        pages.append([p['id'] for p in response.get_json()])
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            return pages
+
+def test_feed_pages_visit_every_project_once(client, projects):
+    newest_first = sorted(projects, reverse=True)
+    assert walk(client, 'limit=2') == [newest_first[:2], newest_first[2:4], newest_first[4:]]
+
+def test_search_pages_visit_every_match_once(client, projects):
+    pages = walk(client, 'limit=2&search=python')
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert sorted(sum(pages, [])) == sorted(projects)
+
+@pytest.mark.parametrize('cursor', [
+    'garbage!',
+    encode_cursor(),
+    encode_cursor('not a date', 1),
+    encode_cursor('2026-10-18T12:00:00', 'not an id'),
+    encode_cursor('2026-10-18T12:00:00'),
+])
+def test_tampered_cursor_is_rejected(client, projects, cursor):
+    response = client.get(f'/api/projects?limit=2&cursor={cursor}')
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Invalid cursor'}
+
+def test_tampered_search_cursor_is_rejected(client, projects):
+    response = client.get(f'/api/projects?search=python&cursor={encode_cursor("two")}')
+    assert response.status_code == 400
@@ -0,0 +1,83 @@
+"""
+Contract.paid_total only moves through record_payment's conditional UPDATE,
+and recorded payments are never edited.
+"""
+import pytest
+from sqlalchemy import event
+
+from conftest import auth
+from models import db, Contract, NotificationJob, Payment, Project, Proposal
+
+@pytest.fixture
+def contract(app, register):
+    """A 1000 contract, returns (client token, contract id)"""
+    client_token, client_id = register('client@example.com', role='client')
+    _, freelancer_id = register('freelancer@example.com')
+    with app.app_context():
+        project = Project(client_id=client_id, title='API', description='API', budget=1000)
+        db.session.add(project)
+        db.session.flush()
+        proposal = Proposal(project_id=project.id, freelancer_id=freelancer_id, cover_letter='-',
+                            proposed_amount=1000, status='accepted')
+        db.session.add(proposal)
+        db.session.flush()
+        contract = Contract(project_id=project.id, proposal_id=proposal.id, freelancer_id=freelancer_id, amount=1000)
+        db.session.add(contract)
+        db.session.commit()
+        return client_token, contract.id
+
+def pay(client, token, contract_id, amount):
+    return client.post(f'/api/contracts/{contract_id}/payments', json={'amount': amount}, headers=auth(token))
+
+def test_payments_up_to_the_contract_amount(app, client, contract):
+    token, contract_id = contract
+    assert pay(client, token, contract_id, 600).get_json()['remaining_amount'] == 400
+    assert pay(client, token, contract_id, 600).status_code == 400
+    assert pay(client, token, contract_id, 400).get_json()['payment_status'] == 'paid'
+    with app.app_context():
+        assert db.session.get(Contract, contract_id).paid_total == 1000
+        assert Payment.query.count() == 2
+
+def test_concurrent_overpayment_is_rejected_by_the_update(app, client, contract):
+    token, contract_id = contract
+    raced = []
+
+    def pay_first(conn, cursor, statement, *args):
+        # Another payment lands after this request's balance check passed
+        if statement.startswith('UPDATE contract SET paid_total') and not raced:
+            raced.append(True)
+            with db.engine.begin() as other:
+                other.execute(db.update(Contract).values(paid_total=600))
+
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', pay_first)
+    try:
+        response = pay(client, token, contract_id, 600)
+    finally:
+        with app.app_context():
+            event.remove(db.engine, 'before_cursor_execute', pay_first)
+
+    assert raced
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Payment amount exceeds remaining balance of $400.0'
+    with app.app_context():
+        assert db.session.get(Contract, contract_id).paid_total == 600
+        assert Payment.query.count() == 0
+        assert NotificationJob.query.count() == 0
+
+@pytest.mark.parametrize('change', [{'amount': 1}, {'status': 'failed'}, {'contract_id': 999}])
+def test_recorded_payment_cannot_be_edited(app, client, contract, change):
+    token, contract_id = contract
+    payment_id = pay(client, token, contract_id, 600).get_json()['id']
+    with app.app_context():
+        payment = db.session.get(Payment, payment_id)
+        for key, value in change.items():
+            setattr(payment, key, value)
+        with pytest.raises(ValueError):
+            db.session.flush()
+        db.session.rollback()
+
+        # Fields outside the ledger can still change
+        payment.description = 'Milestone 1'
+        db.session.commit()
+        assert db.session.get(Payment, payment_id).amount == 600
@@ -0,0 +1,55 @@
+"""
+Hot queries must be served by an index.
+
+Each query below is one an endpoint runs on every request. EXPLAIN QUERY PLAN
+on SQLite reports a full table scan as `SCAN <table>` with no index; if a
+model change drops or reorders one of the indexes in __table_args__, the
+matching case here fails.
+"""
+import re
+
+import pytest
+from sqlalchemy import text
+
+from models import (db, ConversationSummary, Contract, Message, MilestoneUpdate, Notification, Payment,
+                    Profile, Project, ProjectMilestone, Proposal, Review)
+
+HOT_QUERIES = {
+    'message thread': lambda: Message.thread(1, 2).order_by(Message.created_at.desc(), Message.id.desc()).limit(50),
+    'message thread older page': lambda: Message.thread(1, 2).filter(Message.before(40)).order_by(
+        Message.created_at.desc(), Message.id.desc()).limit(50),
+    'unread messages': lambda: Message.query.filter(Message.receiver_id == 1, Message.is_read == False),
+    'messages between users': lambda: Message.query.filter(
+        Message.sender_id == 1, Message.receiver_id == 2).order_by(Message.created_at.desc()),
+    'inbox low side': lambda: ConversationSummary.query.filter(
+        ConversationSummary.user_low_id == 1).order_by(ConversationSummary.last_message_id.desc()).limit(21),
+    'inbox high side': lambda: ConversationSummary.query.filter(
+        ConversationSummary.user_high_id == 1).order_by(ConversationSummary.last_message_id.desc()).limit(21),
+    'notifications': lambda: Notification.query.filter_by(user_id=1).order_by(Notification.created_at.desc()),
+    'open projects feed': lambda: Project.query.filter_by(status='open').order_by(
+        Project.created_at.desc(), Project.id.desc()).limit(21),
+    'client projects': lambda: Project.query.filter_by(client_id=1).order_by(Project.created_at.desc()),
+    'freelancer proposals': lambda: Proposal.query.filter_by(freelancer_id=1),
+    'project proposals': lambda: Proposal.query.filter_by(project_id=1),
+    'freelancer contracts': lambda: Contract.query.filter_by(freelancer_id=1),
+    'project contracts': lambda: Contract.query.filter_by(project_id=1),
+    'contract payments': lambda: Payment.query.filter_by(contract_id=1).order_by(Payment.created_at.desc()),
+    'user reviews': lambda: Review.query.filter_by(reviewee_id=1),
+    'profile': lambda: Profile.query.filter_by(user_id=1),
+    'project milestones': lambda: ProjectMilestone.query.filter_by(project_id=1).order_by(ProjectMilestone.order),
+    'milestone updates': lambda: MilestoneUpdate.query.filter_by(milestone_id=1).order_by(MilestoneUpdate.created_at.desc()),
+}
+
+FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+
+def query_plan(query):
+    sql = str(query.statement.compile(db.engine, compile_kwargs={'literal_binds': True}))
+    return [row[3] for row in db.session.execute(text('EXPLAIN QUERY PLAN ' + sql))]
+
+@pytest.mark.parametrize('name', sorted(HOT_QUERIES))
+def test_hot_query_uses_an_index(app_context, name):
+    plan = query_plan(HOT_QUERIES[name]())
+    tables = set(db.metadata.tables)
+    scans = [detail for detail in plan
+             if (match := FULL_SCAN.match(detail)) and match.group(1) in tables]
+    assert not scans, f'{name} does a full table scan: {plan}'
@@ -0,0 +1,82 @@
+"""
+User.rating_sum and rating_count follow every review write in the same
+flush, and reconcile_ratings() finds and repairs any drift.
+"""
+import pytest
+
+from models import db, Project, Review, User
+
+@pytest.fixture
+def people(app_context):
+    """A client, two freelancers and a project, returns their ids"""
+    users = [User(email=f'{name}@example.com', role=role, name=name, password_hash='-')
+             for name, role in (('client', 'client'), ('ann', 'freelancer'), ('bob', 'freelancer'))]
+    db.session.add_all(users)
+    db.session.flush()
+    project = Project(client_id=users[0].id, title='API', description='API', budget=1000)
+    db.session.add(project)
+    db.session.commit()
+    return [user.id for user in users] + [project.id]
+
+def aggregates(user_id):
+    db.session.expire_all()
+    user = db.session.get(User, user_id)
+    return user.rating_sum, user.rating_count, user.average_rating
+
+def review(project_id, reviewer_id, reviewee_id, rating):
+    review = Review(project_id=project_id, reviewer_id=reviewer_id, reviewee_id=reviewee_id, rating=rating)
+    db.session.add(review)
+    db.session.commit()
+    return review
+
+def test_aggregates_follow_review_writes(people):
+    client_id, ann_id, bob_id, project_id = people
+    first = review(project_id, client_id, ann_id, 5)
+    review(project_id, client_id, ann_id, 2)
+    assert aggregates(ann_id) == (7, 2, 3.5)
+
+    first.rating = 3
+    db.session.commit()
+    assert aggregates(ann_id) == (5, 2, 2.5)
+
+    # Moving a review to another reviewee moves its rating too
+    first.reviewee_id = bob_id
+    db.session.commit()
+    assert aggregates(ann_id) == (2, 1, 2.0)
+    assert aggregates(bob_id) == (3, 1, 3.0)
+
+    db.session.delete(first)
+    db.session.commit()
+    assert aggregates(bob_id) == (0, 0, None)
+
+def test_comment_edit_leaves_aggregates_alone(people):
+    client_id, ann_id, _, project_id = people
+    written = review(project_id, client_id, ann_id, 4)
+    written.comment = 'Great work'
+    db.session.commit()
+    assert aggregates(ann_id) == (4, 1, 4.0)
+
+def test_rolled_back_review_leaves_aggregates_alone(people):
+    client_id, ann_id, _, project_id = people
+    db.session.add(Review(project_id=project_id, reviewer_id=client_id, reviewee_id=ann_id, rating=5))
+    db.session.flush()
+    db.session.rollback()
+    assert aggregates(ann_id) == (0, 0, None)
+
+def test_reconcile_ratings_reports_and_fixes_drift(people):
+    client_id, ann_id, bob_id, project_id = people
+    review(project_id, client_id, ann_id, 4)
+    review(project_id, client_id, ann_id, 5)
+    # Writes that bypass the mapper events, e.g. a bulk import
+    db.session.execute(db.update(User).where(User.id == ann_id).values(rating_sum=1, rating_count=1))
+    db.session.execute(db.update(User).where(User.id == bob_id).values(rating_sum=3, rating_count=1))
+    db.session.commit()
+
+    expected = [(ann_id, (1, 1), (9, 2)), (bob_id, (3, 1), (0, 0))]
+    assert sorted(User.reconcile_ratings(fix=False)) == expected
+    assert aggregates(ann_id) == (1, 1, 1.0)
+
+    assert sorted(User.reconcile_ratings()) == expected
+    assert aggregates(ann_id) == (9, 2, 4.5)
+    assert aggregates(bob_id) == (0, 0, None)
+    assert User.reconcile_ratings() == []
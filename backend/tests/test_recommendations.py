@@ -0,0 +1,90 @@
+"""
+The recommendation matrix follows project writes: rows written by this
+process are patched in, any other change to the 'projects' version rebuilds
+the whole matrix.
+"""
+import pytest
+
+import recommendations
+from extensions import resource_versions
+from models import db, Profile, Project, User
+from recommendations import recommender
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Project ids passed to each ProjectMatrix.load, None for a full rebuild"""
+    calls = []
+    load = recommendations.ProjectMatrix.load.__func__
+    def recording_load(cls, project_ids=None):
+        calls.append(None if project_ids is None else set(project_ids))
+        return load(cls, project_ids)
+    monkeypatch.setattr(recommendations.ProjectMatrix, 'load', classmethod(recording_load))
+    # Versions restart at 0 once clean_tables empties resource_version
+    for name, value in [('_matrix', None), ('_version', None), ('_changed', set()), ('_bumps', 0), ('_cache', {})]:
+        monkeypatch.setattr(recommender, name, value)
+    return calls
+
+@pytest.fixture
+def people(app_context):
+    client = User(email='client@example.com', role='client', name='Client', password_hash='-')
+    freelancer = User(email='dev@example.com', role='freelancer', name='Dev', password_hash='-')
+    db.session.add_all([client, freelancer])
+    db.session.flush()
+    profile = Profile(user_id=freelancer.id, hourly_rate=50)
+    profile.set_skills(['Python', 'Flask'])
+    db.session.add(profile)
+    db.session.commit()
+    return client.id, freelancer.id
+
+def add_project(client_id, title, skills):
+    project = Project(client_id=client_id, title=title, description=title, budget=2000)
+    project.set_skills(skills)
+    db.session.add(project)
+    db.session.commit()
+    return project.id
+
+def recommended(freelancer_id):
+    return [project_id for project_id, _ in recommender.recommend(freelancer_id)]
+
+def test_local_project_writes_patch_only_their_rows(people, loads):
+    client_id, freelancer_id = people
+    python = add_project(client_id, 'Python API', ['Python', 'Flask'])
+    design = add_project(client_id, 'Logo', ['Design'])
+    assert recommended(freelancer_id) == [python, design]
+    assert loads == [None]
+
+    flask = add_project(client_id, 'Flask app', ['Flask'])
+    assert recommended(freelancer_id) == [flask, python, design]  # Full matches, newest first
+    assert loads[1:] == [{flask}]
+
+    # Re-skilling a project moves it, closing one removes it
+    db.session.get(Project, design).set_skills(['Python', 'Flask'])
+    db.session.commit()
+    assert recommended(freelancer_id) == [flask, design, python]
+    db.session.get(Project, python).status = 'in_progress'
+    db.session.commit()
+    assert recommended(freelancer_id) == [flask, design]
+    assert loads[2:] == [{design}, {python}]
+
+def test_rolled_back_project_write_is_not_patched(people, loads):
+    client_id, freelancer_id = people
+    python = add_project(client_id, 'Python API', ['Python'])
+    assert recommended(freelancer_id) == [python]
+
+    db.session.get(Project, python).status = 'cancelled'
+    db.session.flush()
+    db.session.rollback()
+    assert recommended(freelancer_id) == [python]
+    assert loads == [None]
+
+def test_write_from_another_worker_rebuilds_the_matrix(people, loads):
+    client_id, freelancer_id = people
+    python = add_project(client_id, 'Python API', ['Python'])
+    assert recommended(freelancer_id) == [python]
+
+    # Another process only shows up as a bumped version, without local flush events
+    db.session.execute(db.update(Project).values(status='completed'))
+    resource_versions.bump(db.session, {'projects'})
+    db.session.commit()
+    assert recommended(freelancer_id) == []
+    assert loads == [None, None]
@@ -0,0 +1,83 @@
+"""
+Read-your-writes routing against two SQLite files: a primary and a replica
+that has the schema but never receives any rows, so a read that lands on the
+replica finds nothing.
+"""
+import os
+
+import pytest
+
+from app import create_app
+from config import Config, engine_options
+from conftest import DB_DIR, auth
+from extensions import replica_router, response_cache, notification_queue, socketio
+from flask_jwt_extended import create_access_token
+from models import db, Profile, User
+
+PRIMARY_URL = f'sqlite:///{os.path.join(DB_DIR, "replica-test-primary.db")}'
+REPLICA_URL = f'sqlite:///{os.path.join(DB_DIR, "replica-test-replica.db")}'
+
+class ReplicaConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = PRIMARY_URL
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(Config, PRIMARY_URL)
+    SQLALCHEMY_BINDS = {'replica_0': {'url': REPLICA_URL, **engine_options(Config, REPLICA_URL)}}
+    REPLICA_STICKY_SECONDS = 60
+
+@pytest.fixture
+def replica_app():
+    # The extensions are process-wide, put them back on the session app afterwards
+    shared = [replica_router, response_cache, notification_queue, socketio]
+    saved = [dict(vars(extension)) for extension in shared]
+    app = create_app(ReplicaConfig)
+    replica_router._recent_writers = {}  # user ids repeat between tests
+    with app.app_context():
+        db.create_all()
+        db.metadata.create_all(db.engines['replica_0'])
+    try:
+        yield app
+    finally:
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.metadata.drop_all(db.engines['replica_0'])
+        for extension, attributes in zip(shared, saved):
+            vars(extension).clear()
+            vars(extension).update(attributes)
+
+def test_new_user_reads_their_registration_from_the_primary(replica_app):
+    client = replica_app.test_client()
+    response = client.post('/api/auth/register', json={
+        'email': 'new@example.com', 'password': 'password', 'role': 'freelancer', 'name': 'New'
+    })
+    token = response.get_json()['token']
+
+    assert client.get('/api/test', headers=auth(token)).get_json()['user'] == 'New'
+    profile = client.get('/api/profile', headers=auth(token))
+    assert profile.status_code == 200
+    assert profile.get_json()['user']['email'] == 'new@example.com'
+
+def add_user(app, email):
+    """Insert a user and profile on the primary outside any request, returns a token"""
+    with app.app_context():
+        user = User(email=email, role='freelancer', name=email, password_hash='-')
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(Profile(user_id=user.id))
+        db.session.commit()
+        return create_access_token(identity=str(user.id))
+
+def test_write_keeps_the_writer_on_the_primary(replica_app):
+    writer = add_user(replica_app, 'writer@example.com')
+    other = add_user(replica_app, 'other@example.com')
+    client = replica_app.test_client()
+
+    # Nobody has written through a request yet, so reads go to the empty replica
+    assert client.get('/api/test', headers=auth(writer)).get_json()['user'] is None
+    assert client.get('/api/profile', headers=auth(writer)).status_code == 404
+
+    assert client.put('/api/profile', json={'bio': 'Hello'}, headers=auth(writer)).status_code == 200
+
+    assert client.get('/api/test', headers=auth(writer)).get_json()['user'] == 'writer@example.com'
+    assert client.get('/api/profile', headers=auth(writer)).get_json()['profile']['bio'] == 'Hello'
+    assert client.get('/api/test', headers=auth(other)).get_json()['user'] is None
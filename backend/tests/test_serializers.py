@@ -0,0 +1,38 @@
+"""
+Field specs compile to extractors that read attribute paths and call the
+spec's functions; nothing else from a spec ends up in generated source.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from serializers.registry import arg, attr, compile_fields, field, json_list, nested
+
+def test_spec_fields_and_args():
+    serialize = compile_fields('serialize_row', [
+        'id', attr('owner', 'owner.name'), json_list('tags'),
+        nested('items', ['id'], many=True),
+        arg('rank'), arg('viewer', 'viewer.id'),
+        field('is_mine', lambda obj, rank, viewer: obj.owner is viewer)
+    ], args=['rank', 'viewer'])
+    viewer = SimpleNamespace(id=7, name='Ann')
+    row = SimpleNamespace(id=1, owner=viewer, tags='["a", "b"]', items=[SimpleNamespace(id=2)])
+
+    assert serialize(row, 3, viewer) == {
+        'id': 1, 'owner': 'Ann', 'tags': ['a', 'b'], 'items': [{'id': 2}],
+        'rank': 3, 'viewer': 7, 'is_mine': True
+    }
+
+def test_field_takes_a_function_not_source():
+    with pytest.raises(TypeError):
+        field('rating', 'obj.rating or 5')
+
+@pytest.mark.parametrize('spec', [
+    attr('x', 'name; import os'),
+    attr('x', 'owner.__class__ or 1'),
+    attr('x', 'owner.class'),
+    arg('x', 'unknown.id'),
+])
+def test_paths_must_be_plain_attributes_of_obj_or_an_arg(spec):
+    with pytest.raises(ValueError):
+        compile_fields('serialize_row', [spec], args=['rank'])
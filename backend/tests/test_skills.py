@@ -0,0 +1,47 @@
+"""
+Skill names are stored once per slug and the skill filters on /api/projects
+and /api/freelancers match through the association tables.
+"""
+from conftest import auth
+from models import db, Skill
+
+def test_names_are_normalised_to_one_row_per_slug(app_context):
+    skills = Skill.get_or_create_many(['Python', ' python ', 'Machine   Learning', '', 'machine learning'])
+    db.session.commit()
+    assert [(s.name, s.slug) for s in skills] == [('Python', 'python'), ('Machine Learning', 'machine learning')]
+
+    again = Skill.get_or_create_many(['PYTHON', 'Rust'])
+    db.session.commit()
+    assert again[0].id == skills[0].id
+    assert again[0].name == 'Python'  # The first spelling is kept for display
+    assert Skill.query.count() == 3
+
+def test_project_skill_filter(client, register):
+    token, _ = register('client@example.com', role='client')
+    for title, skills in (('both', ['Python', 'Flask']), ('python', ['python']), ('flask', ['FLASK '])):
+        response = client.post('/api/projects', json={
+            'title': title, 'description': title, 'budget': 100, 'skills_required': skills
+        }, headers=auth(token))
+        assert response.status_code == 201
+
+    def titles(query):
+        return sorted(p['title'] for p in client.get(f'/api/projects?{query}').get_json())
+
+    assert titles('skill=Python') == ['both', 'python']
+    assert titles('skill=python,%20flask') == ['both']
+    assert titles('skill=PYTHON&skill=Flask') == ['both']
+    assert titles('skill=Rust') == []
+    assert titles('skill=') == ['both', 'flask', 'python']
+
+def test_freelancer_skill_filter(client, register):
+    for email, skills in (('ann@example.com', ['Python', 'Django']), ('bob@example.com', ['python', 'Go'])):
+        token, _ = register(email)
+        assert client.put('/api/profile', json={'skills': skills}, headers=auth(token)).status_code == 200
+
+    def emails(query):
+        return sorted(f['email'] for f in client.get(f'/api/freelancers?{query}', headers=auth(token)).get_json())
+
+    assert emails('skill=Python') == ['ann@example.com', 'bob@example.com']
+    assert emails('skill=python,django') == ['ann@example.com']
+    assert emails('skill=go') == ['bob@example.com']
+    assert emails('skill=Go&skill=Django') == []
@@ -0,0 +1,37 @@
+"""
+Socket.IO connections need a valid JWT, land in the user's own room only and
+replay missed notifications on reconnect.
+"""
+from extensions import socketio
+from models import db, Notification
+from notifications import user_room
+
+def received(client, event):
+    return [packet['args'][0] for packet in client.get_received() if packet['name'] == event]
+
+def test_connection_without_a_valid_token_is_rejected(app):
+    assert not socketio.test_client(app).is_connected()
+    assert not socketio.test_client(app, auth={'token': 'not-a-jwt'}).is_connected()
+
+def test_client_joins_only_its_own_room(app, register):
+    client_token, client_id = register('client@example.com', role='client')
+    freelancer_token, freelancer_id = register('freelancer@example.com')
+    client_socket = socketio.test_client(app, auth={'token': client_token})
+    freelancer_socket = socketio.test_client(app, auth={'token': freelancer_token})
+
+    socketio.emit('notifications', [{'for': freelancer_id}], to=user_room(freelancer_id))
+    assert received(freelancer_socket, 'notifications') == [[{'for': freelancer_id}]]
+    assert received(client_socket, 'notifications') == []
+
+def test_reconnect_replays_missed_notifications(app, register):
+    token, user_id = register('client@example.com', role='client')
+    with app.app_context():
+        # Bulk inserted, so the dispatcher doesn't also push them live while the test runs
+        db.session.bulk_insert_mappings(Notification, [
+            {'user_id': user_id, 'type': 'new_message', 'content': f'n{i}'} for i in range(3)
+        ])
+        db.session.commit()
+        ids = [n.id for n in Notification.query.order_by(Notification.id)]
+
+    socket = socketio.test_client(app, auth={'token': token, 'last_notification_id': ids[0]})
+    assert [[n['id'] for n in batch] for batch in received(socket, 'notifications')] == [ids[1:]]
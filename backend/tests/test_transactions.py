@@ -0,0 +1,49 @@
+"""
+Nested unit_of_work blocks join the outermost one, which alone commits or
+rolls back.
+"""
+import pytest
+from sqlalchemy import event, select
+
+from models import db, Skill
+from transactions import unit_of_work
+
+@pytest.fixture
+def commits(app_context):
+    seen = []
+    def record(session):
+        seen.append(True)
+    event.listen(db.session, 'after_commit', record)
+    yield seen
+    event.remove(db.session, 'after_commit', record)
+
+def committed_slugs():
+    """Slugs visible from a separate connection"""
+    with db.engine.connect() as connection:
+        return sorted(connection.execute(select(Skill.slug)).scalars())
+
+def test_only_the_outermost_block_commits(commits):
+    with unit_of_work():
+        db.session.add(Skill(name='Python', slug='python'))
+        with unit_of_work():
+            db.session.add(Skill(name='Go', slug='go'))
+        assert commits == []
+        assert committed_slugs() == []
+    assert commits == [True]
+    assert committed_slugs() == ['go', 'python']
+
+def test_error_in_a_nested_block_rolls_back_everything(commits):
+    with pytest.raises(RuntimeError):
+        with unit_of_work():
+            db.session.add(Skill(name='Python', slug='python'))
+            with unit_of_work():
+                db.session.add(Skill(name='Go', slug='go'))
+                db.session.flush()
+                raise RuntimeError('payment declined')
+    assert commits == []
+    assert committed_slugs() == []
+
+    # The depth is reset, so the next block commits again
+    with unit_of_work():
+        db.session.add(Skill(name='Rust', slug='rust'))
+    assert committed_slugs() == ['rust']
@@ -0,0 +1,32 @@
+"""
+Unit of work for write handlers.
+
+    with unit_of_work() as session:
+        session.add(user)
+        session.flush()  # ids are assigned from here on
+        session.add(Profile(user_id=user.id))
+
+Everything in the block is committed once when it exits and rolled back if it
+raises. Nested blocks join the outermost one, which is the only one that
+commits, so helpers can open their own block without splitting a request into
+several transactions.
+"""
+from contextlib import contextmanager
+from models import db
+
+@contextmanager
+def unit_of_work(session=None):
+    """Run a block of writes as a single transaction"""
+    session = session or db.session
+    depth = session.info.get('unit_of_work_depth', 0)
+    session.info['unit_of_work_depth'] = depth + 1
+    try:
+        yield session
+    except Exception:
+        session.info['unit_of_work_depth'] = depth
+        if depth == 0:
+            session.rollback()
+        raise
+    session.info['unit_of_work_depth'] = depth
+    if depth == 0:
+        session.commit()
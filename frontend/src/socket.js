@@ -7,6 +7,20 @@ const socket = io("http://127.0.0.1:5000", {
   reconnection: true,
   reconnectionAttempts: 5,
   reconnectionDelay: 1000,
+  // Re-evaluated on every (re)connect so the server can authenticate the user
+  // and replay notifications created while we were offline
+  auth: (cb) =>
+    cb({
+      token: localStorage.getItem("token"),
+      last_notification_id: Number(localStorage.getItem("lastNotificationId")) || undefined,
+    }),
+});
+
+socket.on("notifications", (items) => {
+  const lastId = Math.max(...items.map((n) => n.id));
+  if (lastId > (Number(localStorage.getItem("lastNotificationId")) || 0)) {
+    localStorage.setItem("lastNotificationId", String(lastId));
+  }
 });
 
 socket.on("connect", () => {